@@ -17,7 +17,6 @@ Part 2: 31
 # Standard library
 from collections import Counter
 import logging
-import time
 
 # 1st party
 import aoc_utils as aoc
@@ -29,28 +28,28 @@ log = logging.getLogger('AoC')
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
-    text = aoc.read_input(args.input)
+    aoc.configure(args)
 
     # Solution
-    pairs = [parse(line) for line in text.splitlines()]
+    pairs = [parse(line) for line in aoc.iter_lines(args.input, args.max_lines)]
 
     # Part 1
-    start        = time.perf_counter()
-    list1, list2 = list(zip(*pairs))
-    diff         = lambda x : abs(x[0]-x[1])
-    total_diff   = sum(map(diff, zip(sorted(list1), sorted(list2))))
-    elapsed      = time.perf_counter() - start
-    print('Part 1:', total_diff, f'[{elapsed*1000:.3f}ms]')
+    aoc.bench.part('Part 1', compute_total_diff, pairs)
 
     # Part 2
-    start   = time.perf_counter()
-    cnts    = Counter(list2)
-    score   = sum(x * cnts[x] for x in list1)
-    elapsed = time.perf_counter() - start
-    print('Part 2:', score, f'[{elapsed*1000:.3f}ms]')
+    aoc.bench.part('Part 2', compute_similarity_score, pairs)
 
 ################################################################################
+def compute_total_diff(pairs: list[tuple[int, int]]) -> int:
+    list1, list2 = list(zip(*pairs))
+    diff         = lambda x : abs(x[0]-x[1])
+    return sum(map(diff, zip(sorted(list1), sorted(list2))))
+
+def compute_similarity_score(pairs: list[tuple[int, int]]) -> int:
+    list1, list2 = list(zip(*pairs))
+    cnts         = Counter(list2)
+    return sum(x * cnts[x] for x in list1)
+
 def parse(line: str) -> tuple[int, int]:
     x,y = line.split()
     return int(x), int(y)
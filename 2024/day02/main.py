@@ -18,7 +18,6 @@ Part 2: 4 tolerable reports
 from collections.abc import Sequence
 import itertools
 import logging
-import time
 
 # 1st party
 import aoc_utils as aoc
@@ -29,23 +28,17 @@ log = logging.getLogger('AoC')
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
-    text = aoc.read_input(args.input)
+    aoc.configure(args)
 
     # Solution
-    reports = [[int(n) for n in l.split()] for l in text.splitlines()]
+    lines   = aoc.iter_lines(args.input, args.max_lines)
+    reports = [[int(n) for n in l.split()] for l in lines]
 
     # Part 1
-    start   = time.perf_counter()
-    n       = sum(map(is_safe_report, reports))
-    elapsed = time.perf_counter() - start
-    print('Part 1:', n, f'[{elapsed*1000:.3f}ms]')
+    aoc.bench.part('Part 1', lambda : sum(map(is_safe_report, reports)))
 
     # Part 2
-    start   = time.perf_counter()
-    n = sum(map(is_tolerable_report, reports))
-    elapsed = time.perf_counter() - start
-    print('Part 2:', n, f'[{elapsed*1000:.3f}ms]')
+    aoc.bench.part('Part 2', lambda : sum(map(is_tolerable_report, reports)))
 
 ################################################################################
 def is_safe_report(nums: Sequence[int]) -> bool:
@@ -2,7 +2,6 @@
 # Standard library
 import logging
 import re
-import time
 
 # 1st party
 import aoc_utils as aoc
@@ -13,20 +12,23 @@ log = logging.getLogger('AoC')
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
+    aoc.configure(args)
     text = aoc.read_input(args.input)
 
     # Solution
 
     # Part 1
-    start = time.perf_counter()
-    regex = re.compile(r"mul\((\d{1,3}),(\d{1,3})\)")
-    total = sum(int(x)*int(y) for x,y in regex.findall(text))
-    elapsed = time.perf_counter() - start
-    print(f'Part 1: {total} [t={elapsed*1000:.3f}ms]')
+    aoc.bench.part('Part 1', sum_multiplications, text)
 
     # Part 2
-    start = time.perf_counter()
+    aoc.bench.part('Part 2', sum_enabled_multiplications, text)
+
+################################################################################
+def sum_multiplications(text: str) -> int:
+    regex = re.compile(r"mul\((\d{1,3}),(\d{1,3})\)")
+    return sum(int(x)*int(y) for x,y in regex.findall(text))
+
+def sum_enabled_multiplications(text: str) -> int:
     regex = re.compile(r"""
         (?:
              mul\((\d{1,3}),(\d{1,3})\)
@@ -44,8 +46,7 @@ def main() -> None:
             is_enabled = False
         elif is_enabled: 
             total += int(x) * int(y)
-    elapsed = time.perf_counter() - start
-    print(f'Part 2: {total} [t={elapsed*1000:.3f}ms]')
+    return total
 
 if __name__ == "__main__":
     main()
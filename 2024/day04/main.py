@@ -1,6 +1,5 @@
 #!/usr/bin/env python
 import logging
-import time
 from functools import lru_cache, partial
 from itertools import starmap
 
@@ -17,43 +16,40 @@ log = logging.getLogger('AoC')
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
+    aoc.configure(args)
     text = aoc.read_input(args.input)
 
     # Solution
-    lines = text.splitlines()
-    arr = np.array(lines).view('U1').reshape(len(lines), -1)
+    grid = aoc.Grid.from_text(text)
+    arr  = grid.cells
 
     # Part 1
-    start = time.perf_counter()
-    n_xmas  = sum(starmap(partial(count_xmas, arr), zip(*np.where(arr=='X'))))
-    elapsed = time.perf_counter() - start
-    print(f'Part 1: {n_xmas} [t={elapsed*1000:.3f}ms]')
+    count_all_xmas  = lambda : sum(starmap(partial(count_xmas, arr), grid.find('X').tolist()))
+    n_xmas          = aoc.bench.part('Part 1', count_all_xmas)
 
     # Part 2
-    start = time.perf_counter()
-    n_x_mas = sum(starmap(partial(is_x_mas, arr),   zip(*np.where(arr=='A'))))
-    elapsed = time.perf_counter() - start
-    print(f'Part 2: {n_x_mas} [t={elapsed*1000:.3f}ms]')
+    count_all_x_mas = lambda : sum(starmap(partial(is_x_mas, arr),   grid.find('A').tolist()))
+    n_x_mas         = aoc.bench.part('Part 2', count_all_x_mas)
 
    ########################################
    # Alternate solution
    ########################################
    # Part 1 & 2: Procedural with single iteration
    # - No noticable speed improvement
-    start = time.perf_counter()
-    n_xmas_ = n_x_mas_ = 0
-    for (i,j), c in np.ndenumerate(arr):
-        if c == 'X':
-            n_xmas_ += count_xmas(arr, i, j)
-        if c == 'A':
-            n_x_mas_ += is_x_mas(arr, i, j)
-    elapsed = time.perf_counter() - start
-    assert n_xmas_ == n_xmas
-    assert n_x_mas_ == n_x_mas
-    print(f'Part 1 & 2: [t={elapsed*1000:.3f}ms]')
+    counts = aoc.bench.part('Part 1 & 2', count_xmas_and_x_mas, arr)
+    assert counts == (n_xmas, n_x_mas)
 
 ################################################################################
+def count_xmas_and_x_mas(arr) -> tuple[int, int]:
+    X, A = aoc.Grid.code('X'), aoc.Grid.code('A')
+    n_xmas = n_x_mas = 0
+    for (i,j), c in np.ndenumerate(arr):
+        if c == X:
+            n_xmas += count_xmas(arr, i, j)
+        if c == A:
+            n_x_mas += is_x_mas(arr, i, j)
+    return n_xmas, n_x_mas
+
 def count_xmas(arr, i,j) -> int:
     rel_coords = generate_8compass_coords(len('XMAS'))
     return count_matches(arr, i, j, rel_coords, 'XMAS')
@@ -71,7 +67,7 @@ def count_matches(arr, i, j, rel_coords, s) -> int:
     m,n  = arr.shape
     i_idxs, j_idxs = drop_out_of_bound_idxs(i_idxs, j_idxs, m, n)
     # Count matches to search string
-    search_str = np.array(list(s))
+    search_str = aoc.Grid.codes(s)
     check_strs = arr[i_idxs, j_idxs]
     count = int((check_strs == search_str).all(axis=1).sum())
     return count
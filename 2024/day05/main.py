@@ -1,7 +1,6 @@
 #!/usr/bin/env python
 # Standard library
 import logging
-import time
 from collections import defaultdict
 from collections.abc import Iterable
 from functools import partial, reduce
@@ -20,65 +19,77 @@ log = logging.getLogger('AoC')
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
+    aoc.configure(args)
     text = aoc.read_input(args.input)
 
     # Solution
-    lines = iter(text.splitlines())
-    rules = set(takewhile(lambda x : x != '', lines))
-    nums = [s.split(',') for s in lines]
+    rules, nums = aoc.bench.step('Parse', parse, text)
     log.debug('Rules: %s', sorted(rules))
 
     # Part 1
-    start = time.perf_counter()
     in_right_order = partial(pages_in_right_order, rules)
-    get_mid_item = lambda seq : int(seq[len(seq)//2])
-    total_pt1 = sum(map(get_mid_item,filter(in_right_order, nums)))
-    elapsed = time.perf_counter() - start
-    print(f'Part 1: {total_pt1} [t={elapsed*1000:.3f}ms]')
+    total_pt1 = aoc.bench.part('Part 1',
+        lambda : sum(map(get_mid_item,filter(in_right_order, nums)))
+    )
 
     # Part 2
-    start = time.perf_counter()
     sort = partial(sort_pages_naive, rules)
-    total_pt2 = sum(map(get_mid_item,map(sort,filterfalse(in_right_order, nums))))
-    elapsed = time.perf_counter() - start
-    print(f'Part 2: {total_pt2} [t={elapsed*1000:.3f}ms]')
+    total_pt2 = aoc.bench.part('Part 2',
+        lambda : sum(map(get_mid_item,map(sort,filterfalse(in_right_order, nums))))
+    )
 
     ############################################################################
     # Alternate solutions
     ############################################################################
     # Part 1 & 2 together so updates are partitioned once
-    start = time.perf_counter()
-    ordered, unordered = partition(nums, in_right_order)
-    assert total_pt1 == sum(map(get_mid_item, ordered))
-    assert total_pt2 == sum(map(get_mid_item, map(sort,unordered)))
-    elapsed = time.perf_counter() - start
-    print(f'Elapsed (method 2): {elapsed*1000}ms')
+    def solve_partitioned() -> tuple[int, int]:
+        ordered, unordered = partition(nums, in_right_order)
+        return (
+            sum(map(get_mid_item, ordered)),
+            sum(map(get_mid_item, map(sort,unordered))),
+        )
+    totals = aoc.bench.part('Part 1 & 2 [method 2]', solve_partitioned)
+    assert totals == (total_pt1, total_pt2)
 
     # More robust sorting using topological sort
-    is_sorted = lambda it : all(x <= y for x,y in pairwise(it))
-    argsort   = lambda it : [i for i,_ in sorted(enumerate(it), key=itemgetter(1))]
-    start = time.perf_counter()
     try:
-        rule_nums = tuple(TopologicalSorter(rules_to_graph(rules)).static_order())
-        # assert in_right_order(rule_nums)
-        rule_map  = dict(zip(rule_nums, range(len(rule_nums))))
-        # TODO: Handle numbers for which there are no sorting rules that would
-        # cause rule_map.get to return None
-        argsort_pages   = lambda it : argsort(map(rule_map.get, it))
-        in_right_order2 = lambda it : is_sorted(argsort_pages(it))
-        sort2           = lambda seq : itemgetter(*argsort_pages(seq))(seq)
-
-        ordered, unordered = partition(nums, in_right_order2)
-        assert total_pt1 == sum(map(get_mid_item, ordered))
-        assert total_pt2 == sum(map(get_mid_item, map(sort2,unordered)))
-        elapsed = time.perf_counter() - start
-        print(f'Elapsed (method 3): {elapsed*1000}ms')
+        totals = aoc.bench.part('Part 1 & 2 [method 3]', solve_toposorted, rules, nums)
+        assert totals == (total_pt1, total_pt2)
     except CycleError as e:
         cycle = [f'{x}|{y}' for x,y in pairwise(e.args[1])]
         assert len(set(cycle) - rules) == 0
         log.error('Rules create cycle: %s', cycle)
 
+################################################################################
+@aoc.parse_cache
+def parse(text: str) -> tuple[set[str], list[list[str]]]:
+    lines = iter(text.splitlines())
+    rules = set(takewhile(lambda x : x != '', lines))
+    nums = [s.split(',') for s in lines]
+    return rules, nums
+
+def get_mid_item(seq) -> int:
+    return int(seq[len(seq)//2])
+
+def solve_toposorted(rules, nums) -> tuple[int, int]:
+    is_sorted = lambda it : all(x <= y for x,y in pairwise(it))
+    argsort   = lambda it : [i for i,_ in sorted(enumerate(it), key=itemgetter(1))]
+
+    rule_nums = tuple(TopologicalSorter(rules_to_graph(rules)).static_order())
+    # assert in_right_order(rule_nums)
+    rule_map  = dict(zip(rule_nums, range(len(rule_nums))))
+    # TODO: Handle numbers for which there are no sorting rules that would
+    # cause rule_map.get to return None
+    argsort_pages   = lambda it : argsort(map(rule_map.get, it))
+    in_right_order2 = lambda it : is_sorted(argsort_pages(it))
+    sort2           = lambda seq : itemgetter(*argsort_pages(seq))(seq)
+
+    ordered, unordered = partition(nums, in_right_order2)
+    return (
+        sum(map(get_mid_item, ordered)),
+        sum(map(get_mid_item, map(sort2,unordered))),
+    )
+
 ################################################################################
 def pages_in_right_order(rules, page_nums) -> bool:
     return all(
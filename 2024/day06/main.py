@@ -1,15 +1,18 @@
 #!/usr/bin/env python
 # Standard library
 import logging
+import math
 import multiprocessing as mp
-import time
+from collections.abc import Iterable
+from itertools import batched
+from multiprocessing import shared_memory
 
 # 3rd party
 import numpy as np
-from tqdm import tqdm
 
 # 1st party
 import aoc_utils as aoc
+from aoc_utils import geometry as geo
 
 # Globals
 log = logging.getLogger('AoC')
@@ -19,70 +22,113 @@ Location = tuple[int, int]
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
+    aoc.configure(args)
     text = aoc.read_input(args.input)
 
     # Solution
-    lines      = text.splitlines()
-    map        = np.array(lines).view('U1').reshape(len(lines),-1)
-    start_pos  = np.hstack(np.where(map == '^'))
+    map        = aoc.Grid.from_text(text)
+    start_pos  = np.array(map.find_one('^'))
     start_step = np.array([-1,0])
 
     # Part 1
-    start = time.perf_counter()
-    positions, is_stuck = predict_guards_route(map, start_pos, start_step)
-    assert not is_stuck
-    elapsed = time.perf_counter() - start
-    print(f'Part 1: {len(positions)} [t={elapsed*1000:.3f}ms]')
+    aoc.bench.part('Part 1', count_route_positions, map, start_pos, start_step)
 
     # Part 2
-    start = time.perf_counter()
+    positions, _ = predict_guards_route(map, start_pos, start_step)
     # Only test places the guard will eventually get to
     obstructions_to_test = positions - {to_loc(start_pos)}
+    n_obstructions = aoc.bench.part('Part 2',
+        count_loop_obstructions, obstructions_to_test, map, start_pos, start_step
+    )
+
+    ############################################################################
+    # Alternate solutions
+    ############################################################################
+    # Part 2 Jumping between obstacles instead of stepping cell by cell
+    n_obstructions_jump = aoc.bench.part('Part 2 [jump table]',
+        count_loop_obstructions_jump, obstructions_to_test, map, start_pos, start_step
+    )
+    assert n_obstructions_jump == n_obstructions
+
+    # Part 2 Resuming each walk from just before the new obstruction
+    route, first_steps = aoc.bench.step('Route [first visits]',
+        trace_route, map, start_pos, start_step
+    )
+    assert len(first_steps) == len(positions)
+    n_obstructions_resume = aoc.bench.part('Part 2 [resume]',
+        count_loop_obstructions_resume, obstructions_to_test, map, route, first_steps
+    )
+    assert n_obstructions_resume == n_obstructions
+
+    # Part 2 Every candidate obstruction simulated at once with NumPy
+    n_obstructions_batched = aoc.bench.part('Part 2 [batched]',
+        count_loop_obstructions_batched, obstructions_to_test, map, start_pos, start_step
+    )
+    assert n_obstructions_batched == n_obstructions
+
+    # Part 2 Multiprocessing (5X improvement using 8-cores, before sharing the
+    # map and batching). See lib/python/benchmarks/workers.py
+    n_obstructions_mp = aoc.bench.part('Part 2 [mp]',
+        count_loop_obstructions_mp, obstructions_to_test, map, start_pos, start_step
+    )
+    assert n_obstructions_mp == n_obstructions
+
+################################################################################
+def count_route_positions(map, start_pos, start_step) -> int:
+    positions, is_stuck = predict_guards_route(map, start_pos, start_step)
+    assert not is_stuck
+    return len(positions)
+
+def count_loop_obstructions(obstructions_to_test, map, start_pos, start_step) -> int:
     obstruction_positions = []
-    for pos in tqdm(obstructions_to_test):
+    for pos in aoc.progress(obstructions_to_test):
         is_stuck = test_new_obstruction(pos, map, start_pos, start_step)
         if not is_stuck:
             continue
         obstruction_positions.append(pos)
         if len(obstruction_positions) % 100 == 0:
             log.info('Obstruction %d found: %s', len(obstruction_positions), pos)
+    return len(obstruction_positions)
 
-    n_obstructions = len(obstruction_positions)
-    elapsed = time.perf_counter() - start
-    print(f'Part 2: {len(obstruction_positions)} [t={elapsed*1000:.3f}ms]')
-
-    ############################################################################
-    # Alternate solutions
-    ############################################################################
-    # Part 2 Multiprocessing (5X improvement using 8-cores)
-    start = time.perf_counter()
-    obstructions_to_test = positions - {to_loc(start_pos)}
-    obstruction_positions = []
-    n_workers = mp.cpu_count() - 1 # Leave CPU for MainProcess
-    with mp.Pool(
-        processes   = n_workers,
-        initializer = initializer,
-        initargs    = (map, start_pos, start_step)
-    ) as pool:
-        iresults = pool.imap_unordered(
-            func      = _test_new_obstruction_mp,
-            iterable  = obstructions_to_test,
-            # chunksize = 10, # No major performance impact
-        )
-        for pos, guard_is_stuck in tqdm(iresults, total=len(obstructions_to_test)):
-            if not guard_is_stuck:
-                continue
-            obstruction_positions.append(pos)
+def count_loop_obstructions_mp(
+    obstructions_to_test,
+    map,
+    start_pos,
+    start_step,
+    n_workers  : int | None = None,
+    batch_size : int | None = None,
+) -> int:
+    """
+    Workers read the map from shared memory and test batches of obstructions.
+    By default a worker per CPU but one (left for MainProcess), each getting
+    about 4 batches so the ones finishing first can take on more.
+    """
+    positions = list(obstructions_to_test)
+    if n_workers is None:
+        n_workers = max(1, mp.cpu_count() - 1)
+    if batch_size is None:
+        batch_size = max(1, math.ceil(len(positions) / (4 * n_workers)))
+    batches = list(batched(positions, batch_size))
 
-    elapsed = time.perf_counter() - start
-    assert len(obstruction_positions) == n_obstructions
-    print(f'Part 2 [mp]: [t={elapsed*1000:.3f}ms]')
+    shm = shared_memory.SharedMemory(create=True, size=map.size)
+    try:
+        np.ndarray(map.shape, dtype=np.uint8, buffer=shm.buf)[:] = map.cells
+        with mp.Pool(
+            processes   = n_workers,
+            initializer = initializer,
+            initargs    = (shm.name, map.shape, start_pos, start_step),
+        ) as pool:
+            iresults = pool.imap_unordered(_count_loop_obstructions_mp, batches)
+            return sum(aoc.progress(iresults, total=len(batches), unit='batch'))
+    finally:
+        shm.close()
+        shm.unlink()
 
 ################################################################################
 def predict_guards_route(map, start_pos, start_step) -> tuple[set[Location], bool]:
     m,n           = map.shape
-    is_obstacle   = lambda p : map[p[0],p[1]] == '#'
+    obstacle      = map.code('#')
+    is_obstacle   = lambda p : map[p[0],p[1]] == obstacle
     outside_area  = lambda p : not (0 <= p[0] < m and 0 <= p[1] < n)
     turn_right    = lambda p : np.array((p[1], -p[0]))
     to_state      = lambda p,s : (to_loc(p), to_loc(s))
@@ -113,7 +159,7 @@ def predict_guards_route(map, start_pos, start_step) -> tuple[set[Location], boo
 
 def test_new_obstruction(
     obstruction_pos: tuple[int, int],
-    map            : np.ndarray,
+    map            : 'aoc.Grid | MapOverlay',
     start_pos      : np.ndarray,
     start_step     : np.ndarray,
 ) -> bool:
@@ -123,30 +169,256 @@ def test_new_obstruction(
     map[i, j] = '.' # Remove obstacle
     return is_stuck
 
+################################################################################
+# Jump table
+class JumpTable:
+    """
+    Where the guard stops when walking from each cell in each direction: the
+    flat index of the cell before the next obstacle, or -1 if they leave the
+    map. A loop check then takes one lookup per turn rather than per step.
+
+    Adding an obstacle only changes the stops of the cells in line with it up
+    to the previous obstacle, so those are patched and restored per candidate.
+    """
+    def __init__(self, map: aoc.Grid):
+        self.layout    = map.layout
+        self.neighbors = map.neighbors4.tolist()
+        self.blocked   = (map.flat == map.code('#')).tolist()
+        self.stops     = [self._stops(d) for d in geo.DIRECTIONS]
+
+    def _stops(self, d: int) -> list[int]:
+        # Visit cells so that the next cell in direction d comes first
+        size  = self.layout.size
+        cells = range(size) if self.layout.offsets[d] < 0 else range(size-1, -1, -1)
+        stops = [-1] * size
+        for c in cells:
+            nxt = self.neighbors[c][d]
+            if nxt == -1:
+                continue
+            stops[c] = c if self.blocked[nxt] else stops[nxt]
+        return stops
+
+    def is_loop(self, pos: int, d: int) -> bool:
+        """Whether a guard at `pos` facing `d` never leaves the map"""
+        stops = self.stops
+        turns = set()
+        while True:
+            pos = stops[d][pos]
+            if pos == -1:
+                return False
+            if (pos, d) in turns:
+                return True
+            turns.add((pos, d))
+            d = geo.TURN_RIGHT[d]
+
+    def is_loop_with(self, obstacle: int, pos: int, d: int) -> bool:
+        """`is_loop()` with an obstacle added at the flat index `obstacle`"""
+        patched = []
+        for d_in in geo.DIRECTIONS:
+            # Cells walking towards the obstacle in d_in now stop just before it
+            back = geo.REVERSE[d_in]
+            stop = c = self.neighbors[obstacle][back]
+            stops = self.stops[d_in]
+            while c != -1 and not self.blocked[c]:
+                patched.append((stops, c, stops[c]))
+                stops[c] = stop
+                c = self.neighbors[c][back]
+        try:
+            return self.is_loop(pos, d)
+        finally:
+            for stops, c, old in patched:
+                stops[c] = old
+
+def count_loop_obstructions_jump(obstructions_to_test, map, start_pos, start_step) -> int:
+    jumps = JumpTable(map)
+    start = jumps.layout.encode(*to_loc(start_pos))
+    d     = geo.STEPS.index(to_loc(start_step))
+    return sum(
+        jumps.is_loop_with(jumps.layout.encode(i, j), start, d)
+        for i, j in aoc.progress(obstructions_to_test)
+    )
+
+################################################################################
+# Batched
+EXITED, LOOPED = 1, 2
+
+def count_loop_obstructions_batched(obstructions_to_test, map, start_pos, start_step) -> int:
+    is_stuck = predict_guards_routes_batched(map, start_pos, start_step, obstructions_to_test)
+    return int(is_stuck.sum())
+
+def predict_guards_routes_batched(
+    map                   : aoc.Grid,
+    start_pos             : np.ndarray,
+    start_step            : np.ndarray,
+    obstruction_positions : Iterable[Location],
+) -> np.ndarray:
+    """
+    Whether the guard gets stuck with each of the obstructions added, walking
+    a guard per obstruction in lockstep. Each step moves every guard still
+    walking to their next obstacle using a `JumpTable`, stopping earlier for
+    those whose own obstruction is in the way. A guard is stuck once they
+    hit the same obstacle from the same direction twice.
+    """
+    layout  = map.layout
+    width   = layout.width
+    stops   = np.array(JumpTable(map).stops)
+    blocked = map.flat == map.code('#')
+    steps   = np.array(geo.STEPS)
+    offsets = np.array(layout.offsets)
+    # Obstacles are numbered so that the ones hit can be recorded per guard,
+    # with the added obstruction last
+    n_obstacles  = int(blocked.sum())
+    obstacle_ids = np.full(layout.size, -1)
+    obstacle_ids[blocked] = np.arange(n_obstacles)
+
+    obstructions = np.array([layout.encode(i, j) for i, j in obstruction_positions], dtype=int)
+    n_guards = len(obstructions)
+    pos      = np.full(n_guards, layout.encode(*to_loc(start_pos)))
+    d        = np.full(n_guards, geo.STEPS.index(to_loc(start_step)))
+    status   = np.zeros(n_guards, dtype=np.int8) # 0 while walking
+    hit      = np.zeros((n_guards, n_obstacles + 1, 4), dtype=bool)
+    walking  = np.arange(n_guards)
+    while len(walking) > 0:
+        p, dd, obstruction = pos[walking], d[walking], obstructions[walking]
+        stop = stops[dd, p]
+        # Distances ahead to the stop and to the guard's own obstruction
+        (pi, pj), (oi, oj) = np.divmod(p, width), np.divmod(obstruction, width)
+        di, dj = steps[dd].T
+        in_line = np.where(di != 0, oj == pj, oi == pi)
+        to_obstruction = (oi - pi)*di + (oj - pj)*dj
+        si, sj  = np.divmod(stop, width)
+        to_stop = np.where(stop == -1, layout.size, (si - pi)*di + (sj - pj)*dj)
+        stopped_early = in_line & (0 < to_obstruction) & (to_obstruction <= to_stop)
+
+        stop = np.where(stopped_early, obstruction - offsets[dd], stop)
+        exited = stop == -1
+        status[walking[exited]] = EXITED
+
+        hit_id = np.where(stopped_early, n_obstacles, obstacle_ids[stop + offsets[dd]])
+        looped = ~exited & hit[walking, hit_id, dd]
+        status[walking[looped]] = LOOPED
+
+        still = ~exited & ~looped
+        walking, stop, hit_id, dd = walking[still], stop[still], hit_id[still], dd[still]
+        hit[walking, hit_id, dd] = True
+        pos[walking] = stop
+        d[walking]   = (dd + 1) % 4
+    return status == LOOPED
+
+################################################################################
+# Resuming from the route
+State = tuple[int, int] # Flat position and direction
+
+def trace_route(map, start_pos, start_step) -> tuple[list[State], dict[int, int]]:
+    """
+    The guard's state after each step of their route, and the step at which
+    each position on it was first visited
+    """
+    neighbors = map.neighbors4.tolist()
+    blocked   = (map.flat == map.code('#')).tolist()
+    pos   = map.layout.encode(*to_loc(start_pos))
+    d     = geo.STEPS.index(to_loc(start_step))
+    route = [(pos, d)]
+    first_steps = {pos : 0}
+    while (nxt := neighbors[pos][d]) != -1:
+        if blocked[nxt]:
+            d = geo.TURN_RIGHT[d]
+            continue
+        pos = nxt
+        first_steps.setdefault(pos, len(route))
+        route.append((pos, d))
+    return route, first_steps
+
+def count_loop_obstructions_resume(obstructions_to_test, map, route, first_steps) -> int:
+    """
+    The route up to the first visit of a new obstruction is unchanged, so each
+    walk starts from the state just before it
+    """
+    neighbors = map.neighbors4.tolist()
+    blocked   = (map.flat == map.code('#')).tolist()
+    layout    = map.layout
+    n_loops   = 0
+    for i, j in aoc.progress(obstructions_to_test):
+        obstacle = layout.encode(i, j)
+        pos, d = route[first_steps[obstacle] - 1]
+        blocked[obstacle] = True
+        n_loops += is_loop_from(pos, d, neighbors, blocked, layout.size)
+        blocked[obstacle] = False
+    return n_loops
+
+def is_loop_from(
+    pos       : int,
+    d         : int,
+    neighbors : list[list[int]],
+    blocked   : list[bool],
+    size      : int,
+) -> bool:
+    # One byte per (position, direction) state rather than a set of tuples
+    visited = bytearray(4 * size)
+    while (nxt := neighbors[pos][d]) != -1:
+        if blocked[nxt]:
+            d = geo.TURN_RIGHT[d]
+            continue
+        pos = nxt
+        state = 4*pos + d
+        if visited[state]:
+            return True
+        visited[state] = 1
+    return False
+
+################################################################################
+# Multiprocessing
+class MapOverlay:
+    """
+    Read-only map with cells changed in a private overlay, so workers sharing
+    one map can each add and remove their own obstacles
+    """
+    def __init__(self, base: aoc.Grid):
+        self.base    = base
+        self.shape   = base.shape
+        self.changed : dict[Location, int] = {}
+
+    code = staticmethod(aoc.Grid.code)
+
+    def __getitem__(self, loc: Location) -> int:
+        value = self.changed.get(loc)
+        return self.base[loc] if value is None else value
+
+    def __setitem__(self, loc: Location, value: str | int) -> None:
+        value = self.code(value) if isinstance(value, str) else value
+        if value == self.base[loc]:
+            self.changed.pop(loc, None)
+        else:
+            self.changed[loc] = value
+
+_SHM = None
 _MAP = None
 _START_POS = None
 _START_STEP = None
 def initializer(
-    map        : np.ndarray,
+    shm_name   : str,
+    shape      : tuple[int, int],
     start_pos  : np.ndarray,
     start_step : np.ndarray,
 ) -> None:
-    """Avoid these being copied for each worker task"""
-    global _MAP, _START_POS, _START_STEP
-    _MAP = map.copy()
+    """Attach to the shared map once per worker rather than per task"""
+    global _SHM, _MAP, _START_POS, _START_STEP
+    # MainProcess unlinks the memory, so don't track it here too
+    _SHM = shared_memory.SharedMemory(name=shm_name, track=False)
+    cells = np.ndarray(shape, dtype=np.uint8, buffer=_SHM.buf)
+    cells.flags.writeable = False
+    _MAP = MapOverlay(aoc.Grid(cells))
     _START_POS = start_pos.copy()
     _START_STEP = start_step.copy()
 
-def _test_new_obstruction_mp(
-    obstruction_pos: tuple[int, int]
-) -> tuple[tuple[int,int], bool]:
+def _count_loop_obstructions_mp(obstruction_positions: tuple[Location, ...]) -> int:
     # GLOBAL _MAP, _START_POS, _START_STEP
     assert _MAP is not None
     assert _START_POS is not None
     assert _START_STEP is not None
-    return (
-        obstruction_pos,
-        test_new_obstruction(obstruction_pos, _MAP, _START_POS, _START_STEP)
+    return sum(
+        test_new_obstruction(pos, _MAP, _START_POS, _START_STEP)
+        for pos in obstruction_positions
     )
 
 def to_loc(arr: np.ndarray) -> Location:
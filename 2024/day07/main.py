@@ -1,11 +1,10 @@
 #!/usr/bin/env python
 # Standard library
 import logging
-import time
 from collections.abc import Callable, Iterable, Sequence
 from functools import reduce
 from itertools import product, starmap
-from math import floor, log10
+from math import floor, inf, log10
 from operator import add, mul
 
 # 1st party
@@ -18,32 +17,46 @@ log = logging.getLogger('AoC')
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
-    text = aoc.read_input(args.input)
+    aoc.configure(args)
 
     # Solution
-    calibration_equations = [parse(line) for line in text.splitlines()]
+    lines = aoc.iter_lines(args.input, args.max_lines)
+    calibration_equations = [parse(line) for line in lines]
 
     # Part 1
-    start = time.perf_counter()
-    total = sum(
-        test_val for test_val, nums in calibration_equations
-        if could_be_true(test_val, nums, ops = (add, mul))
+    aoc.bench.part('Part 1',
+        total_calibration, calibration_equations, ops = (add, mul)
     )
-    elapsed = time.perf_counter() - start
-    print(f'Part 1: {total} [t={elapsed*1000:.3f}ms]')
 
     # Part 2
-    start = time.perf_counter()
-    total = sum(
-        test_val for test_val, nums in calibration_equations
-        if could_be_true(test_val, nums, ops = (add, mul, int_concat))
+    total = aoc.bench.part('Part 2',
+        total_calibration, calibration_equations, ops = (add, mul, int_concat)
     )
-    elapsed = time.perf_counter() - start
-    print(f'Part 2: {total} [t={elapsed:.3f}sec]')
+
+    ############################################################################
+    # Alternate solutions
+    ############################################################################
+    # Part 2 Working back from the test value (see could_be_true_reverse)
+    total_reverse = aoc.bench.part('Part 2 [reverse]',
+        total_calibration, calibration_equations, ops = (add, mul, int_concat),
+        solver = could_be_true_reverse,
+    )
+    assert total_reverse == total
 
 ################################################################################
 BinaryIntOp = Callable[[int, int], int]
+Solver      = Callable[[int, Sequence[int], Iterable[BinaryIntOp]], bool]
+def total_calibration(
+    calibration_equations: Iterable[tuple[int, Sequence[int]]],
+    ops                  : Iterable[BinaryIntOp],
+    solver               : Solver | None = None,
+) -> int:
+    solver = solver or could_be_true
+    return sum(
+        test_val for test_val, nums in calibration_equations
+        if solver(test_val, nums, ops)
+    )
+
 def could_be_true(
     test_val: int,
     nums    : Sequence[int],
@@ -83,9 +96,11 @@ def could_be_true(
     #     results = intermediate_results
 
     # Option 4: Dynamic + Functional
+    # ASSUMPTION: All ops return a result larger than the inputs, so results
+    # past the test value can be dropped. Multiplying by 0 breaks this.
+    bound = test_val if 0 not in nums else inf
     apply_all_ops = lambda acc, num : (
-        # ASSUMPTION: All ops return a result larger than the inputs
-        filter(lambda x : x <= test_val,
+        filter(lambda x : x <= bound,
             starmap(lambda r, op : op(r, num),
                 product(acc, ops)
     )))
@@ -93,6 +108,54 @@ def could_be_true(
 
     return test_val in results
 
+def could_be_true_reverse(
+    test_val: int,
+    nums    : Sequence[int],
+    ops     : Iterable[BinaryIntOp],
+) -> bool:
+    """
+    Depth first search from the test value back to the first number, undoing
+    one op per number from the last. Most ops can't be undone for a given
+    value (not divisible, negative, digits don't match) so few branches are
+    followed, and the search stops at the first way to get the test value.
+
+    Agrees with `could_be_true`, including when multiplying by 0 makes any
+    earlier result possible or brings a result past the test value back down:
+    >>> ops = (add, mul, int_concat)
+    >>> cases = [
+    ...     (0, [5, 0]), (0, [5, 0, 0]), (12, [3, 4, 0, 12]),
+    ...     (0, [1, 5, 0, 0, 0]), (6, [5, 4, 6, 0, 6]),
+    ... ]
+    >>> for test_val, nums in cases:
+    ...     print(could_be_true_reverse(test_val, nums, ops), could_be_true(test_val, nums, ops))
+    True True
+    True True
+    True True
+    True True
+    True True
+    """
+    ops = set(ops)
+    # Most selective first so that dead ends are found early
+    inverse_ops = [inverse for op, inverse in INVERSE_OPS.items() if op in ops]
+    return _can_reach(test_val, nums, len(nums)-1, inverse_ops)
+
+def _can_reach(
+    total       : int,
+    nums        : Sequence[int],
+    i           : int,
+    inverse_ops : list[Callable[[int, int], int | None]],
+) -> bool:
+    if i == 0:
+        return total == nums[0]
+    num = nums[i]
+    if total == 0 and num == 0 and int_undo_mul in inverse_ops:
+        return True # a * 0 == 0 for whatever the earlier numbers give
+    for inverse_op in inverse_ops:
+        prev = inverse_op(total, num)
+        if prev is not None and _can_reach(prev, nums, i-1, inverse_ops):
+            return True
+    return False
+
 def star_reduce(func, iterable, initial):
     return reduce(lambda acc, args : func(acc, *args), iterable, initial)
 
@@ -102,6 +165,25 @@ def int_concat(a: int, b: int) -> int:
 def n_digits(x: int) -> int:
     return floor(log10(abs(x))) + 1 if x != 0 else 1
 
+# Inverses of the ops, giving `a` from `op(a, b)` and `b` or None if there is
+# no such `a`. ASSUMPTION: All numbers are non-negative
+def int_unconcat(total: int, b: int) -> int | None:
+    scale = 10**n_digits(b)
+    return total // scale if total % scale == b else None
+
+def int_undo_mul(total: int, b: int) -> int | None:
+    # total == b == 0 allows any `a` so is handled by _can_reach
+    return total // b if b != 0 and total % b == 0 else None
+
+def int_undo_add(total: int, b: int) -> int | None:
+    return total - b if total >= b else None
+
+INVERSE_OPS : dict[BinaryIntOp, Callable[[int, int], int | None]] = {
+    int_concat : int_unconcat,
+    mul        : int_undo_mul,
+    add        : int_undo_add,
+}
+
 def parse(line: str) -> tuple[int, list[int]]:
     test_val, nums = line.split(':')
     test_val = int(test_val)
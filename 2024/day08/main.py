@@ -1,9 +1,7 @@
 #!/usr/bin/env python
 # Standard library
 import logging
-import time
 from functools import reduce
-from itertools import combinations, count 
 
 # 3rd party
 import numpy as np
@@ -18,55 +16,59 @@ log = logging.getLogger('AoC')
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
+    aoc.configure(args)
     text = aoc.read_input(args.input)
 
     # Solution
-    lines       = text.splitlines()
-    map_arr     = np.array(lines).view('U1').reshape(len(lines),-1)
-    frequencies = [str(x) for x in np.unique(map_arr) if x != '.']
+    grid        = aoc.Grid.from_text(text)
+    frequencies = [x for x in grid.symbols() if x != '.']
     log.debug('Frequencies: %s', frequencies)
 
     # Part 1
-    start   = time.perf_counter()
-    find    = lambda freq : find_all_antinodes(map_arr, freq, harmonic = 1)
-    total   = len(reduce(set.union, map(find, frequencies)))
-    elapsed = time.perf_counter() - start
-    print(f'Part 1: {total} [t={elapsed*1000:.3f}ms]')
+    aoc.bench.part('Part 1', count_antinodes, grid, frequencies, harmonic = 1)
 
     # Part 2
-    start   = time.perf_counter()
-    find    = lambda freq : find_all_antinodes(map_arr, freq)
-    total   = len(reduce(set.union, map(find, frequencies)))
-    elapsed = time.perf_counter() - start
-    print(f'Part 2: {total} [t={elapsed*1000:.3f}ms]')
+    aoc.bench.part('Part 2', count_antinodes, grid, frequencies)
+
+def count_antinodes(
+    grid        : aoc.Grid,
+    frequencies : list[str],
+    harmonic    : int | None = None
+) -> int:
+    find = lambda freq : find_all_antinodes(grid, freq, harmonic)
+    return len(reduce(set.union, map(find, frequencies)))
 
 Coords = tuple[int, int]
 def find_all_antinodes(
-    map_arr   : np.ndarray,
+    grid      : aoc.Grid,
     frequency : str,
     harmonic  : int | None = None
 ) -> set[Coords]:
-    antennas      = np.stack(np.where(map_arr == frequency)).transpose()
-    m, n          = map_arr.shape
-    gen_harmonics = lambda : [harmonic] if harmonic is not None else count()
-    within_bounds = lambda loc : (0 <= loc[0] < m) and (0 <= loc[1] < n)
+    antennas  = grid.find(frequency)
+    # Antinodes move by at least 1 in some axis per harmonic so max(m, n)
+    # harmonics are enough to leave the map
+    harmonics = [harmonic] if harmonic is not None else range(max(grid.shape))
 
-    all_antinodes = set()
-    for antenna1, antenna2 in combinations(antennas, 2):
-        delta = antenna1 - antenna2 # vector from antenna 2 to 1
-        for loc, sign in [(antenna1, +1), (antenna2, -1)]:
-            all_antinodes |= (aoc.Chainable(gen_harmonics())
-                .map(lambda h : loc + h*sign*delta)
-                .takewhile(within_bounds)
-                .map(to_tuple)
-                .set()
-                .collect()
-            )
-    return all_antinodes
+    # Rays of antinodes start at each antenna of a pair and move away from the
+    # other one
+    idx1, idx2 = np.triu_indices(len(antennas), k=1)
+    starts     = np.concatenate([antennas[idx1], antennas[idx2]])
+    deltas     = np.concatenate([antennas[idx1] - antennas[idx2], antennas[idx2] - antennas[idx1]])
+    candidates = (starts + np.reshape(harmonics, (-1,1,1)) * deltas).reshape(-1, 2)
 
-def to_tuple(arr: np.ndarray) -> tuple[int, ...]:
-    return tuple(int(x) for x in arr)
+    # A ray never re-enters the map once it leaves, so filtering on the bounds
+    # matches taking harmonics while in bounds. in_bounds works on whole arrays
+    # so the filter runs vectorized over every candidate at once.
+    all_antinodes = (aoc.Chainable(candidates)
+        .lazy()
+        .vectorized()
+        .filter(grid.in_bounds)
+        .tolist()
+        .map(tuple)
+        .set()
+        .collect()
+    )
+    return all_antinodes
 
 
 ################################################################################
@@ -1,7 +1,6 @@
 #!/usr/bin/env python
 # Standard library
 import logging
-import time
 from itertools import batched, groupby
 from more_itertools import partition
 from operator import itemgetter
@@ -23,24 +22,21 @@ log = logging.getLogger('AoC')
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
+    aoc.configure(args)
     disk_map = list(aoc.read_input(args.input).rstrip())
 
     # Solution
+    block_map = aoc.bench.step('Parse', to_block_map, disk_map)
+
     # Part 1
-    start       = time.perf_counter()
-    block_map   = to_block_map(disk_map)
-    compact_map = compactify_blocks(block_map)
-    checksum    = compute_checksum(compact_map)
-    elapsed     = time.perf_counter() - start
-    print(f'Part 1: {checksum} [t={elapsed*1000:.3f}ms]')
+    aoc.bench.part('Part 1',
+        lambda : compute_checksum(compactify_blocks(block_map))
+    )
 
     # Part 2
-    start       = time.perf_counter()
-    compact_map = compactify_files(block_map)
-    checksum    = compute_checksum(compact_map)
-    elapsed     = time.perf_counter() - start
-    print(f'Part 2: {checksum} [t={elapsed*1000:.3f}ms]')
+    aoc.bench.part('Part 2',
+        lambda : compute_checksum(compactify_files(block_map))
+    )
 
 Block = int | Literal['.']
 def to_block_map(disk_map: list[str]) -> list[Block]:
@@ -1,15 +1,11 @@
 #!/usr/bin/env python
 # Standard library
 import logging
-import time
 from collections import Counter
 from collections.abc import Iterable
-from functools import lru_cache, reduce
+from functools import reduce
 from operator import add
 
-# 3rd party
-import numpy as np
-
 # 1st party
 import aoc_utils as aoc
 
@@ -27,42 +23,44 @@ log = logging.getLogger('AoC')
 # 01329801
 # 10456732
 
-Location = tuple[int,int]
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
+    aoc.configure(args)
     text = aoc.read_input(args.input)
 
     # Solution
-    lines      = text.splitlines()
-    topo_map   = np.array(lines).view('U1').astype('uint8').reshape(len(lines), -1)
-    trailheads = tuple((int(i),int(j)) for i,j in zip(*np.where(topo_map == 0)))
+    grid       = aoc.Grid.from_text(text)
+    # Flat lists since only single cells are looked up
+    heights    = (grid.flat - grid.code('0')).tolist()
+    neighbors  = grid.neighbors4.tolist()
+    trailheads = tuple(idx for idx, height in enumerate(heights) if height == 0)
 
-    @lru_cache(maxsize=topo_map.size)
-    def find_reachable_peaks(loc: Location) -> Counter[Location]:
-        if topo_map[loc] == 9:
-            return Counter((loc,))
-        reachable_peaks = map(find_reachable_peaks, next_steps(topo_map, loc))
+    @aoc.disk_cache(maxsize=grid.size, context=text)
+    def find_reachable_peaks(idx: int) -> Counter[int]:
+        if heights[idx] == 9:
+            return Counter((idx,))
+        reachable_peaks = map(find_reachable_peaks, next_steps(heights, neighbors[idx], idx))
         return reduce(add, reachable_peaks, Counter())
 
-    # Part 1 & 2
-    start   = time.perf_counter()
-    reachable_peaks = [find_reachable_peaks(t) for t in trailheads]
-    score1   = sum(map(len, reachable_peaks))
-    score2   = sum(map(lambda c : c.total(), reachable_peaks))
-    elapsed = time.perf_counter() - start
-    print(f'Part 1: {score1} [t={elapsed*1000:.3f}ms]')
-    print(f'Part 2: {score2} [t={elapsed*1000:.3f}ms]')
+    def find_all_reachable_peaks() -> list[Counter[int]]:
+        find_reachable_peaks.cache_clear() # Time each part from scratch
+        return [find_reachable_peaks(t) for t in trailheads]
+
+    # Part 1
+    aoc.bench.part('Part 1', lambda : sum(map(len, find_all_reachable_peaks())))
+
+    # Part 2
+    aoc.bench.part('Part 2',
+        lambda : sum(map(lambda c : c.total(), find_all_reachable_peaks()))
+    )
 
-def next_steps(topo_map: np.ndarray, loc: Location) -> Iterable[Location]:
-    m,n = topo_map.shape
-    for i,j in [(0,1),(1,0),(0,-1),(-1,0)]:
-        next_loc = (loc[0]+i, loc[1]+j)
-        if not (0 <= next_loc[0] < m and 0 <= next_loc[1] < n):
+def next_steps(heights: list[int], neighbors: list[int], idx: int) -> Iterable[int]:
+    for next_idx in neighbors:
+        if next_idx < 0: # Off the map
             continue
-        elif topo_map[next_loc] == topo_map[loc]+1:
-            yield next_loc
+        elif heights[next_idx] == heights[idx]+1:
+            yield next_idx
 
 ################################################################################
 if __name__ == "__main__":
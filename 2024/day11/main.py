@@ -1,14 +1,10 @@
 #!/usr/bin/env python
 # Standard library
 import logging
-import time
 from math import log10, floor
-from functools import lru_cache, reduce
+from functools import reduce
 from operator import add
 
-# 3rd party
-from tqdm import tqdm
-
 # 1st party
 import aoc_utils as aoc
 
@@ -28,29 +24,24 @@ log = logging.getLogger('AoC')
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
+    aoc.configure(args)
     text = aoc.read_input(args.input)
 
     # Solution
     stones = [int(x) for x in text.split()]
 
     # Part 1
-    start    = time.perf_counter()
-    n_stones = count_after_blinks(stones, n_blinks = 25)
-    elapsed  = time.perf_counter() - start
-    print(f'Part 1: {n_stones} [t={elapsed*1000:.3f}ms]')
+    aoc.bench.part('Part 1', count_after_blinks, stones, n_blinks = 25)
 
     # Part 2
-    start    = time.perf_counter()
-    n_stones = count_after_blinks(stones, n_blinks = 75)
-    elapsed  = time.perf_counter() - start
-    print(f'Part 2: {n_stones} [t={elapsed*1000:.3f}ms]')
+    aoc.bench.part('Part 2', count_after_blinks, stones, n_blinks = 75)
 
 ################################################################################
 def count_after_blinks(stones: list[int], n_blinks: int) -> int:
+    _count.cache_clear() # Time each run from scratch
     return sum(map(lambda x : _count(x, n_blinks), stones))
 
-@lru_cache(maxsize=2**32)
+@aoc.disk_cache(maxsize=2**32)
 def _count(val: int, n_blinks: int) -> int:
     if n_blinks == 0:
         n_stones = 1
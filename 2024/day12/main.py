@@ -1,18 +1,16 @@
 #!/usr/bin/env python
 # Standard library
 import logging
-import time
 from collections import defaultdict
 from dataclasses import dataclass, field
-from enum import Enum
 from functools import cached_property
-from itertools import product
 
 # 3rd party
 import numpy as np
 
 # 1st party
 import aoc_utils as aoc
+from aoc_utils.geometry import DOWN, LEFT, NAMES, RIGHT, UP
 
 # Globals
 log = logging.getLogger('AoC')
@@ -38,55 +36,31 @@ log = logging.getLogger('AoC')
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
+    aoc.configure(args)
     text = aoc.read_input(args.input)
 
     # Solution
-    lines  = text.splitlines()
-    garden = np.array(lines).view('U1').reshape(len(lines), -1)
+    garden = aoc.Grid.from_text(text)
 
-    # Part 1 & 2
-    start = time.perf_counter()
-    cost = discount_cost = 0
-    m,n = garden.shape
-    unmapped_locations = set(product(range(m), range(n)))
-    while len(unmapped_locations) > 0:
-        region = determine_region(garden, unmapped_locations.pop())
-        cost += region.fence_cost()
-        discount_cost += region.fence_cost(bulk_discount=True)
-        unmapped_locations -= set(region.fences_per_plot.keys())
+    # Part 1
+    aoc.bench.part('Part 1', total_fence_cost, garden)
 
-        # DEBUG
-        context = get_context(garden, set(region.fences_per_plot.keys()))
-        log.debug('Determined fences around region:\n%s', context)
-        log.debug('%d fences and %d sides', region.perimeter, region.n_sides)
-        log.info('%s', region)
+    # Part 2
+    aoc.bench.part('Part 2', total_fence_cost, garden, bulk_discount=True)
 
-    elapsed = time.perf_counter() - start
-    print(f'Part 1: {cost} [t={elapsed*1000:.3f}ms]')
-    print(f'Part 2: {discount_cost} [t=SAME]')
+def total_fence_cost(garden: aoc.Grid, bulk_discount: bool = False) -> int:
+    return sum(r.fence_cost(bulk_discount) for r in map_regions(garden))
 
 ################################################################################
-Location = tuple[int,int]
-
-class Direction(Enum):
-    UP    = (-1, 0)
-    DOWN  = ( 1, 0)
-    LEFT  = ( 0,-1)
-    RIGHT = ( 0, 1)
-
-    def __getitem__(self, idx: int) -> int:
-        return self.value[idx]
-
-    def __radd__(self, loc: Location) -> Location:
-        if not isinstance(loc, tuple) and len(loc) == 2:
-            raise TypeError(type(loc))
-        return (loc[0]+self.value[0], loc[1]+self.value[1])
+# Plots are flat positions in the garden and fences the directions they face
+Position = int
 
 @dataclass
 class Region:
     plant    : str
-    fences_per_plot: dict[Location, set[Direction]] = field(default_factory=lambda : defaultdict(set))
+    # Flat positions next to each plot, from aoc.Grid.neighbors4
+    neighbors : list[list[Position]] = field(repr=False)
+    fences_per_plot: dict[Position, set[int]] = field(default_factory=lambda : defaultdict(set))
 
     def fence_cost(self, bulk_discount: bool = False) -> int:
         if bulk_discount:
@@ -104,23 +78,23 @@ class Region:
     @cached_property
     def n_sides(self) -> int:
         n_sides = self.perimeter
-        for loc, fences in self.fences_per_plot.items():
+        for pos, fences in self.fences_per_plot.items():
             # Don't count fences above (below) if there is a plant in the region
             # to the right that also has a fence above (below)
-            if (nloc := loc + Direction.RIGHT) in self.fences_per_plot:
-                nfences = self.fences_per_plot[nloc]
-                if Direction.DOWN in fences and Direction.DOWN in nfences:
+            if (npos := self.neighbors[pos][RIGHT]) in self.fences_per_plot:
+                nfences = self.fences_per_plot[npos]
+                if DOWN in fences and DOWN in nfences:
                     n_sides -= 1
-                if Direction.UP in fences and Direction.UP in nfences:
+                if UP in fences and UP in nfences:
                     n_sides -= 1
 
             # Don't count fences to the right (left) if there is a plant in the region
             # below that also has a fence to the right (left)
-            if (nloc := loc + Direction.DOWN) in self.fences_per_plot:
-                nfences = self.fences_per_plot[nloc]
-                if Direction.RIGHT in fences and Direction.RIGHT in nfences:
+            if (npos := self.neighbors[pos][DOWN]) in self.fences_per_plot:
+                nfences = self.fences_per_plot[npos]
+                if RIGHT in fences and RIGHT in nfences:
                     n_sides -= 1
-                if Direction.LEFT in fences and Direction.LEFT in nfences:
+                if LEFT in fences and LEFT in nfences:
                     n_sides -= 1
         return n_sides
 
@@ -131,40 +105,62 @@ class Region:
             f'{self.n_sides:d} = ${self.fence_cost(bulk_discount=True)}'
         )
 
+def map_regions(garden: aoc.Grid) -> list['Region']:
+    regions = []
+    plants = garden.flat.tolist()
+    neighbors = garden.neighbors4.tolist()
+    unmapped_positions = set(range(garden.size))
+    while len(unmapped_positions) > 0:
+        pos = unmapped_positions.pop()
+        region = Region(chr(plants[pos]), neighbors)
+        determine_region(garden, plants, pos, region)
+        regions.append(region)
+        unmapped_positions -= region.fences_per_plot.keys()
+
+        # DEBUG
+        context = get_context(garden, set(region.fences_per_plot.keys()))
+        log.debug('Determined fences around region:\n%s', context)
+        log.debug('%d fences and %d sides', region.perimeter, region.n_sides)
+        log.info('%s', region)
+    return regions
+
 def determine_region(
-    garden : np.ndarray,
-    loc    : Location,
-    region : Region | None = None,
+    garden : aoc.Grid,
+    plants : list[int],
+    pos    : Position,
+    region : Region,
 ) -> Region:
-    if region is None:
-        region = Region(garden[loc])
-    m,n = garden.shape
-    outside_garden = lambda l : not (0 <= l[0] < m and 0 <= l[1] < n)
-    different_plant = lambda l : garden[l] != region.plant
-
-    fences = region.fences_per_plot[loc]
-    for direction in Direction:
-        nloc = loc + direction
-        if outside_garden(nloc) or different_plant(nloc):
-            fences.add(direction)
-        elif nloc not in region.fences_per_plot:
-            determine_region(garden, nloc, region)
-
-    # DEBUG
-    context = get_context(garden, loc)
-    log.debug('Determined fences around plant:\n%s', context)
-    log.debug('Fences: %s', [s.name for s in fences])
+    plant = garden.code(region.plant)
+
+    # Depth-first with an explicit stack since regions can be large
+    region.fences_per_plot[pos] # Mark as part of the region
+    stack = [pos]
+    while stack:
+        pos = stack.pop()
+        fences = region.fences_per_plot[pos]
+        for direction, npos in enumerate(region.neighbors[pos]):
+            if npos < 0 or plants[npos] != plant: # Outside the garden or a different plant
+                fences.add(direction)
+            elif npos not in region.fences_per_plot:
+                region.fences_per_plot[npos] # Mark as part of the region
+                stack.append(npos)
+
+        # DEBUG
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('Determined fences around plant:\n%s', get_context(garden, pos))
+            log.debug('Fences: %s', [NAMES[d] for d in fences])
 
     return region
 
 ################################################################################
 # Debugging
-def get_context(garden: np.ndarray, locations: Location | set[Location]) -> str:
+def get_context(garden: aoc.Grid, positions: Position | set[Position]) -> str:
     apply_mask = True
-    if isinstance(locations, tuple) and isinstance(locations[0], int):
+    if isinstance(positions, int):
         apply_mask = False
-        locations = set([locations])
-    assert isinstance(locations, set)
+        positions = set([positions])
+    assert isinstance(positions, set)
+    locations = {garden.coords(pos) for pos in positions}
 
     m,n = garden.shape
     imin = min(i for i,_ in locations)
@@ -173,16 +169,14 @@ def get_context(garden: np.ndarray, locations: Location | set[Location]) -> str:
     jmax = max(j for _,j in locations)
     islice = slice(max(0, imin-1), min(m, imax+2))
     jslice = slice(max(0, jmin-1), min(n, jmax+2))
-    context = garden[islice, jslice]
+    context = aoc.Grid(garden[islice, jslice].copy())
     if apply_mask:
-        context = context.copy()
-        mask = np.ones_like(garden, dtype=bool)
+        mask = np.ones(garden.shape, dtype=bool)
         mask[*list(map(list,zip(*locations)))] = False
         mask = mask[islice, jslice]
         context[mask] = '.'
-    context = '\n'.join(''.join(row) for row in context)
 
-    return context
+    return str(context)
 
 ################################################################################
 if __name__ == "__main__":
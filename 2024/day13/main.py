@@ -2,7 +2,6 @@
 # Standard library
 import logging
 import re
-import time
 from collections.abc import Iterable
 from typing import NamedTuple
 
@@ -45,49 +44,11 @@ COST_B = 1
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
+    aoc.configure(args)
     text = aoc.read_input(args.input)
 
     # Solution
-    machine_confs = [parse(lines) for lines in text.split('\n\n')]
-
-    # Part 1
-    start = time.perf_counter()
-    n_tokens1 = sum(drop_none(compute_min_cost_to_win(c) for c in machine_confs))
-    elapsed = time.perf_counter() - start
-    print(f'Part 1: {n_tokens1} [t={elapsed*1000:.3f}ms]')
-
-    # Part 2
-    for conf in machine_confs:
-        conf.prize_loc[:] = conf.prize_loc + CONVERSION_FACTOR
-    start = time.perf_counter()
-    n_tokens2 = sum(drop_none(compute_min_cost_to_win(c) for c in machine_confs))
-    elapsed = time.perf_counter() - start
-    print(f'Part 2: {n_tokens2} [t={elapsed*1000:.3f}ms]')
-
-    ############################################################################# 
-    # Alternate solutions
-    ############################################################################# 
-    # Vectorize to solve all configurations with one numpy call (20X faster)
-    machine_confs = np.array(
-        re.findall(r'[-+]?\d+', text), 
-        dtype=np.int64
-    ).reshape(-1,3,2).transpose(0,2,1)
-    button_vec = machine_confs[:,:,:2]
-    prize_loc  = machine_confs[:,:,2]
-
-    start = time.perf_counter()
-    n_tokens = compute_min_cost_to_win_vectorized(button_vec, prize_loc)
-    elapsed = time.perf_counter() - start
-    assert n_tokens == n_tokens1
-    print(f'Part 1 [vec]: [t={elapsed*1000:.3f}ms]')
-
-    prize_loc += CONVERSION_FACTOR
-    start = time.perf_counter()
-    n_tokens = compute_min_cost_to_win_vectorized(button_vec, prize_loc)
-    elapsed = time.perf_counter() - start
-    assert n_tokens == n_tokens2
-    print(f'Part 2 [vec]: [t={elapsed*1000:.3f}ms]')
+    aoc.solve(__name__, text)
 
 ################################################################################
 class MachineConf(NamedTuple):
@@ -95,7 +56,23 @@ class MachineConf(NamedTuple):
     B_move    : np.ndarray
     prize_loc : np.ndarray
 
-def parse(lines: str) -> MachineConf:
+class ClawMachines(NamedTuple):
+    confs      : list[MachineConf]
+    # Same configurations stacked for the vectorized solution
+    button_vec : np.ndarray # (n, 2, 2)
+    prize_loc  : np.ndarray # (n, 2)
+
+@aoc.solver.parse
+@aoc.parse_cache
+def parse(text: str) -> ClawMachines:
+    confs = [parse_machine(lines) for lines in text.split('\n\n')]
+    machine_confs = np.array(
+        re.findall(r'[-+]?\d+', text), 
+        dtype=np.int64
+    ).reshape(-1,3,2).transpose(0,2,1)
+    return ClawMachines(confs, machine_confs[:,:,:2], machine_confs[:,:,2])
+
+def parse_machine(lines: str) -> MachineConf:
     match = re.fullmatch(r'''
         Button\ A:\ X([-+]\d+),\ Y([-+]\d+)\n
         Button\ B:\ X([-+]\d+),\ Y([-+]\d+)\n
@@ -106,6 +83,35 @@ def parse(lines: str) -> MachineConf:
     nums = np.array(match.groups(), dtype=np.int64).reshape(3,2)
     return MachineConf(*nums)
 
+@aoc.solver.part(1)
+def part1(machines: ClawMachines) -> int:
+    return total_min_cost_to_win(machines.confs)
+
+@aoc.solver.part(2)
+def part2(machines: ClawMachines) -> int:
+    return total_min_cost_to_win(map(convert_units, machines.confs))
+
+################################################################################
+# Alternate solutions
+################################################################################
+# Vectorize to solve all configurations with one numpy call (20X faster)
+@aoc.solver.part(1, variant='vec')
+def part1_vectorized(machines: ClawMachines) -> int:
+    return compute_min_cost_to_win_vectorized(machines.button_vec, machines.prize_loc)
+
+@aoc.solver.part(2, variant='vec')
+def part2_vectorized(machines: ClawMachines) -> int:
+    return compute_min_cost_to_win_vectorized(
+        machines.button_vec, machines.prize_loc + CONVERSION_FACTOR
+    )
+
+################################################################################
+def convert_units(conf: MachineConf) -> MachineConf:
+    return conf._replace(prize_loc = conf.prize_loc + CONVERSION_FACTOR)
+
+def total_min_cost_to_win(machine_confs: Iterable[MachineConf]) -> int:
+    return sum(drop_none(compute_min_cost_to_win(c) for c in machine_confs))
+
 def compute_min_cost_to_win(conf: MachineConf) -> int | None:
     # Linear Algebra
     button_vec = np.stack([conf.A_move, conf.B_move], axis=1)
@@ -3,7 +3,6 @@
 import logging
 import math
 import re
-import time
 from collections.abc import Iterable
 from functools import reduce
 from typing import NamedTuple
@@ -11,7 +10,6 @@ from typing import NamedTuple
 # 3rd party
 import numpy as np
 import scipy.signal
-from tqdm import tqdm
 
 # 1st party
 import aoc_utils as aoc
@@ -44,79 +42,78 @@ N_SECONDS = 100
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
+    aoc.configure(args)
     text = aoc.read_input(args.input)
 
     # Solution
-    robots = [parse(l) for l in text.splitlines()]
+    aoc.solve(__name__, text)
+
+################################################################################
+Vector2D = tuple[int, int]
+class Robot(NamedTuple):
+    p : Vector2D
+    v : Vector2D
+
+class Bathroom(NamedTuple):
+    robots : list[Robot]
+    shape  : tuple[int, int]
+    # Same robots as arrays for the vectorized solution
+    p      : np.ndarray
+    v      : np.ndarray
+
+@aoc.solver.parse
+def parse(text: str) -> Bathroom:
+    robots = [parse_robot(l) for l in text.splitlines()]
     if len(robots) == 12:
         bathroom_shape = (11, 7)
     elif len(robots) == 500:
         bathroom_shape = (101, 103)
     else:
         raise NotImplementedError('Unexpected input data')
+    robots_arr = np.array(re.findall(r'-?\d+', text), np.int32).reshape(-1,2,2)
+    return Bathroom(robots, bathroom_shape, robots_arr[:,0], robots_arr[:,1])
+
+@aoc.solver.part(1)
+def part1(bathroom: Bathroom) -> int:
+    pfinal = simulate_robots(bathroom.robots, N_SECONDS, bathroom.shape)
+    return compute_safety_factor(pfinal, bathroom.shape)
+
+def times_overlap(primary: str, variant: str) -> bool:
+    """
+    Whether the guessed easter egg times share a time. The guess methods are
+    heuristics so the candidates they return can legitimately differ.
+    """
+    return len(set(variant.split(',')) & set(primary.split(','))) > 0 or variant == ''
 
-    # Part 1
-    start         = time.perf_counter()
-    pfinal        = simulate_robots(robots, N_SECONDS, bathroom_shape)
-    safety_factor = compute_safety_factor(pfinal, bathroom_shape)
-    elapsed       = time.perf_counter() - start
-    print(f'Part 1: {safety_factor} [t={elapsed*1000:.3f}ms]')
-
-    # Part 2
-    start   = time.perf_counter()
-    times   = guess_easter_egg_times(robots, bathroom_shape)
-    elapsed = time.perf_counter() - start
-    t_str   = ','.join(map(str,times))
-    print(f'Part 2: {t_str} [t={elapsed*1000:.3f}ms]')
+@aoc.solver.part(2, compare=times_overlap)
+def part2(bathroom: Bathroom) -> str:
+    times = guess_easter_egg_times(bathroom.robots, bathroom.shape)
     # # Visually verify which time has the easter egg
     # if log.isEnabledFor(logging.DEBUG):
     #     for t in times:
-    #         pfinal = simulate_robots(robots, t, bathroom_shape)
-    #         log.debug('t = %dsec\n%s', t, visualize_robots(pfinal, bathroom_shape))
-
-    ############################################################################
-    # Alternate solutions
-    ############################################################################
-    # Vectorized solution
-    # - negligable improvement for part 1
-    # - 10x improvement for part 2 guess methods and negligable improvements for
-    #   guaranteed method
-    bathroom_shape = np.array(bathroom_shape)
-    robots = np.array(re.findall(r'-?\d+', text), np.int32).reshape(-1,2,2)
-    p = robots[:,0]
-    v = robots[:,1]
-
-    start   = time.perf_counter()
-    pfinal  = simulate_robots_vec(p, v, N_SECONDS, bathroom_shape)
-    ans     = compute_safety_factor_vec(pfinal, bathroom_shape)
-    elapsed = time.perf_counter() - start
-    assert ans == safety_factor
-    print(f'Part 1 [vec]: [t={elapsed*1000:.3f}ms]')
-
-    start      = time.perf_counter()
-    cycle_time = np.lcm.reduce((np.lcm(v, bathroom_shape) // v).flatten())
-    seconds    = np.arange(cycle_time).reshape(-1,1,1)
-    pfinal     = simulate_robots_vec(p, v, seconds, bathroom_shape)
-    # Lucky guess: Xmas tree occurs where variance is minimized
-    # assert times[0] == pfinal.var(axis=1).max(axis=1).argmin()
-    # Guaranteed
-    bathroom    = np.zeros((cycle_time, *bathroom_shape[::-1]))
-    t_idx       = np.broadcast_to(np.arange(cycle_time)[:,np.newaxis], (cycle_time, len(robots)))
-    bathroom[t_idx, pfinal[:,:,1], pfinal[:,:,0]] = 1
-    log.info('Kernel correlation over %d time steps. This takes 30-60sec.', cycle_time)
-    correlation = scipy.ndimage.correlate(bathroom, TREE_KERNEL[np.newaxis,:,:])
-    ans         = np.nonzero(correlation == TREE_KERNEL.sum())[0].tolist()
-    elapsed     = time.perf_counter() - start
-    assert len(set(ans) & set(times)) > 0 or len(ans) == 0
-    print(f'Part 2 [vec]: [t={elapsed*1000:.3f}ms]')
+    #         pfinal = simulate_robots(bathroom.robots, t, bathroom.shape)
+    #         log.debug('t = %dsec\n%s', t, visualize_robots(pfinal, bathroom.shape))
+    return ','.join(map(str, times))
 
 ################################################################################
-Vector2D = tuple[int, int]
-class Robot(NamedTuple):
-    p : Vector2D
-    v : Vector2D
+# Alternate solutions
+################################################################################
+# Vectorized solution
+# - negligable improvement for part 1
+# - 10x improvement for part 2 guess methods and negligable improvements for
+#   guaranteed method
+@aoc.solver.part(1, variant='vec')
+def part1_vectorized(bathroom: Bathroom) -> int:
+    shape  = np.array(bathroom.shape)
+    pfinal = simulate_robots_vec(bathroom.p, bathroom.v, N_SECONDS, shape)
+    return compute_safety_factor_vec(pfinal, shape)
 
+@aoc.solver.part(2, variant='vec')
+def part2_vectorized(bathroom: Bathroom) -> str:
+    shape = np.array(bathroom.shape)
+    return ','.join(map(str, find_easter_egg_times_vec(bathroom.p, bathroom.v, shape)))
+
+################################################################################
 def simulate_robots(
     robots: list[Robot],
     seconds: int,
@@ -170,7 +167,7 @@ def guess_easter_egg_times(
     t_no_overlap = []
     bathroom = np.zeros(bathroom_shape[::-1], dtype=np.uint32)
     kernal_match = TREE_KERNEL.sum()
-    for t in tqdm(range(0, cycle_time+1)):
+    for t in aoc.progress(range(0, cycle_time+1)):
         pfinal = simulate_robots(robots, t, bathroom_shape)
 
         # Lucky guess 1: Xmas tree occurs where variance is minimized
@@ -199,12 +196,30 @@ def guess_easter_egg_times(
 def simulate_robots_vec(p, v, seconds, bathroom_shape):
     return (p + v * seconds) % bathroom_shape
 
+def find_easter_egg_times_vec(
+    p              : np.ndarray,
+    v              : np.ndarray,
+    bathroom_shape : np.ndarray,
+) -> list[int]:
+    cycle_time = np.lcm.reduce((np.lcm(v, bathroom_shape) // v).flatten())
+    seconds    = np.arange(cycle_time).reshape(-1,1,1)
+    pfinal     = simulate_robots_vec(p, v, seconds, bathroom_shape)
+    # Lucky guess: Xmas tree occurs where variance is minimized
+    # assert times[0] == pfinal.var(axis=1).max(axis=1).argmin()
+    # Guaranteed
+    bathroom    = np.zeros((cycle_time, *bathroom_shape[::-1]))
+    t_idx       = np.broadcast_to(np.arange(cycle_time)[:,np.newaxis], (cycle_time, len(p)))
+    bathroom[t_idx, pfinal[:,:,1], pfinal[:,:,0]] = 1
+    log.info('Kernel correlation over %d time steps. This takes 30-60sec.', cycle_time)
+    correlation = scipy.ndimage.correlate(bathroom, TREE_KERNEL[np.newaxis,:,:])
+    return np.nonzero(correlation == TREE_KERNEL.sum())[0].tolist()
+
 def compute_safety_factor_vec(p: np.ndarray, bathroom_shape: np.ndarray) -> int:
     boundaries = bathroom_shape // 2
     masks = np.hstack([p < boundaries, p > boundaries])
     return int(((masks[:,[0,0,2,2]] & masks[:,[1,3,1,3]])).sum(axis=0).prod())
 
-def parse(line: str) -> Robot:
+def parse_robot(line: str) -> Robot:
     match = re.fullmatch(r'p=(-?\d+),(-?\d+) v=(-?\d+),(-?\d+)', line)
     if match is None:
         raise ValueError('Failed to parse: %s', line)
@@ -1,18 +1,16 @@
 #!/usr/bin/env python
 # Standard library
 import logging
-import time
 from collections.abc import Iterable
 from copy import deepcopy
 from dataclasses import dataclass
-from enum import Enum
 
 # 3rd party
 import numpy as np
-from tqdm import tqdm
 
 # 1st party
 import aoc_utils as aoc
+from aoc_utils import geometry as geo
 
 # Globals
 log = logging.getLogger('AoC')
@@ -50,23 +48,21 @@ logging.getLogger('asyncio').setLevel(logging.WARNING)
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
+    aoc.configure(args)
     text = aoc.read_input(args.input)
 
     # Solution
     warehouse_text, movements_text = text.split('\n\n')
 
-    movements = list(map(Direction.from_char, movements_text.replace('\n','')))
-    to_gps_coord = lambda p : 100 * p[0] + p[1]
+    movements = list(map(geo.from_char, movements_text.replace('\n','')))
 
     # Part 1
-    fish, boxes, walls, warehouse_shape = parse_warehouse(warehouse_text)
+    fish, boxes, walls, layout = parse_warehouse(warehouse_text)
+    to_gps_coord = lambda p : 100 * (p // layout.width) + p % layout.width
 
-    start        = time.perf_counter()
-    boxes_final  = simulate_lanternfish(fish, boxes, walls, movements, warehouse_shape)
-    total        = sum(map(to_gps_coord, boxes_final))
-    elapsed      = time.perf_counter() - start
-    print(f'Part 1: {total} [t={elapsed*1000:.3f}ms]')
+    aoc.bench.part('Part 1', lambda : sum(map(to_gps_coord,
+        simulate_lanternfish(fish, boxes, walls, movements, layout)
+    )))
 
     # Part 2
     warehouse_wide_text = (warehouse_text
@@ -75,74 +71,47 @@ def main() -> None:
         .replace('O','[]')
         .replace('@','@.')
     )
-    fish, boxes, walls, warehouse_shape = parse_warehouse(warehouse_wide_text)
+    fish, boxes, walls, layout = parse_warehouse(warehouse_wide_text)
+    to_gps_coord = lambda p : 100 * (p // layout.width) + p % layout.width
 
-    start       = time.perf_counter()
-    boxes_final = simulate_lanternfish(fish, boxes, walls, movements, warehouse_shape)
-    total       = sum(map(to_gps_coord, boxes_final))
-    elapsed     = time.perf_counter() - start
+    total = aoc.bench.part('Part 2', lambda : sum(map(to_gps_coord,
+        simulate_lanternfish(fish, boxes, walls, movements, layout)
+    )))
     assert total != 1496283
-    print(f'Part 2: {total} [t={elapsed*1000:.3f}ms]')
 
 ################################################################################
+# Positions are flat indices into the warehouse. It is surrounded by walls so
+# moves never need to check the edges.
+Position = int
+
 def parse_warehouse(warehouse_text: str):
-    lines = warehouse_text.split('\n')
-    warehouse = np.array(lines).view('U1').reshape(len(lines),-1)
+    warehouse = aoc.Grid.from_text(warehouse_text)
+    to_positions = lambda mask : np.flatnonzero(mask).tolist()
 
-    fish  = np.stack(np.where(warehouse == '@')).transpose().squeeze()
-    walls = np.stack(np.where(warehouse == '#')).transpose()
-    boxes = np.stack(np.where(warehouse == 'O')).transpose()
+    fish  = warehouse.index(*warehouse.find_one('@'))
+    walls = set(to_positions(warehouse.mask('#')))
+    boxes = to_positions(warehouse.mask('O'))
     if len(boxes) > 0:
-        boxes = set(to_positions(boxes))
+        boxes = set(boxes)
     else:
-        boxes = np.stack([
-            np.stack(np.where(warehouse == '[')).transpose(),
-            np.stack(np.where(warehouse == ']')).transpose(),
-        ], axis=1)
-        boxes = BoxHandler.from_boxes(boxes.tolist())
+        lefts = to_positions(warehouse.mask('['))
+        boxes = BoxHandler.from_boxes((p, p+1) for p in lefts)
     if len(boxes) == 0:
         raise RuntimeError
 
-    fish  = to_position(fish)
-    walls = set(to_positions(walls))
-    return fish, boxes, walls, warehouse.shape
-
-
-Position = tuple[int, int]
-class Direction(Enum):
-    UP    = (-1, 0)
-    DOWN  = ( 1, 0)
-    LEFT  = ( 0,-1)
-    RIGHT = ( 0, 1)
-
-    def __getitem__(self, idx: int) -> int:
-        return self.value[idx]
-
-    def __radd__(self, loc: Position) -> Position:
-        if not isinstance(loc, tuple) and len(loc) == 2:
-            raise TypeError(type(loc))
-        return (loc[0]+self.value[0], loc[1]+self.value[1])
-
-    @classmethod
-    def from_char(cls, c : str):
-        return {
-            '^' : Direction.UP,
-            'v' : Direction.DOWN,
-            '<' : Direction.LEFT,
-            '>' : Direction.RIGHT,
-        }[c]
+    return fish, boxes, walls, warehouse.layout
 
 def simulate_lanternfish(
     fish      : Position,
     boxes     : 'set[Position] | BoxHandler',
     walls     : set[Position],
-    movements : list[Direction],
-    warehouse_shape : tuple[int, int] | None = None,
+    movements : list[int],
+    layout    : geo.Layout,
 ) -> set[Position]:
     if isinstance(boxes, set): # 1 cell boxes
-        boxes = simulate_lanternfish_1cell(fish, boxes, walls, movements, warehouse_shape)
+        boxes = simulate_lanternfish_1cell(fish, boxes, walls, movements, layout)
     elif isinstance(boxes, BoxHandler): # 2+ cell boxes
-        box_handler = simulate_lanternfish_2cell(fish, boxes, walls, movements, warehouse_shape)
+        box_handler = simulate_lanternfish_2cell(fish, boxes, walls, movements, layout)
         boxes = box_handler.get_ref_positions()
     return boxes
 
@@ -151,23 +120,25 @@ def simulate_lanternfish_1cell(
     fish      : Position,
     boxes     : set[Position],
     walls     : set[Position],
-    movements : list[Direction],
-    warehouse_shape : tuple[int, int] | None = None,
+    movements : list[int],
+    layout    : geo.Layout,
 ) -> set[Position]:
     boxes  = boxes.copy()
-    move_iter = movements
-    if not log.isEnabledFor(logging.DEBUG):
-        move_iter = tqdm(movements, desc='Simulating lanternfish', unit='moves')
+    offsets = layout.offsets
+    debug = log.isEnabledFor(logging.DEBUG)
+    move_iter = aoc.progress(movements, desc='Simulating lanternfish', unit='moves', disable=debug)
 
     for move in move_iter:
-        log.debug('Moving: %s', move.name)
-        next_pos = fish + move
+        step = offsets[move]
+        if debug:
+            log.debug('Moving: %s', geo.NAMES[move])
+        next_pos = fish + step
         if next_pos in walls:
             continue
         if next_pos in boxes:
             # Find end of boxes
             pos = next_pos
-            while (pos := pos + move) in boxes:
+            while (pos := pos + step) in boxes:
                 pass
             if pos in walls:
                 continue
@@ -176,11 +147,11 @@ def simulate_lanternfish_1cell(
             boxes.add(pos)
         fish = next_pos
 
-        if warehouse_shape is not None:
+        if debug:
             log.debug(
                 "After %s:\n%s",
-                move.name,
-                visualize_warehouse(fish, boxes, walls, warehouse_shape)
+                geo.NAMES[move],
+                visualize_warehouse(fish, boxes, walls, layout)
             )
     return boxes
 
@@ -188,36 +159,36 @@ def simulate_lanternfish_2cell(
     fish      : Position,
     boxes     : 'BoxHandler',
     walls     : set[Position],
-    movements : list[Direction],
-    warehouse_shape : tuple[int, int] | None = None,
+    movements : list[int],
+    layout    : geo.Layout,
 ) -> 'BoxHandler':
     boxes  = deepcopy(boxes)
-    move_iter = movements
-    if not log.isEnabledFor(logging.DEBUG):
-        move_iter = tqdm(movements, desc='Simulating lanternfish', unit='moves')
+    offsets = layout.offsets
+    debug = log.isEnabledFor(logging.DEBUG)
+    move_iter = aoc.progress(movements, desc='Simulating lanternfish', unit='moves', disable=debug)
 
     for move in move_iter:
-        if warehouse_shape is not None:
+        if debug:
             box_ref_pos = boxes.get_ref_positions()
             log.debug(
                 "Next move %s:\n%s",
-                move.name,
-                visualize_warehouse(fish, box_ref_pos, walls, warehouse_shape, using_wide_boxes=True)
+                geo.NAMES[move],
+                visualize_warehouse(fish, box_ref_pos, walls, layout, using_wide_boxes=True)
             )
-        next_pos = fish + move
+        next_pos = fish + offsets[move]
         if next_pos in walls:
             continue
         if next_pos in boxes:
             try:
-                boxes.move(next_pos, move, walls)
+                boxes.move(next_pos, offsets[move], walls)
             except BoxesCantBeMoved:
                 continue
         fish = next_pos
-    if warehouse_shape is not None:
+    if debug:
         box_ref_pos = boxes.get_ref_positions()
         log.debug(
             "Final:\n%s",
-            visualize_warehouse(fish, box_ref_pos, walls, warehouse_shape, using_wide_boxes=True)
+            visualize_warehouse(fish, box_ref_pos, walls, layout, using_wide_boxes=True)
         )
     return boxes
 
@@ -231,7 +202,7 @@ class BoxHandler:
         box_idx = {}
         _boxes = []
         for idx, box in enumerate(boxes):
-            _box = set(map(tuple,box))
+            _box = set(box)
             _boxes.append(_box)
             for pos in _box:
                 box_idx[pos] = idx
@@ -243,7 +214,8 @@ class BoxHandler:
     def __contains__(self, pos: Position) -> bool:
         return pos in self.box_idx
 
-    def move(self, box: Position, move: Direction, walls: set[Position]) -> None:
+    def move(self, box: Position, step: int, walls: set[Position]) -> None:
+        """Move the box at `box` by the flat offset `step`, pushing any others"""
         # Get box positions
         curr_box_idx = self.box_idx[box]
         curr_box = self.boxes[curr_box_idx]
@@ -251,18 +223,18 @@ class BoxHandler:
         other_box_in_way = lambda p : p in self.box_idx and self.box_idx[p] != curr_box_idx
         moved_box = set()
         for pos in curr_box:
-            moved_pos = pos + move
-            log.debug('Checking if %s is free for box %s move', pos, move.name)
+            moved_pos = pos + step
+            log.debug('Checking if %s is free for box %+d move', pos, step)
             if moved_pos in walls:
                 log.debug('Wall preventing move')
                 raise BoxesCantBeMoved
             if other_box_in_way(moved_pos):
                 log.debug('Other box in way')
-                self.move(moved_pos, move, walls)
+                self.move(moved_pos, step, walls)
             log.debug('Able to move %s', moved_pos)
             moved_box.add(moved_pos)
 
-        log.debug('Moving box %s at %s', move.name, box)
+        log.debug('Moving box %+d at %s', step, box)
         self._update_without_check(curr_box_idx, moved_box)
 
     def _update_without_check(self, box_idx: int, new_box: set[Position]) -> None:
@@ -275,34 +247,24 @@ class BoxHandler:
             self.box_idx[pos] = box_idx
 
     def get_ref_positions(self) -> set[Position]:
-        return {next(iter(sorted(box))) for box in self.boxes}
+        return {min(box) for box in self.boxes}
 
 class BoxesCantBeMoved(Exception):
     pass
 
-def to_position(arr: np.ndarray) -> Position:
-    return int(arr[0]), int(arr[1])
-
-def to_positions(arr: np.ndarray) -> list[Position]:
-    if arr.ndim == 2:
-        return list(map(lambda p : (int(p[0]), int(p[1])), arr))
-    raise NotImplementedError(arr.ndim)
-
 ################################################################################
 # Debugging
-def visualize_warehouse(fish, boxes, walls, warehouse_shape, using_wide_boxes = False) -> str:
-    warehouse = np.full(warehouse_shape, '.', dtype='U1')
+def visualize_warehouse(fish, boxes, walls, layout, using_wide_boxes = False) -> str:
+    warehouse = np.full(layout.size, '.', dtype='U1')
     warehouse[fish] = '@'
-    idxs = tuple(map(list,zip(*boxes)))
+    idxs = list(boxes)
     if using_wide_boxes:
         warehouse[idxs] = '['
-        idxs = (idxs[0], [x+1 for x in idxs[1]])
-        warehouse[idxs] = ']'
+        warehouse[[x+1 for x in idxs]] = ']'
     else:
         warehouse[idxs] = 'O'
-    idxs = tuple(map(list,zip(*walls)))
-    warehouse[idxs] = '#'
-    return '\n'.join(''.join(row) for row in warehouse)
+    warehouse[list(walls)] = '#'
+    return '\n'.join(''.join(row) for row in warehouse.reshape(layout.shape))
 
 ################################################################################
 if __name__ == "__main__":
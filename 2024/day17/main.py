@@ -2,14 +2,10 @@
 # Standard library
 import logging
 import re
-import time
 import io
 from itertools import count
 import math
 
-
-from tqdm import tqdm
-
 # 1st party
 import aoc_utils as aoc
 
@@ -33,7 +29,7 @@ log = logging.getLogger('AoC')
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
+    aoc.configure(args)
     text = aoc.read_input(args.input)
     
     # Solution
@@ -45,16 +41,10 @@ def main() -> None:
     program = tuple(map(int, program_text[len('Program: '):].split(',')))
 
     # Part 1
-    start = time.perf_counter()
-    output = simulate_computer(registers, program)
-    elapsed = time.perf_counter() - start
-    print(f'Part 1: {output} [t={elapsed*1000:.3f}ms]')
+    aoc.bench.part('Part 1', simulate_computer, registers, program)
 
     # Part 2
-    start = time.perf_counter()
-    reg_a = find_self_replicating_reg_a(registers, program)
-    elapsed = time.perf_counter() - start
-    print(f'Part 2: {reg_a} [t={elapsed*1000:.3f}ms]')
+    aoc.bench.part('Part 2', find_self_replicating_reg_a, registers, program)
 
 ################################################################################
 def simulate_computer(registers, program) -> tuple[int, ...]:
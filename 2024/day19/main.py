@@ -1,8 +1,6 @@
 #!/usr/bin/env python
 # Standard library
 import logging
-import time
-from functools import lru_cache
 from collections import defaultdict
 from dataclasses import dataclass, field
 
@@ -34,7 +32,7 @@ log = logging.getLogger('AoC')
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
+    aoc.configure(args)
     text = aoc.read_input(args.input)
 
     # Solution
@@ -54,7 +52,7 @@ def main() -> None:
     for p in text_in.split(', '):
         towel_patterns.add(p)
 
-    @lru_cache(maxsize=2**16)
+    @aoc.disk_cache(maxsize=2**16, context=text_in)
     def count_arrangements(design: str) -> int:
         if design == '':
             return 1
@@ -68,14 +66,15 @@ def main() -> None:
             for p in towel_patterns.get_prefixes(design)
         )
 
-    # Part 1 & 2
-    start = time.perf_counter()
-    n = list(map(count_arrangements, designs))
-    n_possible_designs = sum(map(bool, n))
-    n_arrangements = sum(n)
-    elapsed = time.perf_counter() - start
-    print(f'Part 1: {n_possible_designs} [t={elapsed*1000:.3f}ms]')
-    print(f'Part 2: {n_arrangements} [SAME]')
+    def count_all_arrangements() -> list[int]:
+        count_arrangements.cache_clear() # Time each part from scratch
+        return list(map(count_arrangements, designs))
+
+    # Part 1
+    aoc.bench.part('Part 1', lambda : sum(map(bool, count_all_arrangements())))
+
+    # Part 2
+    aoc.bench.part('Part 2', lambda : sum(count_all_arrangements()))
 
 ################################################################################
 @dataclass(slots=True)
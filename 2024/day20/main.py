@@ -1,15 +1,7 @@
 #!/usr/bin/env python
 # Standard library
-import heapq
 import logging
-import time
 from collections.abc import Iterable
-from dataclasses import dataclass
-from enum import Enum
-
-# 3rd party
-import numpy as np
-from tqdm import tqdm
 
 # 1st party
 import aoc_utils as aoc
@@ -43,41 +35,37 @@ log = logging.getLogger('AoC')
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
+    aoc.configure(args)
     text = aoc.read_input(args.input)
 
     # Solution
-    lines = text.splitlines()
-    racetrack  = np.array(lines).view('U1').reshape(len(lines),-1)
+    racetrack = aoc.Grid.from_text(text)
 
     time_savings_threshold_pt1 = time_savings_threshold_pt2 = 100
     if racetrack.shape == (15,15): # example
         time_savings_threshold_pt1 = 1
         time_savings_threshold_pt2 = 50
 
-    start = time.perf_counter()
-    race_path = find_best_path(racetrack)
+    race_path = aoc.bench.step('Best path', find_best_path, racetrack)
     assert race_path is not None
     path = {p : i for i, p in enumerate(race_path)}
-    elapsed_shared = time.perf_counter() - start
 
     # Part 1
-    start = time.perf_counter()
-    n_cheats = sum(
-        time_saved >= time_savings_threshold_pt1
-        for time_saved in find_cheats(path, max_picosec=2).values()
+    aoc.bench.part('Part 1',
+        count_cheats, path, max_picosec=2, threshold=time_savings_threshold_pt1
     )
-    elapsed = time.perf_counter() - start
-    print(f'Part 1: {n_cheats} [t={(elapsed_shared+elapsed)*1000:.3f}ms]')
 
     # Part 2
-    start = time.perf_counter()
-    n_cheats = sum(
-        time_saved >= time_savings_threshold_pt2
-        for time_saved in find_cheats(path, max_picosec=20).values()
+    aoc.bench.part('Part 2',
+        count_cheats, path, max_picosec=20, threshold=time_savings_threshold_pt2
+    )
+
+################################################################################
+def count_cheats(path, max_picosec: int, threshold: int) -> int:
+    return sum(
+        time_saved >= threshold
+        for time_saved in find_cheats(path, max_picosec).values()
     )
-    elapsed = time.perf_counter() - start
-    print(f'Part 2: {n_cheats} [t={(elapsed_shared+elapsed)*1000:.3f}ms]')
 
 ################################################################################
 Position = tuple[int, int]
@@ -87,7 +75,7 @@ def find_cheats(
     max_picosec: int
 ) -> dict[tuple[Position, Position], int]:
     cheats : dict[tuple[Position, Position], int]= {}
-    for pos_start, i in tqdm(path.items()):
+    for pos_start, i in aoc.progress(path.items(), total=len(path)):
         for pos_final, j in get_reachable_positions(pos_start, path, max_picosec):
             if j <= i: # Ignore cheats that go backwards
                 continue
@@ -111,62 +99,20 @@ def distance(p1: Position, p2: Position) -> int:
     '''2D manhattan distance'''
     return abs(p1[0]-p2[0]) + abs(p1[1]-p2[1])
 
-class Direction(Enum):
-    UP    = (-1, 0)
-    DOWN  = ( 1, 0)
-    LEFT  = ( 0,-1)
-    RIGHT = ( 0, 1)
-
-    def __radd__(self, loc: Position) -> Position:
-        return (loc[0]+self.value[0], loc[1]+self.value[1])
-
-    def turn_ccw(self) -> 'Direction':
-        return Direction((-self.value[1], self.value[0]))
-
-    def turn_cw(self) -> 'Direction':
-        return Direction((self.value[1], -self.value[0]))
-
-@dataclass(slots=True)
-class RacePath:
-    pos   : Position
-    dir   : Direction
-    path  : list[Position]
-
-    def __lt__(self, other) -> bool:
-        return len(self.path) < len(other.path)
-
-def find_best_path(maze: np.ndarray) -> list[Position] | None:
-    start     = get_coords(maze == 'S')[0]
-    target    = get_coords(maze == 'E')[0]
-    is_wall   = lambda p : maze[p] == '#'
-
-    # Find starting direction
-    start_dir = None
-    for d in Direction:
-        if not is_wall(start + d):
-            start_dir = d
-            break
-    assert start_dir is not None
-
-    paths_in_progress = [RacePath(start, start_dir, [start])]
-    while len(paths_in_progress) > 0:
-        path = heapq.heappop(paths_in_progress)
-        for move in (path.dir, path.dir.turn_cw(), path.dir.turn_ccw()):
-            next_pos  = path.pos + move
-            if is_wall(next_pos):
-                continue
-            if next_pos == target:
-                return path.path + [next_pos]
-            path_new  = RacePath(
-                pos  = next_pos,
-                dir  = move,
-                path = path.path + [next_pos],
-            )
-            heapq.heappush(paths_in_progress, path_new)
-    return None
-
-def get_coords(mask: np.ndarray) -> list[Position]:
-    return [(int(x), int(y)) for x,y in zip(*np.where(mask))]
+def find_best_path(maze: aoc.Grid) -> list[Position] | None:
+    # Search states are flat indices into the maze
+    start     = maze.index(*maze.find_one('S'))
+    target    = maze.index(*maze.find_one('E'))
+    is_open   = (maze.flat != maze.code('#')).tolist()
+    neighbors = maze.neighbors4.tolist()
+
+    def next_steps(idx: int) -> Iterable[int]:
+        return (n for n in neighbors[idx] if n >= 0 and is_open[n])
+
+    best = aoc.search.bfs(maze.size, [start], next_steps, goal=target.__eq__)
+    if best.goal is None:
+        return None
+    return [maze.coords(idx) for idx in best.path(best.goal)]
 
 ################################################################################
 if __name__ == "__main__":
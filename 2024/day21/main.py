@@ -1,9 +1,8 @@
 #!/usr/bin/env python
 # Standard library
 import logging
-import time
 from collections.abc import Callable, Iterable
-from functools import lru_cache, partial
+from functools import partial
 from itertools import pairwise, permutations, starmap
 from typing import Literal
 
@@ -28,37 +27,33 @@ log = logging.getLogger('AoC')
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
+    aoc.configure(args)
     text = aoc.read_input(args.input)
 
     # Solution
     codes = text.splitlines()
-    parse_num = lambda code : int(code[:-1])
 
     # Part 1
-    start = time.perf_counter()
-    total_complexity = sum(
-        parse_num(code) * find_min_presses_keypad(code, n_dirpads=3)
-        for code in codes
-    )
-    elapsed = time.perf_counter() - start
-    print(f'Part 1: {total_complexity} [t={(elapsed)*1000:.3f}ms]')
+    aoc.bench.part('Part 1', sum_complexities, codes, n_dirpads=3)
 
     # Part 2
-    start = time.perf_counter()
-    total_complexity = sum(
-        parse_num(code) * find_min_presses_keypad(code, n_dirpads=26)
-        for code in codes
-    )
-    elapsed = time.perf_counter() - start
-    print(f'Part 2: {total_complexity} [t={(elapsed)*1000:.3f}ms]')
+    aoc.bench.part('Part 2', sum_complexities, codes, n_dirpads=26)
 
 ################################################################################
+def sum_complexities(codes: list[str], n_dirpads: int) -> int:
+    # Time each run from scratch
+    find_min_presses_dirpad.cache_clear()
+    generate_possible_presses_dirpad.cache_clear()
+    parse_num = lambda code : int(code[:-1])
+    return sum(
+        parse_num(code) * find_min_presses_keypad(code, n_dirpads)
+        for code in codes
+    )
 
 def find_min_presses_keypad(code: str, n_dirpads: int) -> int:
     return _find_min_presses(code, n_dirpads, generate_possible_presses_numpad)
 
-@lru_cache(maxsize=2**16) # BIG speedup from memoizing
+@aoc.disk_cache(maxsize=2**16) # BIG speedup from memoizing
 def find_min_presses_dirpad(dirpad_seq: str, n_dirpads: int) -> int:
     return _find_min_presses(dirpad_seq, n_dirpads, generate_possible_presses_dirpad)
 
@@ -99,7 +94,7 @@ DIRPAD = {
                  '^' : (0,1), 'A' : (0,2),
     '<' : (1,0), 'v' : (1,1), '>' : (1,2),
 }
-@lru_cache(maxsize=len(DIRPAD)**2)
+@aoc.cache(maxsize=len(DIRPAD)**2)
 def generate_possible_presses_dirpad(b0: DirpadButton, b1: DirpadButton) -> list[str]:
     paths = generate_all_button_paths(DIRPAD[b0], DIRPAD[b1])
     return [seq for (seq, positions) in paths if (0,0) not in positions]
@@ -1,7 +1,6 @@
 #!/usr/bin/env python
 # Standard library
 import logging
-import time
 from collections import Counter
 from itertools import accumulate
 
@@ -9,7 +8,6 @@ from itertools import accumulate
 import numpy as np
 from numpy.lib.stride_tricks import sliding_window_view
 from numpy.typing import NDArray
-from tqdm import tqdm
 
 # 1st party
 import aoc_utils as aoc
@@ -33,29 +31,29 @@ log = logging.getLogger('AoC')
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
+    aoc.configure(args)
     text = aoc.read_input(args.input)
 
     # Solution
     initial_secret_nums = [int(x) for x in text.splitlines()]
 
     # Part 1
-    start = time.perf_counter()
-    secret_nums = np.stack([
-        simulate_secret_numbers(n, 2000) for n in tqdm(initial_secret_nums)
-    ])
-    total = secret_nums[:,-1].sum()
-    elapsed = time.perf_counter() - start
-    print(f'Part 1: {total} [t={(elapsed)*1000:.3f}ms]')
+    aoc.bench.part('Part 1',
+        lambda : int(simulate_all_secret_numbers(initial_secret_nums)[:,-1].sum())
+    )
 
     # Part 2
-    start = time.perf_counter()
-    n_bananas = buy_max_bananas(secret_nums)
-    elapsed = time.perf_counter() - start
-    print(f'Part 1: {n_bananas} [t={(elapsed)*1000:.3f}ms]')
+    aoc.bench.part('Part 2',
+        lambda : buy_max_bananas(simulate_all_secret_numbers(initial_secret_nums))
+    )
 
 
 ################################################################################
+def simulate_all_secret_numbers(initial_secret_nums: list[int]) -> ArrInt32:
+    return np.stack([
+        simulate_secret_numbers(n, 2000) for n in aoc.progress(initial_secret_nums)
+    ])
+
 def simulate_secret_numbers(secret_num: int, n_steps: int) -> ArrInt32:
     nums = np.zeros(n_steps+1, dtype=np.int32)
     nums[0] = secret_num
@@ -84,7 +82,7 @@ def buy_max_bananas(secret_nums: ArrInt32) -> int:
     window_size = 4
 
     windows = sliding_window_view(changes, window_shape=window_size, axis=1)
-    rows = tqdm(windows, desc='Counting sequences', unit='row')
+    rows = aoc.progress(windows, desc='Counting sequences', unit='row')
     sequences = sum(
         (Counter(set(map(tuple, row.tolist()))) for row in rows),
         start = Counter()
@@ -100,7 +98,7 @@ def buy_max_bananas(secret_nums: ArrInt32) -> int:
     max_n_bananas = 0
     log.debug(Counter(sequences.values()))
     # VERY SLOW: ~1hr to run
-    for seq, cnt in tqdm(sequences.most_common(), unit='seq'):
+    for seq, cnt in aoc.progress(sequences.most_common(), unit='seq'):
         # Early exits
         if max_possible[cnt] <= max_n_bananas:
             break
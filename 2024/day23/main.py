@@ -1,7 +1,6 @@
 #!/usr/bin/env python
 # Standard library
 import logging
-import time
 from collections import defaultdict
 from collections.abc import Iterable
 
@@ -31,7 +30,7 @@ log = logging.getLogger('AoC')
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
+    aoc.configure(args)
     text = aoc.read_input(args.input)
 
     # Solution
@@ -43,18 +42,14 @@ def main() -> None:
     graph: Graph = dict(graph)
 
     # Part 1
-    start     = time.perf_counter()
-    cliques   = find_3cliques(graph)
-    n_cliques = sum(any(node.startswith('t') for node in c) for c in cliques)
-    elapsed   = time.perf_counter() - start
-    print(f'Part 1: {n_cliques} [t={(elapsed)*1000:.3f}ms]')
+    aoc.bench.part('Part 1', lambda : sum(
+        any(node.startswith('t') for node in c) for c in find_3cliques(graph)
+    ))
 
     # Part 2
-    start    = time.perf_counter()
-    clique   = max(find_maximal_cliques(graph), key=len)
-    password = ','.join(sorted(clique))
-    elapsed  = time.perf_counter() - start
-    print(f'Part 2: {password!r} [t={(elapsed)*1000:.3f}ms]')
+    aoc.bench.part('Part 2',
+        lambda : ','.join(sorted(max(find_maximal_cliques(graph), key=len)))
+    )
 
 ################################################################################
 Vertex = str
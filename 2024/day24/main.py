@@ -1,9 +1,9 @@
 #!/usr/bin/env python
 # Standard library
 from collections import defaultdict
+import copy
 import logging
 from os import defpath
-import time
 from typing import NamedTuple, Callable
 from graphlib import TopologicalSorter
 from collections.abc import Iterable
@@ -13,14 +13,13 @@ from itertools import chain
 from collections import Counter, deque
 from dataclasses import dataclass, field
 
-# 3rd party
-from tqdm import tqdm
-import networkx as nx
-import matplotlib.pyplot as plt
-
 # 1st party
 import aoc_utils as aoc
 
+# 3rd party (only needed to visualize the circuit)
+nx  = aoc.lazy_import('networkx', optional=True)
+plt = aoc.lazy_import('matplotlib.pyplot', optional=True)
+
 # Globals
 log = logging.getLogger('AoC')
 
@@ -45,25 +44,28 @@ log = logging.getLogger('AoC')
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
+    aoc.configure(args)
     text = aoc.read_input(args.input)
 
     # Parse
-    txt_wires, txt_gates = text.split('\n\n')
-    circuit  = parse_circuit(txt_gates.strip().split('\n'))
-    wires_in = dict(map(parse_wire, txt_wires.strip().split('\n')))
+    circuit, wires_in = aoc.bench.step('Parse', parse, text)
 
     # Part 1
-    start     = time.perf_counter()
+    aoc.bench.part('Part 1', simulate_output, circuit, wires_in)
+
+    # Part 2 - Requires manual inspection of circuit graph
+    aoc.bench.part('Part 2', fix_adder, circuit)
+
+################################################################################
+def simulate_output(circuit, wires_in) -> int:
     simulate_circuit(circuit, wires_in)
     bits_z   = get_bits(circuit.wires, 'z')
-    z        = bits_to_int(bits_z)
-    elapsed  = time.perf_counter() - start
-    print(f'Part 1: {z} [t={(elapsed)*1000:.3f}ms]')
+    return bits_to_int(bits_z)
 
-    # Part 2 - Requires manual inspection of circuit graph
-    start  = time.perf_counter()
+def fix_adder(circuit) -> str:
     # TODO: Implement something automatic.
+    # Swapped on a copy so that repeated runs start from the parsed circuit
+    circuit = copy.deepcopy(circuit)
     swaps = [
         ('hdt', 'z05'),
         ('gbf', 'z09'),
@@ -78,17 +80,28 @@ def main() -> None:
             w1.gate_prev.out = w1
         if w2.gate_prev is not None:
             w2.gate_prev.out = w2
-        
-    # Generate graph
-    fig, _ = visulize_circuit(circuit)
-    fig.savefig('adder_circuit.png')
+
     # Validate ripple adder circuit, raising AssertionError once something is
     # incorect. Then go look at the circuit graph and figure out which wires
     # needs to be switched. Add them to the list above and then re-run to find
     # next error. Repeat until validation succeeeds.
-    validate_adder(circuit)
-    elapsed  = time.perf_counter() - start
-    print(f'Part 2: [t={(elapsed)*1000:.3f}ms]')
+    try:
+        validate_adder(circuit)
+    except AssertionError:
+        save_circuit_graph(circuit)
+        raise
+    if log.isEnabledFor(logging.DEBUG):
+        save_circuit_graph(circuit)
+    return ','.join(sorted(chain.from_iterable(swaps)))
+
+def save_circuit_graph(circuit, path: str = 'adder_circuit.png') -> None:
+    try:
+        fig, _ = visulize_circuit(circuit)
+    except ModuleNotFoundError as e:
+        log.warning('Not drawing the circuit graph: %s', e)
+        return
+    fig.savefig(path)
+    log.info('Circuit graph saved to %s', path)
 
 
 ################################################################################
@@ -278,6 +291,13 @@ def visulize_circuit(circuit: Circuit):
     return fig, ax
 
 ################################################################################
+@aoc.parse_cache
+def parse(text: str) -> tuple['Circuit', dict[str, bool]]:
+    txt_wires, txt_gates = text.split('\n\n')
+    circuit  = parse_circuit(txt_gates.strip().split('\n'))
+    wires_in = dict(map(parse_wire, txt_wires.strip().split('\n')))
+    return circuit, wires_in
+
 def parse_circuit(txt_gates):
     gates = []
     wires = {}
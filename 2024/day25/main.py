@@ -1,7 +1,6 @@
 #!/usr/bin/env python
 # Standard library
 import logging
-import time
 
 # 3rd party
 import numpy as np
@@ -37,7 +36,7 @@ log = logging.getLogger('AoC')
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
+    aoc.configure(args)
     text = aoc.read_input(args.input)
 
     locks = []
@@ -51,10 +50,9 @@ def main() -> None:
     keys  = np.array(keys)
 
     # Part 1
-    start     = time.perf_counter()
-    n_pairs   = ((locks.reshape(-1,1,5) + keys) <= 5).all(axis=-1).sum()
-    elapsed   = time.perf_counter() - start
-    print(f'Part 1: {n_pairs} [t={(elapsed)*1000:.3f}ms]')
+    aoc.bench.part('Part 1',
+        lambda : int(((locks.reshape(-1,1,5) + keys) <= 5).all(axis=-1).sum())
+    )
 
     # Part 2 - N/A
 
@@ -5,49 +5,51 @@ Day 1: Secret Entrance
 
 # Standard library
 import logging
-import time
 
 # 1st party
 import aoc_utils as aoc
 
 log = logging.getLogger('AoC')
 
+DIAL_SIZE  = 100
+DIAL_START = 50
+
 ################################################################################
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
-    text = aoc.read_input(args.input)
-
-    DIAL_SIZE = 100
-    DIAL_START = 50
+    aoc.configure(args)
+    lines  = aoc.iter_lines(args.input, args.max_lines)
+    clicks = [parse_num_clicks(line) for line in lines]
 
     # Part 1
-    start = time.perf_counter()
+    aoc.bench.part('Part 1', part01, clicks)
+
+    # Part 2
+    aoc.bench.part('Part 2', part02, clicks)
+
+def part01(clicks: list[int]) -> int:
     dial = DIAL_START
     n_zeros = 0;
-    for line in text.splitlines():
-        dial += parse_num_clicks(line)
+    for n_clicks in clicks:
+        dial += n_clicks
         n_zeros += (dial % DIAL_SIZE == 0)
         dial %= DIAL_SIZE 
-    elapsed = time.perf_counter() - start
-    print('Part 1:', n_zeros, f'[{elapsed*1000:.3f}ms]')
+    return n_zeros
 
-    # Part 2
-    start = time.perf_counter()
+def part02(clicks: list[int]) -> int:
     dial = DIAL_START
     n_zeros = 0;
-    for line in text.splitlines():
+    for n_clicks in clicks:
         dial_start = dial 
-        dial += parse_num_clicks(line)
+        dial += n_clicks
         n_zeros += (
             (dial == 0) 
             + (dial_start > 0 > dial) 
             + (abs(dial) // DIAL_SIZE)
         )
         dial %= DIAL_SIZE
-    elapsed = time.perf_counter() - start
-    print('Part 2:', n_zeros, f'[{elapsed*1000:.3f}ms]')
+    return n_zeros
 
 ################################################################################
 def parse_num_clicks(line: str) -> int:
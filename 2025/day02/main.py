@@ -4,7 +4,6 @@
 # Standard library
 import logging
 import math
-import time
 from typing import cast
 
 # 1st party
@@ -17,29 +16,21 @@ log = logging.getLogger("AoC")
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
+    aoc.configure(args)
     text = aoc.read_input(args.input)
     id_ranges = [tuple(r.rstrip().split("-")[:2]) for r in text.split(",")]
     id_ranges = cast("list[tuple[str, str]]", id_ranges)
 
     # Part 1
-    start = time.perf_counter()
-    total = part01(id_ranges)
-    elapsed = time.perf_counter() - start
-    log.info("Part 1: %d [%.3fms]", total, elapsed * 1000)
+    total = aoc.bench.part("Part 1", part01, id_ranges)
 
     # Part 2
-    start = time.perf_counter()
-    total = part02(id_ranges)
-    elapsed = time.perf_counter() - start
-    log.info("Part 2: %d [%.3fms]", total, elapsed * 1000)
+    aoc.bench.part("Part 2", part02, id_ranges)
 
     ####################################
     # Part 1: Do everything with integer arithmetic
-    start = time.perf_counter()
-    total = part01_int(id_ranges)
-    elapsed = time.perf_counter() - start
-    log.info("Part 1 (int-only): %d [%.3fms]", total, elapsed * 1000)
+    total_int = aoc.bench.part("Part 1 (int-only)", part01_int, id_ranges)
+    assert total_int == total
 
 
 def part01(id_ranges: list[tuple[str, str]]) -> int:
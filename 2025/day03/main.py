@@ -3,7 +3,6 @@
 
 # Standard library
 import logging
-import time
 
 # 3rd party
 import numpy as np
@@ -23,28 +22,23 @@ ArrU8 = NDArray[np.uint8]
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
-    text = aoc.read_input(args.input)
-    lines = text.splitlines()
-    data = np.array(lines).view("U1").astype(np.int8).reshape(len(lines), -1)
+    aoc.configure(args)
+    mapped = aoc.read_input_mmap(args.input)
+    data = mapped.grid().astype(np.int8) - ord("0")
 
     # Part 1
-    start = time.perf_counter()
-    total = get_max_joltage_pt1(data)
-    elapsed = time.perf_counter() - start
-    log.info("Part 1: %d [%.3fms]", total, elapsed * 1000)
+    aoc.bench.part("Part 1", get_max_joltage_pt1, data)
 
     # Part 2
-    start = time.perf_counter()
-    total = sum(get_max_joltage_pt2(row, n=12) for row in data)
-    elapsed = time.perf_counter() - start
-    log.info("Part 2: %d [%.3fms]", total, elapsed * 1000)
+    total = aoc.bench.part(
+        "Part 2", lambda: int(sum(get_max_joltage_pt2(row, n=12) for row in data))
+    )
 
     # Alternate approaches
-    start = time.perf_counter()
-    total = sum(get_max_joltage_pt2b(row) for row in data)
-    elapsed = time.perf_counter() - start
-    log.info("Part 2 (B): %d [%.3fms]", total, elapsed * 1000)
+    total_b = aoc.bench.part(
+        "Part 2 (B)", lambda: sum(get_max_joltage_pt2b(row) for row in data)
+    )
+    assert total_b == total
 
 
 def get_max_joltage_pt1(data: NDArray[np.uint8]) -> int:
@@ -2,12 +2,9 @@
 
 # Standard library
 import logging
-import time
-from typing import Annotated
 
 # 3rd party
 import numpy as np
-from numpy.typing import NDArray
 from scipy.signal import convolve2d
 
 # 1st party
@@ -16,36 +13,26 @@ import aoc_utils as aoc
 # Globals
 log = logging.getLogger("AoC")
 
-# Type aliases
-ArrStrU1 = Annotated[NDArray[np.str_], "U1"]
-
 
 ################################################################################
 def main() -> None:
     # Boilerplate
     args = aoc.parse_args()
-    aoc.configure_logging(args.log_level)
+    aoc.configure(args)
 
     # Get data
-    text  = aoc.read_input(args.input)
-    lines = text.splitlines()
-    data  = np.array(lines).view("U1").reshape(len(lines), -1)
+    text = aoc.read_input(args.input)
+    data = aoc.Grid.from_text(text)
 
     # Part 1
-    start = time.perf_counter()
-    n_rolls = part01(data)
-    elapsed = time.perf_counter() - start
-    log.info("Part 1: %d [%.3fms]", n_rolls, elapsed * 1000)
+    aoc.bench.part("Part 1", lambda: int(part01(data)))
 
     # Part 2
-    start = time.perf_counter()
-    n_rolls = part02(data)
-    elapsed = time.perf_counter() - start
-    log.info("Part 2: %d [%.3fms]", n_rolls, elapsed * 1000)
+    aoc.bench.part("Part 2", lambda: int(part02(data)))
 
 
-def part01(data: ArrStrU1) -> int:
-    is_roll = data == "@"
+def part01(data: aoc.Grid) -> int:
+    is_roll = data.mask("@")
     conv = np.array(
         [
             [1, 1, 1],
@@ -58,8 +45,8 @@ def part01(data: ArrStrU1) -> int:
     return np.sum(is_roll * convolve2d(is_roll, conv, mode="same") < max_rolls)
 
 
-def part02(data: ArrStrU1) -> int:
-    is_roll = data == "@"
+def part02(data: aoc.Grid) -> int:
+    is_roll = data.mask("@")
     conv = np.array(
         [
             [1, 1, 1],
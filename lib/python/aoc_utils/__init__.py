@@ -0,0 +1,144 @@
+"""
+Utilites for Advent of Code challenges
+"""
+# Standard library
+import argparse
+import logging
+import sys
+from typing import Any
+
+# 1st party
+from aoc_utils import bench, geometry, memo, profiling, progressbar, search, solver
+from aoc_utils.chainable import ChainProfile, Chainable, LazyChainable
+from aoc_utils.inputs import (
+    MappedInput,
+    iter_lines,
+    iter_records,
+    read_input,
+    read_input_mmap,
+)
+from aoc_utils.lazy import lazy_import
+from aoc_utils.memo import cache, disk_cache, parse_cache
+from aoc_utils.progressbar import progress
+from aoc_utils.solver import solve
+
+# Globals
+log = logging.getLogger('AoC')
+
+def __getattr__(name: str) -> Any:
+    # Grid needs numpy, which solvers that don't use it shouldn't have to load
+    if name == 'Grid':
+        from aoc_utils.grid import Grid
+        return Grid
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+################################################################################
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        'input',
+        nargs='?',
+        type=argparse.FileType('r'),
+        default=sys.stdin,
+        help='input file path (use - for stdin)'
+    )
+    parser.add_argument(
+        '-l', '--log-level',
+        default = 'WARNING',
+        help    = 'Logging level'
+    )
+    parser.add_argument(
+        '-n', '--max-lines',
+        type = int,
+        help = "Max lines of input file to process",
+    )
+    group = parser.add_argument_group('benchmarking')
+    group.add_argument(
+        '-r', '--repeat',
+        type    = int,
+        default = 1,
+        help    = 'Timed runs per part (parts must not mutate their inputs)',
+    )
+    group.add_argument(
+        '--warmup',
+        type    = int,
+        default = 0,
+        help    = 'Untimed runs per part before the timed runs',
+    )
+    group.add_argument(
+        '--bench-json',
+        metavar = 'PATH',
+        help    = 'Write timings to a JSON file (or a directory, one file per day)',
+    )
+    group.add_argument(
+        '--no-progress',
+        action = 'store_true',
+        help   = 'Hide progress bars (implied by --repeat, --warmup and --profile)',
+    )
+    group.add_argument(
+        '--profile-memory',
+        nargs   = '?',
+        type    = int,
+        const   = 5,
+        metavar = 'N',
+        help    = 'Trace allocations in an extra run of each part and print the '
+                  'peak and top N allocation sites (default: 5)',
+    )
+    group.add_argument(
+        '--profile',
+        choices = profiling.CPU_PROFILERS,
+        help    = 'Run each part again under a CPU profiler, saving the profile '
+                  'and printing the slowest functions',
+    )
+    group.add_argument(
+        '--profile-dir',
+        default = 'profiles',
+        metavar = 'DIR',
+        help    = 'Where --profile writes .prof/.collapsed files (default: profiles)',
+    )
+    group.add_argument(
+        '--profile-top',
+        type    = int,
+        default = 10,
+        metavar = 'N',
+        help    = 'Functions --profile prints by cumulative time (default: 10)',
+    )
+    group = parser.add_argument_group('caching')
+    group.add_argument(
+        '--disk-cache',
+        nargs   = '?',
+        const   = memo.DEFAULT_PATH,
+        metavar = 'PATH',
+        help    = f'Persist @disk_cache results between runs (default: {memo.DEFAULT_PATH})',
+    )
+    group.add_argument(
+        '--parse-cache',
+        action = 'store_true',
+        help   = f'Store @parse_cache results in {memo.PARSED_DIR_NAME}/ next to the input',
+    )
+
+    return parser.parse_args()
+
+def configure(args: argparse.Namespace) -> None:
+    """Apply the common command line options"""
+    configure_logging(args.log_level)
+    bench.configure(
+        args.repeat, args.warmup, args.bench_json,
+        memory      = args.profile_memory,
+        profile     = args.profile,
+        profile_dir = args.profile_dir,
+        profile_top = args.profile_top,
+    )
+    progressbar.configure(not (
+        args.no_progress or args.repeat > 1 or args.warmup > 0 or args.profile
+    ))
+    memo.configure(args.disk_cache)
+    memo.configure_parse_cache(args.input.name if args.parse_cache else None)
+
+def configure_logging(level: str) -> None:
+    logging.basicConfig(
+        level  = level,
+        format = "%(message)s",
+        force  = True,
+    )
+
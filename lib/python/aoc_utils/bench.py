@@ -0,0 +1,240 @@
+"""
+Timing and reporting solver parts
+
+Every solver reports its answers through `part()` so timings are measured and
+printed the same way everywhere and can be collected into a JSON report.
+
+Examples
+========
+>>> args = aoc.parse_args()
+>>> aoc.configure(args)
+>>> data = aoc.bench.step('Parse', parse, text)
+>>> aoc.bench.part('Part 1', solve_part1, data)
+Part 1: 42 [t=1.234ms]
+
+$ ./main.py input.txt --warmup 2 --repeat 20 --bench-json reports/
+Part 1: 42 [t=1.201ms median, 1.187ms min, 1.342ms p95, n=20]
+
+$ ./main.py input.txt --profile cprofile --profile-top 2
+Part 1: 42 [t=1.234ms]
+    cumtime  selftime  calls  function
+    1.302ms   0.415ms      1  2024/day01/main.py:43(compute_total_diff)
+    0.887ms   0.887ms      1  <built-in method builtins.sorted>
+Profile written to profiles/2024_day01_part_1.prof
+
+$ ./main.py input.txt --profile-memory 3
+Part 1: 42 [t=1.234ms] [peak=2.1MiB]
+    1.6MiB in 10,001 blocks at 2024/day01/main.py:30
+    ...
+"""
+# Standard library
+import atexit
+import datetime
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+# 1st party
+from aoc_utils import profiling
+
+# Globals
+log = logging.getLogger('AoC')
+
+################################################################################
+@dataclass(slots=True)
+class Config:
+    repeat : int         = 1
+    warmup : int         = 0
+    report : Path | None = None
+    name   : str | None  = None
+    memory : int | None  = None # Allocation sites to list if profiling memory
+    profile     : str | None = None # CPU profiler, one of profiling.CPU_PROFILERS
+    profile_dir : Path       = Path('profiles')
+    profile_top : int        = 10
+
+@dataclass(slots=True)
+class PartResult:
+    label  : str
+    answer : Any
+    times  : list[float] = field(default_factory=list) # seconds
+    memory  : profiling.MemoryProfile | None = None
+    profile : profiling.CpuProfile | None    = None
+
+    @property
+    def min(self) -> float:
+        return min(self.times)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.times)
+
+    @property
+    def mean(self) -> float:
+        return statistics.fmean(self.times)
+
+    @property
+    def p95(self) -> float:
+        if len(self.times) == 1:
+            return self.times[0]
+        return statistics.quantiles(self.times, n=20, method='inclusive')[-1]
+
+    def timing(self) -> str:
+        if len(self.times) == 1:
+            return f'[t={self.min*1000:.3f}ms]'
+        return (
+            f'[t={self.median*1000:.3f}ms median, {self.min*1000:.3f}ms min, '
+            f'{self.p95*1000:.3f}ms p95, n={len(self.times)}]'
+        )
+
+    def summary(self) -> str:
+        """Timing, and peak memory if profiled"""
+        if self.memory is None:
+            return self.timing()
+        return f'{self.timing()} {self.memory.summary()}'
+
+    def details(self) -> str:
+        """Allocation sites and slowest functions if profiled"""
+        lines = []
+        if self.memory is not None and self.memory.sites:
+            lines.append(self.memory.format_sites())
+        if self.profile is not None:
+            lines.append(self.profile.format_top())
+            lines.append(f'Profile written to {self.profile.path}')
+        return '\n'.join(lines)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'label'     : self.label,
+            'answer'    : None if self.answer is None else str(self.answer),
+            'n'         : len(self.times),
+            'min_ms'    : self.min * 1000,
+            'median_ms' : self.median * 1000,
+            'p95_ms'    : self.p95 * 1000,
+            'mean_ms'   : self.mean * 1000,
+            'times_ms'  : [t * 1000 for t in self.times],
+            'memory'    : None if self.memory is None else self.memory.to_dict(),
+            'profile'   : None if self.profile is None else self.profile.to_dict(),
+        }
+
+_CONFIG  = Config()
+_RESULTS : list[PartResult] = []
+
+################################################################################
+def configure(
+    repeat : int = 1,
+    warmup : int = 0,
+    report : str | Path | None = None,
+    name   : str | None = None,
+    memory : int | None = None,
+    profile     : str | None = None,
+    profile_dir : str | Path = 'profiles',
+    profile_top : int = 10,
+) -> None:
+    """
+    Set how parts are timed and clear previous results. With `report`, a JSON
+    report is written there at exit (into a file named after the solver if it
+    is a directory). With `memory`, each part is also profiled with
+    `profiling.profile_memory()`, listing that many allocation sites. With
+    `profile`, each part is also run under that CPU profiler, writing its
+    profile into `profile_dir` and listing the `profile_top` slowest functions.
+    """
+    global _CONFIG
+    if repeat < 1 or warmup < 0:
+        raise ValueError(f'Invalid repeat={repeat} or warmup={warmup}')
+    if profile is not None and profile not in profiling.CPU_PROFILERS:
+        raise ValueError(f'Unknown profiler {profile!r}: expected one of {profiling.CPU_PROFILERS}')
+    # Resolve the name now since __main__ may already be torn down at exit
+    name = name if name is not None else _main_solver_name()
+    _CONFIG = Config(
+        repeat, warmup, Path(report) if report else None, name, memory,
+        profile, Path(profile_dir), profile_top,
+    )
+    _RESULTS.clear()
+    atexit.unregister(_write_report_at_exit)
+    if _CONFIG.report is not None:
+        atexit.register(_write_report_at_exit)
+
+def part[T](label: str, func: Callable[..., T], *args, **kwargs) -> T:
+    """Time `func(*args, **kwargs)` and print its answer"""
+    result = _measure(label, func, args, kwargs)
+    _RESULTS.append(result)
+    print(f'{label}: {result.answer} {result.summary()}')
+    if details := result.details():
+        print(details)
+    return result.answer
+
+def step[T](label: str, func: Callable[..., T], *args, **kwargs) -> T:
+    """Time an intermediate step (e.g. parsing) whose output isn't an answer"""
+    result = _measure(label, func, args, kwargs)
+    output, result.answer = result.answer, None # Don't hold onto the output
+    _RESULTS.append(result)
+    log.info('%s: %s', label, result.summary())
+    if details := result.details():
+        log.info('%s', details)
+    return output
+
+def _measure(label: str, func: Callable, args: tuple, kwargs: dict) -> PartResult:
+    # NOTE: Repeated runs assume `func` does not mutate its inputs
+    for _ in range(_CONFIG.warmup):
+        func(*args, **kwargs)
+    result = PartResult(label, None)
+    for _ in range(_CONFIG.repeat):
+        start = time.perf_counter()
+        result.answer = func(*args, **kwargs)
+        result.times.append(time.perf_counter() - start)
+    if _CONFIG.memory is not None:
+        result.memory = profiling.profile_memory(func, args, kwargs, _CONFIG.memory)
+    if _CONFIG.profile is not None:
+        path = profiling.profile_path(_CONFIG.profile_dir, solver_name(), label)
+        result.profile = profiling.profile_cpu(
+            _CONFIG.profile, func, args, kwargs, path, _CONFIG.profile_top
+        )
+    return result
+
+################################################################################
+# Reporting
+def results() -> list[PartResult]:
+    return list(_RESULTS)
+
+def solver_name() -> str:
+    """Name of the running solver (e.g. '2024/day06') from its directory"""
+    if _CONFIG.name is not None:
+        return _CONFIG.name
+    return _main_solver_name()
+
+def _main_solver_name() -> str:
+    main_file = getattr(sys.modules.get('__main__'), '__file__', None)
+    if main_file is None:
+        return 'unknown'
+    day_dir = Path(main_file).resolve().parent
+    return f'{day_dir.parent.name}/{day_dir.name}'
+
+def report() -> dict[str, Any]:
+    return {
+        'solver'    : solver_name(),
+        'timestamp' : datetime.datetime.now().isoformat(timespec='seconds'),
+        'python'    : platform.python_version(),
+        'platform'  : platform.platform(),
+        'repeat'    : _CONFIG.repeat,
+        'warmup'    : _CONFIG.warmup,
+        'parts'     : [r.to_dict() for r in _RESULTS],
+    }
+
+def write_report(path: str | Path) -> Path:
+    path = Path(path)
+    if path.is_dir():
+        path = path / f'{solver_name().replace("/", "_")}.json'
+    path.write_text(json.dumps(report(), indent=2) + '\n')
+    log.info('Benchmark report written to %s', path)
+    return path
+
+def _write_report_at_exit() -> None:
+    if _CONFIG.report is not None and len(_RESULTS) > 0:
+        write_report(_CONFIG.report)
@@ -0,0 +1,575 @@
+"""
+Method chaining over iterables
+
+`Chainable` forwards each chained call to a method of the wrapped iterable or
+to the function of the same name in `builtins`, `itertools` or `functools`,
+working out the calling convention by trial. That is convenient but the lookup
+and the exceptions cost more than the work in a tight loop.
+
+`LazyChainable` (from `Chainable.lazy()`) only records the chain. On
+`collect()` the element-wise steps (map, filter, takewhile, ...) and a final
+container (list, set, sum, ...) are fused into a single loop which is compiled
+once per chain shape and reused, so the per-element cost is close to that of a
+hand-written loop. Steps that can't be fused are applied as `Chainable` would.
+
+After `vectorized()`, when the iterable is a NumPy array, `map`, `filter`,
+`filterfalse`, `takewhile`, `dropwhile` and `sum` call their function once with
+the whole array (masks and slices instead of a Python loop) so the chain stays
+an array. The functions must then work on whole arrays, treating axis 0 as the
+elements. Without it arrays are iterated row by row like any other iterable.
+
+Passing a `ChainProfile` records, for each stage, the elements going in and
+out, the time spent in the stage itself and the size of materialized results,
+to find which stage of a pipeline is the bottleneck.
+
+Examples
+========
+>>> (aoc.Chainable(range(10))
+...     .lazy()
+...     .map(lambda x : x*x)
+...     .takewhile(lambda x : x < 50)
+...     .set()
+...     .collect()
+... )
+{0, 1, 4, 9, 16, 25, 36, 49}
+
+>>> (aoc.Chainable(np.arange(10))
+...     .vectorized()
+...     .filter(lambda x : x % 2 == 0)
+...     .map(lambda x : x * x)
+...     .collect()
+... )
+array([ 0,  4, 16, 36, 64])
+
+>>> profile = aoc.ChainProfile()
+>>> aoc.Chainable(range(10), profile=profile).map(str).sorted().collect()
+>>> print(profile.format_table())
+Stage     | Calls | In | Out | Out/In | Self [ms] | Self % | Peak
+----------+-------+----+-----+--------+-----------+--------+-----
+0. source |     1 |    |  10 |        |     0.002 |  11.0% |
+1. map    |     1 | 10 |  10 |  1.000 |     0.006 |  33.3% |
+2. sorted |     1 | 10 |  10 |  1.000 |     0.010 |  55.7% |   10
+"""
+# Standard library
+import builtins
+import functools
+import itertools
+import logging
+import sys
+import time
+from collections.abc import Collection, Iterable, Iterator, Sized
+from dataclasses import dataclass
+from types import GeneratorType
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Globals
+log = logging.getLogger('AoC')
+
+################################################################################
+class Chainable[T](Iterable):
+    def __init__(
+        self,
+        iterable : Iterable[T],
+        method   : Callable | None = None,
+        profile  : 'ChainProfile | None' = None,
+        depth    : int = 0,
+        vectorize: bool = False,
+    ):
+        self.iterable  = iterable
+        self.method    = method
+        self.profile   = profile # Stage statistics are recorded here if given
+        self.depth     = depth # Number of stages before this one
+        self.vectorize = vectorize # Steps over arrays take the whole array
+
+    def __str__(self) -> str:
+        return f'Chainable({self.iterable})'
+
+    def __repr__(self) -> str:
+        return f'Chainable({self.iterable!r})'
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.iterable)
+
+    def collect(self) -> Collection[T]:
+        if not isinstance(self.iterable, Collection):
+            self.iterable = list(self.iterable)
+        return self.iterable
+
+    def lazy(self) -> 'LazyChainable[T]':
+        """Record the rest of the chain and run it fused on `collect()`"""
+        return LazyChainable(self.iterable, profile=self.profile, vectorize=self.vectorize)
+
+    def vectorized(self) -> 'Chainable[T]':
+        """Pass whole arrays to the functions of the following steps"""
+        return Chainable(self.iterable, self.method, self.profile, self.depth, vectorize=True)
+
+    def __getattr__(self, name) -> 'Chainable[T]':
+        if self.vectorize and name in _ARRAY_OPS and _is_array(self.iterable):
+            return Chainable(
+                self.iterable, _ARRAY_OPS[name], self.profile, self.depth, self.vectorize
+            )
+        for obj in (self.iterable, builtins, itertools, functools):
+            try:
+                method = getattr(obj, name)
+                break
+            except AttributeError:
+                continue
+        else:
+            raise AttributeError(name)
+        return Chainable(self.iterable, method, self.profile, self.depth, self.vectorize)
+
+    def __call__(self, *args, **kwargs) -> T | 'Chainable[Any]':
+        if self.profile is not None:
+            return self._call_profiled(args, kwargs)
+        result = self._invoke(self.iterable, args, kwargs)
+        if not isinstance(result, Iterable):
+            return result
+        return Chainable(result, vectorize=self.vectorize)
+
+    def _invoke(self, iterable: Iterable, args: tuple, kwargs: dict) -> Any:
+        if getattr(self.method, '__self__', None) is self.iterable:
+            # e.g. self.iterable.tolist()
+            return self.method(*args, **kwargs)
+        if self.method in _ARRAY_OPS.values():
+            # Called once with a known convention so errors and side effects
+            # aren't repeated by trying the other one
+            if self.method is _array_sum:
+                return self.method(iterable, *args, **kwargs)
+            return self.method(args[0], iterable, *args[1:], **kwargs)
+        try:
+            # e.g. reduce(lambda x,y : x*y, self.iterable, 1)
+            function, args2 = args[0], args[1:]
+            result = self.method(function, iterable, *args2, **kwargs)
+        except (IndexError, TypeError, ValueError) as e1:
+            try:
+                # e.g. sorted(self.iterable, key, reverse=True)
+                result = self.method(iterable, *args, **kwargs)
+            except TypeError as e2:
+                if self.method is None:
+                    raise NotImplementedError('Chainable.__call__')
+                args   = ','.join(map(repr, args))
+                kwargs = ','.join(itertools.starmap(lambda k,v : f'{k }= {v!r}', kwargs.items()))
+                msg    = f'{self}.{self.method.__name__}({args},{kwargs})'
+                raise RuntimeError(msg) from e2
+        return result
+
+    def _call_profiled(self, args: tuple, kwargs: dict) -> T | 'Chainable[Any]':
+        assert self.profile is not None
+        stats = self.profile.stage(self.depth, getattr(self.method, '__name__', '?'))
+        stats.calls += 1
+        iterable = self.iterable
+        if isinstance(iterable, Sized):
+            # Passed as is since e.g. len, reversed and list.count need the
+            # object itself, and pulling from a collection takes no time
+            stats.n_in += len(iterable)
+        else:
+            iterable = stats.count_in(iterable)
+
+        start = time.perf_counter()
+        result = self._invoke(iterable, args, kwargs)
+        stats.time += time.perf_counter() - start
+
+        if not isinstance(result, Iterable):
+            stats.n_out += 1
+            return result
+        if isinstance(result, Collection):
+            stats.n_out += len(result)
+            stats.peak_len = max(stats.peak_len or 0, len(result))
+        else: # Lazy so its work happens as the next stage pulls from it
+            result = stats.count_out(result)
+        return Chainable(
+            result, profile=self.profile, depth=self.depth + 1, vectorize=self.vectorize
+        )
+
+################################################################################
+# Profiling
+@dataclass(slots=True)
+class StageStats:
+    name          : str
+    calls         : int = 0
+    n_in          : int = 0
+    n_out         : int = 0
+    time          : float = 0 # seconds, including pulling from upstream stages
+    upstream_time : float = 0 # seconds spent pulling from upstream stages
+    peak_len      : int | None = None # Largest materialized result
+
+    @property
+    def self_time(self) -> float:
+        return self.time - self.upstream_time
+
+    def count_in[U](self, iterable: Iterable[U]) -> Iterator[U]:
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                x = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.upstream_time += time.perf_counter() - start
+            self.n_in += 1
+            yield x
+
+    def count_out[U](self, iterator: Iterator[U]) -> Iterator[U]:
+        while True:
+            start = time.perf_counter()
+            try:
+                x = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.time += time.perf_counter() - start
+            self.n_out += 1
+            yield x
+
+class ChainProfile:
+    """
+    Per-stage element counts and timings of the chains run with it. Chains
+    sharing a profile (e.g. one built in a loop) are aggregated by position.
+    Timings include the profiling overhead so compare stages, not runs.
+    """
+    def __init__(self):
+        self._stages : dict[tuple[int, str], StageStats] = {}
+
+    def stage(self, depth: int, name: str) -> StageStats:
+        key = (depth, name)
+        if key not in self._stages:
+            self._stages[key] = StageStats(name)
+        return self._stages[key]
+
+    def stages(self) -> list[tuple[int, StageStats]]:
+        """(depth, stats) of each stage, in chain order"""
+        return sorted(
+            ((depth, stats) for (depth, _), stats in self._stages.items()),
+            key = lambda item : item[0],
+        )
+
+    def format_table(self) -> str:
+        stages = self.stages()
+        # Pulling from the source is only seen by the first stages
+        firsts = [stats for depth, stats in stages if depth == 0]
+        source = StageStats(
+            'source',
+            calls = sum(s.calls for s in firsts),
+            n_out = sum(s.n_in for s in firsts),
+            time  = sum(s.upstream_time for s in firsts),
+        )
+        rows  = [(-1, source), *stages]
+        total = sum(stats.self_time for _, stats in rows) or 1
+
+        table = [('Stage', 'Calls', 'In', 'Out', 'Out/In', 'Self [ms]', 'Self %', 'Peak')]
+        for depth, stats in rows:
+            table.append((
+                f'{depth+1}. {stats.name}',
+                str(stats.calls),
+                str(stats.n_in) if depth >= 0 else '',
+                str(stats.n_out),
+                f'{stats.n_out/stats.n_in:.3f}' if stats.n_in else '',
+                f'{stats.self_time*1000:.3f}',
+                f'{stats.self_time/total:.1%}',
+                '' if stats.peak_len is None else str(stats.peak_len),
+            ))
+        widths = [max(len(row[i]) for row in table) for i in range(len(table[0]))]
+        lines = []
+        for i, row in enumerate(table):
+            lines.append(' | '.join(
+                cell.ljust(w) if j == 0 else cell.rjust(w)
+                for j, (cell, w) in enumerate(zip(row, widths))
+            ).rstrip())
+            if i == 0:
+                lines.append('-+-'.join('-' * w for w in widths))
+        return '\n'.join(lines)
+
+################################################################################
+# Lazy chains
+# (name, args, kwargs) of a recorded call
+Step = tuple[str, tuple, dict[str, Any]]
+
+class LazyChainable[T](Iterable):
+    __slots__ = ('iterable', 'steps', 'profile', 'vectorize')
+
+    def __init__(
+        self,
+        iterable : Iterable,
+        steps    : tuple[Step, ...] = (),
+        profile  : ChainProfile | None = None,
+        vectorize: bool = False,
+    ):
+        self.iterable  = iterable
+        self.steps     = steps
+        self.profile   = profile
+        self.vectorize = vectorize
+
+    def __repr__(self) -> str:
+        steps = ''.join(f'.{name}(...)' for name, _, _ in self.steps)
+        return f'LazyChainable({self.iterable!r}){steps}'
+
+    def __getattr__(self, name: str) -> Callable[..., 'LazyChainable']:
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return functools.partial(self._record, name)
+
+    def vectorized(self) -> 'LazyChainable[T]':
+        """Pass whole arrays to the functions of the following steps"""
+        return LazyChainable(self.iterable, self.steps, self.profile, vectorize=True)
+
+    def _record(self, name: str, *args, **kwargs) -> 'LazyChainable':
+        return LazyChainable(
+            self.iterable, self.steps + ((name, args, kwargs),), self.profile, self.vectorize
+        )
+
+    def __iter__(self) -> Iterator:
+        result = self.collect()
+        return iter(result) # type: ignore[call-overload]
+
+    def collect(self) -> Any:
+        """Run the chain, returning its final value (a list if it's lazy)"""
+        if self.profile is not None:
+            return self._collect_profiled()
+        value = self.iterable
+        steps = self.steps
+        # Only the names and argument counts decide how a step runs
+        shape = tuple([(name, len(args), tuple(kw)) for name, args, kw in steps])
+        while steps:
+            for n_steps, fused in _plan(type(value), shape, self.vectorize):
+                if fused is not None:
+                    value = fused(value, steps)
+                else:
+                    value = _apply_step(value, steps[0], self.vectorize)
+                steps = steps[n_steps:]
+                shape = shape[n_steps:]
+                if not isinstance(value, Iterable):
+                    if steps:
+                        raise TypeError(f'Cannot chain {steps[0][0]} after {value!r}')
+                    return value
+        if isinstance(value, Iterable) and not isinstance(value, Collection):
+            value = list(value)
+        return value
+
+    def _collect_profiled(self) -> Any:
+        # Fused stages can't be told apart so run the steps one at a time
+        chain : Any = Chainable(self.iterable, profile=self.profile, vectorize=self.vectorize)
+        for name, args, kwargs in self.steps:
+            if not isinstance(chain, Chainable):
+                raise TypeError(f'Cannot chain {name} after {chain!r}')
+            chain = getattr(chain, name)(*args, **kwargs)
+        return chain.collect() if isinstance(chain, Chainable) else chain
+
+################################################################################
+# Fusion
+# Element-wise steps and the loop body lines they compile to, where `x` is the
+# current element and `{i}` the step's index
+_ELEMENTWISE = {
+    'map'         : ['x = f{i}(x)'],
+    'starmap'     : ['x = f{i}(*x)'],
+    'filter'      : ['if not f{i}(x): continue'],
+    'filterfalse' : ['if f{i}(x): continue'],
+    'takewhile'   : ['if not f{i}(x): break'],
+    'dropwhile'   : ['if d{i}:', '    if f{i}(x): continue', '    d{i} = False'],
+    'enumerate'   : ['x = (c{i}, x)', 'c{i} += 1'],
+}
+# Containers and reductions a fused loop can produce directly:
+# (setup, per-element, result, result type)
+_SINKS = {
+    'list'      : (['out = []', 'push = out.append'], ['push(x)'], 'out', list),
+    'tuple'     : (['out = []', 'push = out.append'], ['push(x)'], 'tuple(out)', tuple),
+    'set'       : (['out = set()', 'push = out.add'], ['push(x)'], 'out', set),
+    'frozenset' : (['out = set()', 'push = out.add'], ['push(x)'], 'frozenset(out)', frozenset),
+    'sum'       : (['out = 0'], ['out += x'], 'out', None),
+    'any'       : ([], ['if x: return True'], 'False', None),
+    'all'       : ([], ['if not x: return False'], 'True', None),
+}
+# Functions whose first argument is a function rather than the iterable
+_FUNCTION_FIRST = {
+    'map', 'starmap', 'filter', 'filterfalse', 'takewhile', 'dropwhile', 'reduce',
+}
+
+# A stage runs the next `n_steps` steps, either fused into one loop taking the
+# remaining steps or as a single unfused step (`fused` is None)
+Stage = tuple[int, Callable | None]
+
+@functools.cache
+def _plan(
+    value_type : type,
+    shape      : tuple[tuple, ...],
+    vectorize  : bool = False,
+) -> tuple[Stage, ...]:
+    """
+    Split a chain into stages. Since unfused steps can return anything, the
+    plan ends after the first one and the rest is planned once its result's
+    type is known.
+    """
+    stages = []
+    i = 0
+    while i < len(shape):
+        n_fused = _n_fusable(value_type, shape[i:], vectorize)
+        if n_fused == 0:
+            stages.append((1, None))
+            break
+        sink = None
+        if i + n_fused < len(shape) and shape[i+n_fused] in _PLAIN_SINKS:
+            sink = shape[i+n_fused][0]
+        names = tuple(name for name, _, _ in shape[i:i+n_fused])
+        n_steps = n_fused + (sink is not None)
+        stages.append((n_steps, _compile(names, sink)))
+        i += n_steps
+        if sink is None:
+            value_type = GeneratorType
+        elif (value_type := _SINKS[sink][3]) is None:
+            break # Not iterable so must be the last step
+    return tuple(stages)
+
+_PLAIN_SINKS = {(name, 0, ()) for name in _SINKS}
+
+def _n_fusable(value_type: type, shape: tuple[tuple, ...], vectorize: bool) -> int:
+    n = 0
+    for name, n_args, kwargs in shape:
+        # Methods of the wrapped value take precedence just as in Chainable
+        if name not in _ELEMENTWISE or hasattr(value_type, name):
+            break
+        if vectorize and name in _ARRAY_OPS and _is_array_type(value_type):
+            break
+        if name == 'enumerate':
+            if n_args > 1 or set(kwargs) - {'start'} or (n_args and kwargs):
+                break
+        elif n_args != 1 or kwargs:
+            break # e.g. map over several iterables
+        n += 1
+    return n
+
+@functools.cache
+def _compile(names: tuple[str, ...], sink: str | None) -> Callable:
+    """Build the fused loop for a sequence of element-wise steps"""
+    setup, body = [], []
+    for i, name in enumerate(names):
+        # Unpack the arguments from the steps here rather than per call
+        if name == 'enumerate':
+            setup.append(f"_, a, kw = steps[{i}]")
+            setup.append(f"c{i} = a[0] if a else kw.get('start', 0)")
+        else:
+            setup.append(f'f{i} = steps[{i}][1][0]')
+        if name == 'dropwhile':
+            setup.append(f'd{i} = True')
+        body += [line.format(i=i) for line in _ELEMENTWISE[name]]
+
+    if sink is None:
+        body.append('yield x')
+        result = None
+    else:
+        sink_setup, sink_body, result, _ = _SINKS[sink]
+        setup += sink_setup
+        body  += sink_body
+
+    lines = ['def fused(src, steps):']
+    lines += [f'    {line}' for line in setup]
+    lines += ['    for x in src:']
+    lines += [f'        {line}' for line in body]
+    if result is not None:
+        lines.append(f'    return {result}')
+    source = '\n'.join(lines)
+    log.debug('Compiled fused chain:\n%s', source)
+
+    namespace : dict[str, Any] = {}
+    exec(compile(source, f'<fused {".".join(names)}>', 'exec'), namespace)
+    return namespace['fused']
+
+def _apply_step(value: Any, step: Step, vectorize: bool = False) -> Any:
+    """Apply a step that can't be fused, resolving it like Chainable"""
+    name, args, kwargs = step
+    if vectorize and name in _ARRAY_OPS and _is_array(value):
+        func = _ARRAY_OPS[name]
+    elif hasattr(value, name):
+        return getattr(value, name)(*args, **kwargs)
+    else:
+        func = _resolve(name)
+    if name in _FUNCTION_FIRST:
+        return func(args[0], value, *args[1:], **kwargs)
+    return func(value, *args, **kwargs)
+
+@functools.cache
+def _resolve(name: str) -> Callable:
+    for module in (builtins, itertools, functools):
+        if hasattr(module, name):
+            return getattr(module, name)
+    raise AttributeError(name)
+
+# Record the common steps through real methods rather than __getattr__
+def _recorder(name: str) -> Callable[..., LazyChainable]:
+    def record(self: LazyChainable, *args, **kwargs) -> LazyChainable:
+        return LazyChainable(
+            self.iterable, self.steps + ((name, args, kwargs),), self.profile, self.vectorize
+        )
+    record.__name__ = record.__qualname__ = name
+    return record
+
+for _name in [*_ELEMENTWISE, *_SINKS]:
+    setattr(LazyChainable, _name, _recorder(_name))
+
+################################################################################
+# NumPy arrays
+# The elements of an array are its rows (as when iterating over it). After
+# `vectorized()` the steps below call their function once with the whole array,
+# so it must treat axis 0 as the elements (e.g. `x[..., 0]` rather than `x[0]`).
+# Whether a function does can't be told from its result, so it is the caller's
+# choice and a result that can't be one per row is an error.
+def _is_array(value: Any) -> bool:
+    return _is_array_type(type(value))
+
+def _is_array_type(value_type: type) -> bool:
+    # An array can't exist unless numpy has been imported
+    np = sys.modules.get('numpy')
+    return np is not None and issubclass(value_type, np.ndarray)
+
+def _vectorized(func: Callable, arr: 'np.ndarray', mask: bool = False) -> 'np.ndarray':
+    """`func(arr)`, checked to give one result (or boolean for a `mask`) per row"""
+    import numpy as np
+    result = func(arr)
+    if not isinstance(result, np.ndarray) or result.shape[:1] != arr.shape[:1]:
+        shape = getattr(result, 'shape', type(result).__name__)
+        raise ValueError(f'{func!r} gave {shape} for an array of shape {arr.shape}')
+    if mask and (result.ndim != 1 or result.dtype != np.bool_):
+        raise ValueError(f'{func!r} gave {result.dtype} {result.shape}, not a boolean mask')
+    return result
+
+def _array_map(func: Callable, arr: 'np.ndarray', *others: Iterable) -> Iterable:
+    if others: # Pairs rows with the other iterables so can't take the whole array
+        return map(func, arr, *others)
+    return _vectorized(func, arr)
+
+def _array_filter(func: Callable, arr: 'np.ndarray') -> Iterable:
+    return arr[_vectorized(func, arr, mask=True)]
+
+def _array_filterfalse(func: Callable, arr: 'np.ndarray') -> Iterable:
+    return arr[~_vectorized(func, arr, mask=True)]
+
+def _array_takewhile(func: Callable, arr: 'np.ndarray') -> Iterable:
+    keep = _vectorized(func, arr, mask=True)
+    # Index of the first False, i.e. the length of the leading run of True
+    stop = len(keep) if keep.all() else int(keep.argmin())
+    return arr[:stop]
+
+def _array_dropwhile(func: Callable, arr: 'np.ndarray') -> Iterable:
+    drop = _vectorized(func, arr, mask=True)
+    start = len(drop) if drop.all() else int(drop.argmin())
+    return arr[start:]
+
+def _array_sum(arr: 'np.ndarray', /, start: Any = 0) -> Any:
+    if not _is_array(arr):
+        raise TypeError(f'Expected an array, got {type(arr).__name__}')
+    # Sum the rows like builtins.sum, not every element like ndarray.sum
+    return start + arr.sum(axis=0)
+
+_ARRAY_OPS : dict[str, Callable] = {
+    'map'         : _array_map,
+    'filter'      : _array_filter,
+    'filterfalse' : _array_filterfalse,
+    'takewhile'   : _array_takewhile,
+    'dropwhile'   : _array_dropwhile,
+    'sum'         : _array_sum,
+}
+# Named after their step so profiles and errors read the same either way
+for _name, _op in _ARRAY_OPS.items():
+    _op.__name__ = _name
@@ -0,0 +1,391 @@
+"""
+Compare the Python, C, C++ and Haskell solutions of each day
+
+Days with native solutions next to the Python one (`main.cpp`, `main.hs` or a
+2023 style `day<N>.c`) have every variant built and run on the same input
+several times. The answers each prints are checked against each other and the
+wall time of each run is compared with Python's, as are the part timings the
+solvers report themselves where they do (`aoc.bench` and the C++ `run.hpp`),
+since wall time includes Python's interpreter startup and imports.
+
+Builds use the repo's own setups: the top level CMakeLists.txt for C++ (into
+`<build-dir>/cmake`), the compiler flags of lib/c/Makefile for C and `ghc` for
+Haskell. A variant that fails to build is reported and skipped.
+
+Examples
+========
+$ aoc-compare                               # every day with a native variant
+$ aoc-compare 2024/day01 2023/day3 -r 20
+$ aoc-compare 2024 --inputs '/data/{year}_{day}.txt' --cxx g++-15
+"""
+# Standard library
+import argparse
+import logging
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# 1st party
+from aoc_utils.runner import DEFAULT_INPUTS
+
+# Globals
+log = logging.getLogger('AoC')
+
+LANGUAGES = ('python', 'c', 'c++', 'haskell')
+
+# "Part 1: 42 [t=1.234ms]" (aoc.bench), "Part 1: 42 [12.3 us]" (run.hpp),
+# "Part 1: 42" (Haskell) or "INFO | Part 1 solution: 42" (2023)
+PART_LINE = re.compile(r'Part (\d+)(?: solution)?: (?!median)(.*?)\s*(?:\[(.*)\])?\s*$')
+PART_TIME = re.compile(r'(?:t=)?([\d.]+)\s*(ms|us)')
+
+################################################################################
+@dataclass(slots=True)
+class Variant:
+    day      : str # e.g. 2024/day01
+    language : str
+    source   : Path
+
+@dataclass(slots=True)
+class VariantResult:
+    variant    : Variant
+    answers    : dict[int, str]   = field(default_factory=dict)
+    part_times : dict[int, float] = field(default_factory=dict) # seconds, self-reported
+    walls      : list[float]      = field(default_factory=list) # seconds
+    error      : str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def wall(self) -> float:
+        return min(self.walls)
+
+    @property
+    def parts_time(self) -> float | None:
+        return sum(self.part_times.values()) if self.part_times else None
+
+################################################################################
+def main() -> None:
+    args = parse_args()
+    logging.basicConfig(
+        level  = args.log_level,
+        format = '%(levelname)8s | %(message)s',
+    )
+    days = discover(args.root, args.filters, args.languages)
+    if len(days) == 0:
+        log.error('No days with native solutions found under %s', args.root)
+        sys.exit(1)
+
+    builder = Builder(args.root, args.build_dir or args.root / 'build', args.cc, args.cxx)
+    results = []
+    for day, variants in days.items():
+        input_path = Path(args.inputs.format(
+            dir  = args.root / day,
+            year = day.split('/')[0],
+            day  = day.split('/')[1],
+        ))
+        if not input_path.is_file():
+            log.info('Skipping %s: no input at %s', day, input_path)
+            continue
+        for variant in variants:
+            log.info('Running %s [%s]', day, variant.language)
+            results.append(run_variant(builder, variant, input_path, args.repeat))
+
+    print(format_table(results))
+    mismatched = find_mismatches(results)
+    for day in mismatched:
+        log.error('%s: answers differ between languages', day)
+    sys.exit(1 if mismatched or not all(r.ok for r in results) else 0)
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description = 'Time each language solving the same input and check they agree',
+    )
+    parser.add_argument(
+        'filters',
+        nargs = '*',
+        help  = 'Only compare days whose name (e.g. 2024/day01) contains one of these',
+    )
+    parser.add_argument(
+        '--root',
+        type    = Path,
+        default = Path(os.environ.get('AOC_PATH', '.')),
+        help    = 'Repository root (default: $AOC_PATH or the current directory)',
+    )
+    parser.add_argument(
+        '--inputs',
+        default = DEFAULT_INPUTS,
+        help    = (
+            'Input path template with {dir}, {year} and {day} '
+            f'(default: {DEFAULT_INPUTS})'
+        ),
+    )
+    parser.add_argument(
+        '-r', '--repeat',
+        type    = int,
+        default = 5,
+        help    = 'Runs of each variant (the fastest is reported)',
+    )
+    parser.add_argument(
+        '--languages',
+        nargs   = '+',
+        choices = LANGUAGES,
+        default = LANGUAGES,
+        help    = 'Languages to compare',
+    )
+    parser.add_argument(
+        '--build-dir',
+        type = Path,
+        help = 'Where native variants are built (default: <root>/build)',
+    )
+    parser.add_argument('--cc',  default=os.environ.get('CC', 'cc'),   help='C compiler')
+    parser.add_argument('--cxx', default=os.environ.get('CXX', 'c++'), help='C++ compiler')
+    parser.add_argument(
+        '-l', '--log-level',
+        default = 'WARNING',
+        help    = 'Logging level',
+    )
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error(f'--repeat must be at least 1: {args.repeat}')
+    return args
+
+################################################################################
+def discover(
+    root      : Path,
+    filters   : Sequence[str] = (),
+    languages : Sequence[str] = LANGUAGES,
+) -> dict[str, list[Variant]]:
+    """Variants of each day under `root` that has a native solution"""
+    # Absolute sources since variants run from inside the build directory
+    root = root.resolve()
+    days = {}
+    for day_dir in sorted(p for p in root.glob('*/day*') if p.is_dir()):
+        day = f'{day_dir.parent.name}/{day_dir.name}'
+        if filters and not any(f in day for f in filters):
+            continue
+        sources = {
+            'python'  : _first(day_dir / 'main.py', day_dir / f'{day_dir.name}.py'),
+            'c'       : _first(day_dir / 'main.c', day_dir / f'{day_dir.name}.c'),
+            'c++'     : _first(day_dir / 'main.cpp'),
+            'haskell' : _first(day_dir / 'main.hs'),
+        }
+        variants = [
+            Variant(day, language, source)
+            for language, source in sources.items()
+            if source is not None and language in languages
+        ]
+        if any(v.language != 'python' for v in variants):
+            days[day] = variants
+    return days
+
+def _first(*paths: Path) -> Path | None:
+    return next((p for p in paths if p.is_file()), None)
+
+################################################################################
+class BuildError(Exception):
+    pass
+
+class Builder:
+    """Builds native variants, returning the command that runs each one"""
+    def __init__(self, root: Path, build_dir: Path, cc: str, cxx: str):
+        self.root       = root.resolve()
+        self.build_dir  = build_dir.resolve()
+        self.cc         = cc
+        self.cxx        = cxx
+        self._configured = False
+
+    def command(self, variant: Variant) -> list[str]:
+        match variant.language:
+            case 'python':
+                return self._python(variant)
+            case 'c':
+                return [str(self._build_c(variant))]
+            case 'c++':
+                return [str(self._build_cpp(variant))]
+            case 'haskell':
+                return [str(self._build_haskell(variant))]
+        raise ValueError(f'Unknown language {variant.language!r}')
+
+    def _python(self, variant: Variant) -> list[str]:
+        command = [sys.executable, str(variant.source)]
+        # Progress bars would be timed too
+        if variant.source.name == 'main.py':
+            command.append('--no-progress')
+        return command
+
+    def _build_c(self, variant: Variant) -> Path:
+        # Flags from lib/c/Makefile, optimized. GNU extensions for getline() on Linux
+        lib = self.root / 'lib' / 'c'
+        exe = self.build_dir / 'c' / variant.day / variant.source.stem
+        self._run([
+            self.cc, '-std=gnu17', '-O2', '-Wall', '-Wextra',
+            f'-I{lib / "include"}', str(variant.source),
+            *map(str, sorted((lib / 'src').glob('*.c'))),
+            '-o', str(exe), '-lm',
+        ], exe.parent)
+        return exe
+
+    def _build_cpp(self, variant: Variant) -> Path:
+        # Targets of the top level CMakeLists.txt are named like 2024_day01
+        cmake_dir = self.build_dir / 'cmake'
+        if not self._configured:
+            self._run([
+                'cmake', '-S', str(self.root), '-B', str(cmake_dir),
+                '-DCMAKE_BUILD_TYPE=Release', f'-DCMAKE_CXX_COMPILER={self.cxx}',
+            ], cmake_dir)
+            self._configured = True
+        self._run([
+            'cmake', '--build', str(cmake_dir), '--config', 'Release',
+            '--target', variant.day.replace('/', '_'),
+        ], cmake_dir)
+        return cmake_dir / variant.day / 'Release' / 'main'
+
+    def _build_haskell(self, variant: Variant) -> Path:
+        out_dir = self.build_dir / 'haskell' / variant.day
+        exe = out_dir / 'main'
+        self._run([
+            'ghc', '-O2', '-outputdir', str(out_dir), str(variant.source), '-o', str(exe),
+        ], out_dir)
+        return exe
+
+    def _run(self, command: list[str], out_dir: Path) -> None:
+        if shutil.which(command[0]) is None:
+            raise BuildError(f'{command[0]} not found')
+        out_dir.mkdir(parents=True, exist_ok=True)
+        log.debug('Building: %s', ' '.join(command))
+        proc = subprocess.run(command, capture_output=True, text=True)
+        if proc.returncode != 0:
+            # Skip past warnings to the first error
+            lines  = (proc.stderr or proc.stdout).strip().splitlines()
+            errors = [l for l in lines if 'error' in l.lower()] or lines
+            raise BuildError(errors[0].strip() if errors else f'exit code {proc.returncode}')
+
+################################################################################
+def run_variant(
+    builder    : Builder,
+    variant    : Variant,
+    input_path : Path,
+    repeat     : int,
+) -> VariantResult:
+    result = VariantResult(variant)
+    try:
+        command = builder.command(variant)
+    except BuildError as e:
+        result.error = f'Build failed: {e}'
+        return result
+    # Some 2023 solvers write files to the working directory
+    run_dir = builder.build_dir / 'run'
+    run_dir.mkdir(parents=True, exist_ok=True)
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [*command, str(input_path.resolve())],
+            capture_output = True,
+            text           = True,
+            errors         = 'replace', # Native variants may print stray bytes
+            cwd            = run_dir,
+        )
+        result.walls.append(time.perf_counter() - start)
+        if proc.returncode != 0:
+            errors = proc.stderr.strip().splitlines()
+            result.error = errors[-1] if errors else f'exit code {proc.returncode}'
+            return result
+    result.answers, result.part_times = parse_output(proc.stdout)
+    if not result.answers:
+        result.error = 'No answers found in output'
+    return result
+
+def parse_output(stdout: str) -> tuple[dict[int, str], dict[int, float]]:
+    """
+    Answers and self-reported timings (seconds) of each part. Output without
+    any "Part N:" lines is taken to be a single answer on the last line.
+    """
+    answers, times = {}, {}
+    for line in stdout.splitlines():
+        if (match := PART_LINE.search(line)) is None:
+            continue
+        part, answer, timing = int(match[1]), match[2], match[3]
+        if '[' in answer: # e.g. a variant's label
+            continue
+        answers.setdefault(part, answer)
+        if timing and part not in times and (t := PART_TIME.search(timing)):
+            times[part] = float(t[1]) / (1000 if t[2] == 'ms' else 1_000_000)
+    if not answers and (lines := stdout.strip().splitlines()):
+        answers[1] = lines[-1].split()[-1]
+    return answers, times
+
+def find_mismatches(results: Iterable[VariantResult]) -> list[str]:
+    """Days where two languages gave different answers to the same part"""
+    by_day : dict[str, dict[int, set[str]]] = {}
+    for result in results:
+        if not result.ok:
+            continue
+        for part, answer in result.answers.items():
+            by_day.setdefault(result.variant.day, {}).setdefault(part, set()).add(answer)
+    return [
+        day for day, parts in by_day.items()
+        if any(len(answers) > 1 for answers in parts.values())
+    ]
+
+################################################################################
+def format_table(results: Sequence[VariantResult], max_answer_len: int = 24) -> str:
+    python = {r.variant.day : r for r in results if r.variant.language == 'python' and r.ok}
+    mismatched = set(find_mismatches(results))
+    rows = [(
+        'Day', 'Language', 'Answers', 'Wall min [ms]', 'Wall median [ms]',
+        'Parts [ms]', 'Wall vs Python', 'Parts vs Python',
+    )]
+    day = None
+    for result in results:
+        name = result.variant.day if result.variant.day != day else ''
+        day = result.variant.day
+        if not result.ok:
+            rows.append((name, result.variant.language, result.error or '', '', '', '', '', ''))
+            continue
+        answers = ', '.join(result.answers[p] for p in sorted(result.answers))
+        if len(answers) > max_answer_len:
+            answers = answers[:max_answer_len-3] + '...'
+        if day in mismatched:
+            answers += ' (MISMATCH)'
+        reference = python.get(day)
+        parts_time = result.parts_time
+        rows.append((
+            name,
+            result.variant.language,
+            answers,
+            f'{result.wall*1000:.3f}',
+            f'{statistics.median(result.walls)*1000:.3f}',
+            '' if parts_time is None else f'{parts_time*1000:.3f}',
+            '' if reference is None else _ratio(reference.wall, result.wall),
+            '' if reference is None else _ratio(reference.parts_time, parts_time),
+        ))
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = []
+    for i, row in enumerate(rows):
+        lines.append(' | '.join(
+            cell.rjust(w) if i > 0 and j >= 3 else cell.ljust(w)
+            for j, (cell, w) in enumerate(zip(row, widths))
+        ).rstrip())
+        if i == 0:
+            lines.append('-+-'.join('-' * w for w in widths))
+    return '\n'.join(lines)
+
+def _ratio(reference: float | None, time: float | None) -> str:
+    """How many times faster than the reference"""
+    if reference is None or not time:
+        return ''
+    return f'{reference / time:.2f}x'
+
+################################################################################
+if __name__ == "__main__":
+    main()
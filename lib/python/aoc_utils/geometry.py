@@ -0,0 +1,121 @@
+"""
+Grid positions and directions as plain ints
+
+A position (i, j) on a grid of a given width is the flat int `i*width + j` and
+a direction is an int indexing precomputed tables, so stepping, turning and
+set/dict lookups in a walker's inner loop work on ints rather than Enum members
+and freshly allocated tuples.
+
+Directions go clockwise from up, the same order as the columns of
+`aoc.Grid.neighbors4`, so turning right is `TURN_RIGHT[d]` (i.e. `(d+1) % 4`).
+
+Stepping by `layout.offsets[d]` doesn't check the edges of the grid, which is
+fine on the many puzzle maps surrounded by walls. Otherwise use `move()` or a
+neighbor table.
+
+Examples
+========
+>>> layout = aoc.geometry.Layout((10, 10))
+>>> pos = layout.encode(3, 4)
+>>> d = aoc.geometry.from_char('>')
+>>> layout.decode(pos + layout.offsets[d])
+(3, 5)
+>>> layout.decode(layout.move(pos, aoc.geometry.TURN_RIGHT[d]))
+(4, 4)
+"""
+# Standard library
+import logging
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Globals
+log = logging.getLogger('AoC')
+
+Location = tuple[int, int]
+
+################################################################################
+# Directions
+UP, RIGHT, DOWN, LEFT = DIRECTIONS = range(4)
+NAMES = ('UP', 'RIGHT', 'DOWN', 'LEFT')
+CHARS = '^>v<'
+
+# (di, dj) of a step in each direction
+STEPS : tuple[Location, ...] = ((-1, 0), (0, 1), (1, 0), (0, -1))
+# Diagonals too, clockwise from up
+STEPS8 : tuple[Location, ...] = (
+    (-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1)
+)
+
+TURN_RIGHT = (RIGHT, DOWN, LEFT, UP)
+TURN_LEFT  = (LEFT, UP, RIGHT, DOWN)
+REVERSE    = (DOWN, LEFT, UP, RIGHT)
+
+def from_char(char: str) -> int:
+    """Direction of an arrow: ^, >, v or <"""
+    d = CHARS.find(char)
+    if d < 0:
+        raise ValueError(f'Not a direction: {char!r}')
+    return d
+
+def is_vertical(d: int) -> bool:
+    return d == UP or d == DOWN
+
+################################################################################
+# Positions
+class Layout:
+    """Encoding between (i, j) and flat positions for a grid of `shape`"""
+    __slots__ = ('height', 'width', 'size', 'offsets', 'offsets8')
+
+    def __init__(self, shape: tuple[int, int]):
+        self.height, self.width = shape
+        self.size = self.height * self.width
+        # Change in flat position of a step in each direction
+        self.offsets  = tuple(di*self.width + dj for di, dj in STEPS)
+        self.offsets8 = tuple(di*self.width + dj for di, dj in STEPS8)
+
+    def __repr__(self) -> str:
+        return f'Layout(({self.height}, {self.width}))'
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.height, self.width
+
+    def encode(self, i: int, j: int) -> int:
+        return i * self.width + j
+
+    def decode(self, pos: int) -> Location:
+        return divmod(pos, self.width)
+
+    def contains(self, i: int, j: int) -> bool:
+        return 0 <= i < self.height and 0 <= j < self.width
+
+    def move(self, pos: int, d: int, n: int = 1) -> int:
+        """Position `n` steps from `pos` in direction `d`, or -1 if off the grid"""
+        i, j = divmod(pos, self.width)
+        di, dj = STEPS[d]
+        i, j = i + n*di, j + n*dj
+        if 0 <= i < self.height and 0 <= j < self.width:
+            return i * self.width + j
+        return -1
+
+    ############################################################################
+    # Vectorized
+    def neighbors(
+        self,
+        positions : 'np.ndarray',
+        steps     : tuple[Location, ...] = STEPS,
+    ) -> 'np.ndarray':
+        """(len(positions), len(steps)) neighboring positions, or -1 if off the grid"""
+        import numpy as np
+        ii, jj = np.divmod(np.asarray(positions, dtype=np.intp), self.width)
+        di, dj = np.array(steps, dtype=np.intp).T
+        ni, nj = ii[:,None] + di, jj[:,None] + dj
+        inside = (0 <= ni) & (ni < self.height) & (0 <= nj) & (nj < self.width)
+        return np.where(inside, ni*self.width + nj, -1)
+
+    def neighbor_table(self, steps: tuple[Location, ...] = STEPS) -> 'np.ndarray':
+        """Neighbors of every position on the grid"""
+        import numpy as np
+        return self.neighbors(np.arange(self.size), steps)
@@ -0,0 +1,163 @@
+"""
+Character maps stored as bytes
+
+Puzzle maps are ASCII so `Grid` keeps one `uint8` per cell, a quarter of a
+`np.array(lines).view('U1')` array, and comparing cells against a symbol is an
+integer comparison. Symbols are converted with `Grid.code()` once, outside any
+loop, rather than comparing against string literals.
+
+Cells can also be addressed by flat index (`i*width + j`). The neighbor tables
+give the flat indices around every cell, with -1 for those off the map, so
+walking the map needs neither tuples nor bounds checks.
+
+Examples
+========
+>>> grid = aoc.Grid.from_text('#.#\\n.^.\\n')
+>>> grid.find_one('^')
+(1, 1)
+>>> grid.neighbors4[grid.index(1, 1)] # Up, right, down, left
+array([ 1,  5, -1,  3])
+>>> grid.flat[[1, 5, 3]] == grid.code('#')
+array([False, False, False])
+"""
+# Standard library
+import logging
+from collections.abc import Iterable
+from functools import cached_property
+from typing import Self
+
+# 3rd party
+import numpy as np
+
+# 1st party
+from aoc_utils import geometry
+from aoc_utils.geometry import Location
+
+# Globals
+log = logging.getLogger('AoC')
+
+################################################################################
+class Grid:
+    def __init__(self, cells: np.ndarray):
+        if cells.ndim != 2 or cells.dtype != np.uint8:
+            raise ValueError(f'Expected a 2D uint8 array: {cells.dtype} {cells.shape}')
+        self.cells = cells
+
+    @classmethod
+    def from_text(cls, text: str) -> Self:
+        return cls.from_lines(text.splitlines())
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> Self:
+        lines = list(lines)
+        widths = set(map(len, lines))
+        if len(widths) > 1:
+            raise ValueError(f'Lines have different widths: {sorted(widths)}')
+        data = ''.join(lines).encode('ascii')
+        cells = np.frombuffer(data, dtype=np.uint8).reshape(len(lines), -1)
+        return cls(cells.copy()) # frombuffer is read-only
+
+    def copy(self) -> 'Grid':
+        return Grid(self.cells.copy())
+
+    def __str__(self) -> str:
+        return '\n'.join(row.tobytes().decode('ascii') for row in self.cells)
+
+    def __repr__(self) -> str:
+        return f'Grid(shape={self.shape})'
+
+    ############################################################################
+    # Cells
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.cells.shape # type: ignore[return-value]
+
+    @property
+    def height(self) -> int:
+        return self.cells.shape[0]
+
+    @property
+    def width(self) -> int:
+        return self.cells.shape[1]
+
+    @property
+    def size(self) -> int:
+        return self.cells.size
+
+    @property
+    def layout(self) -> geometry.Layout:
+        """Encoding of positions as flat indices"""
+        return geometry.Layout(self.shape)
+
+    @property
+    def flat(self) -> np.ndarray:
+        """1D view of the cells, indexed by flat index"""
+        return self.cells.reshape(-1)
+
+    def __getitem__(self, key):
+        return self.cells[key]
+
+    def __setitem__(self, key, value: str | int | np.ndarray) -> None:
+        self.cells[key] = self.code(value) if isinstance(value, str) else value
+
+    def char(self, loc: Location) -> str:
+        return chr(self.cells[loc])
+
+    ############################################################################
+    # Symbols
+    @staticmethod
+    def code(char: str) -> int:
+        """The byte stored for a symbol"""
+        if len(char) != 1 or not char.isascii():
+            raise ValueError(f'Not a single ASCII character: {char!r}')
+        return ord(char)
+
+    @staticmethod
+    def codes(chars: str) -> np.ndarray:
+        """The bytes stored for a string of symbols, e.g. to match a word"""
+        return np.frombuffer(chars.encode('ascii'), dtype=np.uint8)
+
+    def symbols(self) -> list[str]:
+        """Distinct symbols in the grid, sorted"""
+        return [chr(c) for c in np.unique(self.cells)]
+
+    def mask(self, chars: str) -> np.ndarray:
+        """Boolean array of the cells holding any of `chars`"""
+        if len(chars) == 1:
+            return self.cells == self.code(chars)
+        return np.isin(self.cells, self.codes(chars))
+
+    def find(self, chars: str) -> np.ndarray:
+        """(row, col) of each cell holding any of `chars`, in row-major order"""
+        return np.argwhere(self.mask(chars))
+
+    def find_one(self, char: str) -> Location:
+        idxs = np.flatnonzero(self.cells == self.code(char))
+        if len(idxs) != 1:
+            raise ValueError(f'Expected one {char!r} but found {len(idxs)}')
+        return self.coords(int(idxs[0]))
+
+    ############################################################################
+    # Indexing
+    def index(self, i: int, j: int) -> int:
+        """Flat index of (i, j)"""
+        return i * self.width + j
+
+    def coords(self, idx: int) -> Location:
+        """(i, j) of a flat index"""
+        return divmod(idx, self.width)
+
+    def in_bounds(self, locs: np.ndarray | Location) -> np.ndarray | bool:
+        """Whether each (row, col) along the last axis of `locs` is on the map"""
+        locs = np.asarray(locs)
+        return ((0 <= locs) & (locs < self.shape)).all(axis=-1)
+
+    @cached_property
+    def neighbors4(self) -> np.ndarray:
+        """(size, 4) flat indices of the cells up, right, down and left, or -1"""
+        return self.layout.neighbor_table(geometry.STEPS)
+
+    @cached_property
+    def neighbors8(self) -> np.ndarray:
+        """(size, 8) flat indices of the surrounding cells clockwise from up, or -1"""
+        return self.layout.neighbor_table(geometry.STEPS8)
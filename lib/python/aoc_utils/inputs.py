@@ -0,0 +1,239 @@
+"""
+Reading puzzle inputs
+"""
+# Standard library
+import logging
+import mmap
+import sys
+from collections.abc import Iterator, Sequence
+from functools import cached_property
+from typing import IO, TYPE_CHECKING, overload
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Globals
+log = logging.getLogger('AoC')
+
+NEWLINE    = ord('\n')
+CHUNK_SIZE = 2**16
+
+################################################################################
+def read_input(input) -> str:
+    try:
+        with input as f:
+            # Read the entire content
+            return f.read()
+    except KeyboardInterrupt:
+        # Handle Ctrl+C gracefully
+        log.info("\nOperation cancelled by user")
+        sys.exit(1)
+    except BrokenPipeError:
+        # Handle broken pipe (e.g., when piping to head/tail)
+        sys.stderr.close()
+        sys.exit(0)
+
+def iter_lines(
+    input     : IO,
+    max_lines : int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[str]:
+    """Lazily read lines (without newlines) like `str.splitlines()`"""
+    return iter_records(input, '\n', max_lines, chunk_size)
+
+def iter_records(
+    input     : IO,
+    sep       : str = '\n',
+    max_lines : int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[str]:
+    """
+    Lazily split the input on `sep`, reading it in chunks so memory use is
+    bounded by the chunk and record size rather than the size of the input.
+    Reading stops after `max_lines` lines. A trailing newline does not produce
+    an empty final record.
+
+    Examples
+    ========
+    >>> for line in aoc.iter_lines(args.input, args.max_lines): ...
+    >>> for block in aoc.iter_records(args.input, sep='\n\n'): ...
+    """
+    try:
+        with input as f:
+            buffer = ''
+            for chunk in _read_chunks(f, chunk_size, max_lines):
+                buffer += chunk
+                if sep not in buffer:
+                    continue
+                *records, buffer = buffer.split(sep)
+                yield from records
+            if buffer := buffer.removesuffix('\n'):
+                yield buffer
+    except KeyboardInterrupt:
+        log.info("\nOperation cancelled by user")
+        sys.exit(1)
+    except BrokenPipeError:
+        sys.stderr.close()
+        sys.exit(0)
+
+def _read_chunks(f: IO, chunk_size: int, max_lines: int | None) -> Iterator[str]:
+    n_lines = 0
+    while chunk := f.read(chunk_size):
+        if max_lines is not None and n_lines + chunk.count('\n') >= max_lines:
+            # Truncate after the last allowed newline
+            stop = -1
+            for _ in range(max_lines - n_lines):
+                stop = chunk.index('\n', stop+1)
+            yield chunk[:stop+1]
+            return
+        n_lines += chunk.count('\n')
+        yield chunk
+
+def read_input_mmap(input: IO) -> 'MappedInput':
+    """Map the input into memory without decoding or copying it"""
+    return MappedInput(input)
+
+################################################################################
+class MappedInput(Sequence[memoryview]):
+    """
+    Read-only bytes of an input file, indexed by line.
+
+    Regular files are memory mapped so nothing is read until it is used and no
+    intermediate `str` or list of lines is ever created. Inputs that cannot be
+    mapped (e.g. stdin or an empty file) are read into a single `bytes` object
+    behind the same interface.
+
+    Lines exclude the trailing newline. NumPy is only imported by the methods
+    that return arrays.
+
+    Examples
+    ========
+    >>> mapped = aoc.read_input_mmap(args.input)
+    >>> grid   = mapped.grid()     # 2D uint8 view, no copy
+    >>> nums   = mapped.ints()     # every integer in the file
+    >>> bytes(mapped[0])           # first line
+    """
+    def __init__(self, input: IO):
+        self._mmap : mmap.mmap | None = None
+        with input as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                data = self._mmap
+            except (OSError, ValueError):
+                # Pipes can't be mapped and neither can empty files
+                data = f.buffer.read() if hasattr(f, 'buffer') else f.read()
+                if isinstance(data, str):
+                    data = data.encode()
+        self.buffer : memoryview = memoryview(data)
+
+    def __enter__(self) -> 'MappedInput':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the mapping. Arrays or lines still referencing it will
+        raise BufferError."""
+        self.buffer.release()
+        if self._mmap is not None:
+            self._mmap.close()
+
+    @property
+    def nbytes(self) -> int:
+        return self.buffer.nbytes
+
+    ############################################################################
+    # Line indexing
+    @cached_property
+    def line_offsets(self) -> 'np.ndarray':
+        """
+        Byte offset where each line starts followed by where a line after the
+        last would start, so line `i` is `offsets[i]:offsets[i+1]-1`
+        """
+        import numpy as np
+        newlines = np.flatnonzero(self.array() == NEWLINE)
+        stops = newlines + 1
+        if self.nbytes > 0 and (len(newlines) == 0 or newlines[-1] != self.nbytes-1):
+            # Final line without a trailing newline
+            stops = np.append(stops, self.nbytes + 1)
+        return np.concatenate(([0], stops))
+
+    def __len__(self) -> int:
+        return len(self.line_offsets) - 1
+
+    @overload
+    def __getitem__(self, idx: int) -> memoryview: ...
+    @overload
+    def __getitem__(self, idx: slice) -> Sequence[memoryview]: ...
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(idx)
+        start, stop = self.line_offsets[idx:idx+2].tolist()
+        return self.buffer[start:stop-1]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        offsets = self.line_offsets.tolist()
+        for start, stop in zip(offsets[:-1], offsets[1:]):
+            yield self.buffer[start:stop-1]
+
+    ############################################################################
+    # Array views
+    def array(self) -> 'np.ndarray':
+        """Flat uint8 view of the entire input"""
+        import numpy as np
+        return np.frombuffer(self.buffer, dtype=np.uint8)
+
+    def grid(self) -> 'np.ndarray':
+        """
+        2D uint8 view of a character map without copying it. Each row strides
+        over its newline so all lines must have the same width.
+        """
+        import numpy as np
+        widths = np.diff(self.line_offsets) - 1
+        if len(widths) == 0:
+            return np.empty((0,0), dtype=np.uint8)
+        if not (widths == widths[0]).all():
+            raise ValueError(f'Lines have different widths: {np.unique(widths)}')
+        width = int(widths[0])
+        return np.lib.stride_tricks.as_strided(
+            self.array(),
+            shape     = (len(widths), width),
+            strides   = (width+1, 1),
+            writeable = False,
+        )
+
+    def ints(self, signed: bool = True) -> 'np.ndarray':
+        """
+        Every integer in the input, in order, parsed directly from the bytes.
+        With `signed`, a '-' immediately before a number negates it.
+        """
+        import numpy as np
+        arr      = self.array()
+        digits   = arr - ord('0') # uint8 so non-digits wrap above 9
+        is_digit = (digits < 10).view(np.int8)
+        edges    = np.diff(is_digit, prepend=0, append=0)
+        starts   = np.flatnonzero(edges == 1)
+        stops    = np.flatnonzero(edges == -1)
+        if len(starts) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        # Place value of each digit within its number
+        idxs      = np.flatnonzero(is_digit)
+        n_digits  = stops - starts
+        exponents = np.repeat(stops, n_digits) - 1 - idxs
+        values    = digits[idxs].astype(np.int64) * (10 ** exponents)
+        nums      = np.add.reduceat(values, np.cumsum(n_digits) - n_digits)
+        if signed:
+            has_sign = starts > 0
+            has_sign[has_sign] = arr[starts[has_sign]-1] == ord('-')
+            nums[has_sign] *= -1
+        return nums
+
+    def decode(self) -> str:
+        """The whole input as a `str` (copies it)"""
+        return str(self.buffer, 'utf-8')
@@ -0,0 +1,62 @@
+"""
+Importing heavy modules on first use
+
+`lazy_import(name)` returns a stand-in for a module that only imports it when
+one of its attributes is first used. Solvers are often faster to run than
+`networkx`, `matplotlib` or `scipy` are to import, so visualisation and other
+code off the main path shouldn't make every run pay for its imports.
+
+Whether the module is installed is still checked up front (for a submodule,
+only its top-level package is checked, since finding a submodule imports its
+parent), unless it is `optional`: then a missing module only raises
+`ModuleNotFoundError` where it is first used. A module imported by a part is
+imported inside that part's first timed run, so use `--warmup` when timing
+such parts.
+
+Examples
+========
+>>> nx  = aoc.lazy_import('networkx', optional=True)
+>>> plt = aoc.lazy_import('matplotlib.pyplot', optional=True)
+>>> def visualize(graph) -> None:
+...     fig, ax = plt.subplots() # matplotlib.pyplot is imported here
+"""
+# Standard library
+import importlib
+import importlib.util
+import logging
+import sys
+from types import ModuleType
+from typing import Any
+
+# Globals
+log = logging.getLogger('AoC')
+
+################################################################################
+def lazy_import(name: str, optional: bool = False) -> ModuleType:
+    """The module `name`, imported the first time one of its attributes is used"""
+    if name in sys.modules:
+        return sys.modules[name]
+    package = name.partition('.')[0]
+    if not optional and importlib.util.find_spec(package) is None:
+        raise ModuleNotFoundError(f'No module named {package!r}', name=package)
+    return LazyModule(name)
+
+class LazyModule(ModuleType):
+    """
+    Once loaded, the stand-in holds a copy of the module's attributes so later
+    lookups are as fast as on the module itself. It isn't put in `sys.modules`
+    so importing the module normally elsewhere is unaffected.
+    """
+    def __getattr__(self, attr: str) -> Any:
+        # Only called for attributes not copied from the module yet
+        module = self.__dict__.get('_lazy_module')
+        if module is None:
+            log.debug('Importing %s', self.__name__)
+            module = importlib.import_module(self.__name__)
+            self.__dict__.update(module.__dict__)
+            self.__dict__['_lazy_module'] = module
+        return getattr(module, attr)
+
+    def __repr__(self) -> str:
+        loaded = '_lazy_module' in self.__dict__
+        return f'<lazy module {self.__name__!r}{"" if loaded else " (not loaded)"}>'
@@ -0,0 +1,534 @@
+"""
+Instrumented and persistent memoization
+
+`cache` is a drop-in replacement for `functools.lru_cache` that also counts
+evictions and estimates how much memory each cache holds, so cache sizes can be
+chosen from data. A summary of every cache is logged at INFO level on exit.
+
+`disk_cache` is a drop-in replacement for `functools.lru_cache` whose results
+are also stored in a SQLite database so re-running a solver while tuning it
+reuses the work done by earlier runs. Storing is opt-in (`--disk-cache` or
+`configure()`); otherwise the decorator behaves exactly like `lru_cache`.
+
+Cached entries are keyed by the function's file and qualified name, its
+arguments and an optional `context`, and are invalidated whenever the source
+file defining the function changes. Each function keeps at most `max_entries`
+entries on disk, evicting the least recently used.
+
+Functions that are closures over data that isn't in their arguments (e.g. the
+puzzle input) must pass that data as `context` or results for one input will
+be returned for another.
+
+`parse_cache` stores what a parse function returns in a `.aoc-parsed`
+directory next to the input file, keyed by a hash of its arguments (normally
+the input text) and of its source file, so repeated runs load the parsed data
+instead of parsing again. Storing is opt-in (`--parse-cache`). Loading time is
+what the enclosing step reports and the time the original parse took is logged
+beside it.
+
+Examples
+========
+>>> @aoc.cache(maxsize=2**16)
+... def find_min_presses(seq: str, n: int) -> int: ...
+>>> find_min_presses.cache_stats()
+CacheStats(name='find_min_presses', hits=1510, misses=460, evictions=0, ...)
+
+>>> @aoc.disk_cache(maxsize=None)
+... def count(val: int, n_blinks: int) -> int: ...
+
+>>> @aoc.disk_cache(maxsize=2**16, context=text)
+... def count_arrangements(design: str) -> int: ...
+
+$ ./main.py input.txt --disk-cache             # default database
+$ ./main.py input.txt --disk-cache memo.sqlite
+
+>>> @aoc.parse_cache
+... def parse_circuit(text: str) -> Circuit: ...
+
+$ ./main.py input.txt --parse-cache -l INFO
+parse_circuit: loaded parsed input [t=0.412ms, parsing took 3.127ms]
+"""
+# Standard library
+import atexit
+import contextlib
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import sys
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any, NamedTuple
+
+# 1st party
+from aoc_utils.lazy import lazy_import
+from aoc_utils.profiling import format_bytes
+
+# Only needed once results are stored (--disk-cache or --parse-cache)
+pickle  = lazy_import('pickle')
+sqlite3 = lazy_import('sqlite3')
+
+# Globals
+log = logging.getLogger('AoC')
+
+DEFAULT_PATH = Path(
+    os.environ.get('AOC_CACHE_DIR', Path.home() / '.cache' / 'aoc')
+) / 'memo.sqlite'
+
+_PATH       : Path | None = None
+_PARSED_DIR : Path | None = None
+_CACHES : list['DiskCache'] = []
+_STATS  : list['InstrumentedCache'] = []
+
+# Entry sizes are measured for the first misses and then only every Nth one
+SIZE_SAMPLE_ALL   = 1024
+SIZE_SAMPLE_EVERY = 64
+# Parsed inputs stored per function before the oldest are deleted
+PARSED_DIR_NAME     = '.aoc-parsed'
+PARSED_MAX_ENTRIES  = 8
+# Bytes lru_cache uses per entry beyond the key and result (a 4 element list
+# for the linked list plus a dict slot)
+LRU_ENTRY_OVERHEAD = sys.getsizeof([None]*4) + 3*8
+
+################################################################################
+def configure(path: str | Path | None) -> None:
+    """Store results at `path` (or stop storing them if None)"""
+    global _PATH
+    flush()
+    _PATH = Path(path) if path is not None else None
+    for cache in _CACHES:
+        cache.reset()
+
+def flush() -> None:
+    """Write results computed since the last flush to disk"""
+    for cache in _CACHES:
+        cache.flush()
+
+def clear(path: str | Path | None = None) -> None:
+    """Delete every stored result"""
+    path = path or _PATH or DEFAULT_PATH
+    if Path(path).exists():
+        with _connect(Path(path)) as db:
+            db.execute('DELETE FROM memo')
+            db.execute('DELETE FROM versions')
+    for cache in _CACHES:
+        cache.reset()
+
+atexit.register(flush)
+
+def cache[F: Callable](maxsize: int | None = 128, typed: bool = False) -> Callable[[F], F]:
+    """Like `functools.lru_cache` with `cache_stats()` and an exit summary"""
+    def decorator(func: F) -> F:
+        return InstrumentedCache(func, maxsize, typed).wrapper # type: ignore
+    return decorator
+
+def disk_cache[F: Callable](
+    maxsize     : int | None = 128,
+    *,
+    context     : Any = None,
+    max_entries : int = 2**20,
+) -> Callable[[F], F]:
+    """
+    Like `functools.lru_cache(maxsize)`, additionally persisting results to
+    disk when enabled. Arguments, `context` and results must be picklable.
+    """
+    def decorator(func: F) -> F:
+        return DiskCache(func, maxsize, context, max_entries).wrapper # type: ignore
+    return decorator
+
+################################################################################
+class CacheStats(NamedTuple):
+    name      : str
+    hits      : int
+    misses    : int
+    evictions : int
+    currsize  : int
+    maxsize   : int | None
+    nbytes    : int # approximate
+
+    @property
+    def hit_rate(self) -> float:
+        calls = self.hits + self.misses
+        return self.hits / calls if calls > 0 else 0
+
+class InstrumentedCache:
+    """
+    Counts come from the underlying `functools.lru_cache`, which only calls
+    `_miss` when a result isn't cached. Memory is estimated from the sizes of
+    a sample of the keys and results added on a miss.
+    """
+    def __init__(
+        self,
+        func    : Callable,
+        maxsize : int | None,
+        typed   : bool = False,
+        compute : Callable | None = None, # Called on a miss instead of func
+    ):
+        self.func          = compute or func
+        self.name          = func.__qualname__
+        self.maxsize       = maxsize
+        # lru_cache resets its counts when cleared so keep running totals
+        self._prev_hits    = 0
+        self._prev_misses  = 0
+        self._cleared      = 0 # entries dropped by cache_clear()
+        self._n_sampled    = 0
+        self._sampled_size = 0
+        self.wrapper       = functools.lru_cache(maxsize, typed)(self._miss)
+        self._lru_clear    = self.wrapper.cache_clear
+        functools.update_wrapper(self.wrapper, func)
+        self.wrapper.cache_clear = self.cache_clear # type: ignore[attr-defined]
+        self.wrapper.cache_stats = self.stats       # type: ignore[attr-defined]
+        _STATS.append(self)
+
+    def _miss(self, *args, **kwargs) -> Any:
+        result = self.func(*args, **kwargs)
+        n = self._prev_misses + self.wrapper.cache_info().misses
+        if n <= SIZE_SAMPLE_ALL or n % SIZE_SAMPLE_EVERY == 0:
+            self._n_sampled += 1
+            self._sampled_size += _sizeof(args) + _sizeof(result)
+            if kwargs:
+                self._sampled_size += _sizeof(kwargs)
+        return result
+
+    def cache_clear(self) -> None:
+        info = self.wrapper.cache_info()
+        self._prev_hits   += info.hits
+        self._prev_misses += info.misses
+        self._cleared     += info.currsize
+        self._lru_clear()
+
+    def stats(self) -> CacheStats:
+        info = self.wrapper.cache_info()
+        misses = self._prev_misses + info.misses
+        entry_size = self._sampled_size / self._n_sampled if self._n_sampled else 0
+        return CacheStats(
+            name      = self.name,
+            hits      = self._prev_hits + info.hits,
+            misses    = misses,
+            evictions = misses - info.currsize - self._cleared,
+            currsize  = info.currsize,
+            maxsize   = info.maxsize,
+            nbytes    = round(info.currsize * (entry_size + LRU_ENTRY_OVERHEAD)),
+        )
+
+def cache_stats() -> list[CacheStats]:
+    """Stats of every instrumented cache that has been called"""
+    stats = (c.stats() for c in _STATS)
+    return [s for s in stats if s.hits + s.misses > 0]
+
+def format_cache_stats(stats: list[CacheStats]) -> str:
+    rows = [('Cache', 'Hits', 'Misses', 'Hit rate', 'Evictions', 'Size', 'Max', '~Memory')]
+    for s in stats:
+        rows.append((
+            s.name, f'{s.hits:,}', f'{s.misses:,}', f'{s.hit_rate:.1%}',
+            f'{s.evictions:,}', f'{s.currsize:,}',
+            'inf' if s.maxsize is None else f'{s.maxsize:,}',
+            format_bytes(s.nbytes),
+        ))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return '\n'.join(
+        ' | '.join(
+            cell.ljust(w) if j == 0 else cell.rjust(w)
+            for j, (cell, w) in enumerate(zip(row, widths))
+        )
+        for row in rows
+    )
+
+def _log_cache_stats() -> None:
+    if log.isEnabledFor(logging.INFO) and (stats := cache_stats()):
+        log.info('Cache summary:\n%s', format_cache_stats(stats))
+
+atexit.register(_log_cache_stats)
+
+################################################################################
+class DiskCacheInfo(NamedTuple):
+    loaded  : int # entries read from disk
+    hits    : int # calls answered from disk entries
+    stored  : int # new entries to write to disk
+
+class DiskCache:
+    """
+    The in-memory layer is an `InstrumentedCache` around `_compute`, which is
+    only called on a memory miss. It checks the entries loaded from disk
+    before calling the function and buffers new results until `flush()`.
+    """
+    def __init__(
+        self,
+        func        : Callable,
+        maxsize     : int | None,
+        context     : Any,
+        max_entries : int,
+    ):
+        self.func        = func
+        self.max_entries = max_entries
+        self.name        = _function_name(func)
+        self._context    = context
+        self.wrapper     = InstrumentedCache(func, maxsize, compute=self._compute).wrapper
+        self.wrapper.disk_info  = self.info         # type: ignore[attr-defined]
+        self.wrapper.disk_cache = self              # type: ignore[attr-defined]
+        self.reset()
+        _CACHES.append(self)
+
+    def reset(self) -> None:
+        self._loaded : dict[tuple, Any] | None = None
+        self._used   : set[tuple]              = set()
+        self._new    : dict[tuple, Any]        = {}
+        self._hits   = 0
+        self.wrapper.cache_clear()
+
+    # Only needed when stored, so not worked out when the function is decorated
+    @functools.cached_property
+    def context(self) -> str:
+        return _digest(pickle.dumps(self._context))
+
+    @functools.cached_property
+    def version(self) -> str:
+        return _source_version(self.func)
+
+    def info(self) -> DiskCacheInfo:
+        return DiskCacheInfo(len(self._loaded or ()), self._hits, len(self._new))
+
+    def _compute(self, *args, **kwargs) -> Any:
+        if _PATH is None:
+            return self.func(*args, **kwargs)
+        if self._loaded is None:
+            self._loaded = self._load()
+        key = (args, tuple(sorted(kwargs.items())))
+        if key in self._loaded:
+            self._hits += 1
+            self._used.add(key)
+            return self._loaded[key]
+        result = self.func(*args, **kwargs)
+        self._new[key] = result
+        return result
+
+    ############################################################################
+    # Storage
+    def _load(self) -> dict[tuple, Any]:
+        assert _PATH is not None
+        if not _PATH.exists():
+            return {}
+        start = time.perf_counter()
+        with _connect(_PATH) as db:
+            row = db.execute(
+                'SELECT version FROM versions WHERE func = ?', (self.name,)
+            ).fetchone()
+            if row is not None and row[0] != self.version:
+                log.info('Source of %s changed. Discarding cached results', self.name)
+                db.execute('DELETE FROM memo WHERE func = ?', (self.name,))
+                db.execute('DELETE FROM versions WHERE func = ?', (self.name,))
+                return {}
+            rows = db.execute(
+                'SELECT key, value FROM memo WHERE func = ? AND context = ?',
+                (self.name, self.context),
+            ).fetchall()
+        loaded = {pickle.loads(k) : pickle.loads(v) for k, v in rows}
+        log.info('Loaded %d cached results for %s [t=%.3fms]',
+            len(loaded), self.name, (time.perf_counter() - start) * 1000
+        )
+        return loaded
+
+    def flush(self) -> None:
+        if _PATH is None or (len(self._new) == 0 and len(self._used) == 0):
+            return
+        now = time.time()
+        try:
+            new = [
+                (self.name, self.context, pickle.dumps(k), pickle.dumps(v), now)
+                for k, v in self._new.items()
+            ]
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            log.warning('Not caching %s to disk: %s', self.name, e)
+            new = []
+        used = [(now, self.name, self.context, pickle.dumps(k)) for k in self._used]
+
+        _PATH.parent.mkdir(parents=True, exist_ok=True)
+        with _connect(_PATH) as db:
+            db.execute(
+                'INSERT OR REPLACE INTO versions VALUES (?, ?)',
+                (self.name, self.version),
+            )
+            db.executemany('INSERT OR REPLACE INTO memo VALUES (?, ?, ?, ?, ?)', new)
+            db.executemany(
+                'UPDATE memo SET used = ? WHERE func = ? AND context = ? AND key = ?',
+                used,
+            )
+            # Least recently used eviction
+            db.execute('''
+                DELETE FROM memo WHERE func = :func AND rowid NOT IN (
+                    SELECT rowid FROM memo WHERE func = :func
+                    ORDER BY used DESC LIMIT :limit
+                )''',
+                {'func' : self.name, 'limit' : self.max_entries},
+            )
+        if len(new) > 0:
+            log.info('Stored %d new results for %s', len(new), self.name)
+        if self._loaded is not None:
+            self._loaded.update(self._new)
+        self._new.clear()
+        self._used.clear()
+
+@contextlib.contextmanager
+def _connect(path: Path) -> Iterator['sqlite3.Connection']:
+    """Open the database, committing on success and always closing it"""
+    # Several solvers may share the database when run in parallel
+    db = sqlite3.connect(path, timeout=60)
+    db.execute('PRAGMA journal_mode=WAL')
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS memo (
+            func    TEXT,
+            context TEXT,
+            key     BLOB,
+            value   BLOB,
+            used    REAL,
+            PRIMARY KEY (func, context, key)
+        )''')
+    db.execute('CREATE TABLE IF NOT EXISTS versions (func TEXT PRIMARY KEY, version TEXT)')
+    try:
+        with db:
+            yield db
+    finally:
+        db.close()
+
+################################################################################
+# Parsed inputs
+def configure_parse_cache(input_path: str | Path | None) -> None:
+    """Store parsed inputs next to the file at `input_path` (or stop if None)"""
+    global _PARSED_DIR
+    if input_path is not None and not Path(input_path).is_file():
+        log.warning('Not caching parsed input: %s is not a file', input_path)
+        input_path = None
+    _PARSED_DIR = (
+        Path(input_path).resolve().parent / PARSED_DIR_NAME
+        if input_path is not None else None
+    )
+
+def parse_cache[F: Callable](func: F) -> F:
+    """
+    Store the result of a parse function next to the input file when enabled.
+    Arguments and result must be picklable.
+    """
+    return ParseCache(func).wrapper # type: ignore
+
+class ParseCacheInfo(NamedTuple):
+    hits       : int
+    misses     : int
+    parse_time : float | None # seconds, of the parse that created the entry
+    load_time  : float | None # seconds, of the last load
+
+class ParseCache:
+    """
+    Each entry is a pickle of `(parse_time, result)` in a file named after the
+    function, the file defining it and the hash of its arguments. Files are written atomically so
+    solvers run in parallel can share the directory.
+    """
+    def __init__(self, func: Callable):
+        self.func       = func
+        self.name       = func.__qualname__
+        self.version    = _source_version(func)
+        # Solvers sharing an input directory may all name their parser `parse`
+        self.prefix     = f'{self.name}-{_digest(_function_name(func).encode())[:8]}'
+        self.hits       = 0
+        self.misses     = 0
+        self.parse_time : float | None = None
+        self.load_time  : float | None = None
+        self.wrapper    = functools.update_wrapper(
+            lambda *args, **kwargs : self._call(*args, **kwargs), func
+        )
+        self.wrapper.parse_info = self.info # type: ignore[attr-defined]
+
+    def info(self) -> ParseCacheInfo:
+        return ParseCacheInfo(self.hits, self.misses, self.parse_time, self.load_time)
+
+    def _call(self, *args, **kwargs) -> Any:
+        if _PARSED_DIR is None:
+            return self.func(*args, **kwargs)
+        try:
+            key = _digest(pickle.dumps((self.version, args, sorted(kwargs.items()))))
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            log.warning('Not caching parsed input of %s: %s', self.name, e)
+            return self.func(*args, **kwargs)
+        path = _PARSED_DIR / f'{self.prefix}.{key}.pickle'
+
+        start = time.perf_counter()
+        try:
+            with path.open('rb') as f:
+                self.parse_time, result = pickle.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e: # Anything can be raised unpickling
+            log.warning('Ignoring unreadable parsed input %s: %s', path, e)
+        else:
+            self.hits += 1
+            self.load_time = time.perf_counter() - start
+            log.info('%s: loaded parsed input [t=%.3fms, parsing took %.3fms]',
+                self.name, self.load_time * 1000, self.parse_time * 1000
+            )
+            return result
+
+        self.misses += 1
+        start = time.perf_counter()
+        result = self.func(*args, **kwargs)
+        self.parse_time = time.perf_counter() - start
+        log.info('%s: parsed input [t=%.3fms]', self.name, self.parse_time * 1000)
+        self._store(path, result)
+        return result
+
+    def _store(self, path: Path, result: Any) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            with tmp_path.open('wb') as f:
+                pickle.dump((self.parse_time, result), f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except (pickle.PicklingError, TypeError, AttributeError, RecursionError) as e:
+            log.warning('Not caching parsed input of %s: %s', self.name, e)
+            tmp_path.unlink(missing_ok=True)
+            return
+        # Drop entries for old inputs and old versions of the parser
+        entries = sorted(
+            path.parent.glob(f'{self.prefix}.*.pickle'),
+            key = _mtime,
+        )
+        for old in entries[:-PARSED_MAX_ENTRIES]:
+            old.unlink(missing_ok=True)
+
+################################################################################
+def _mtime(path: Path) -> float:
+    """Modification time, or 0 if another process has just deleted the file"""
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return 0
+
+def _function_name(func: Callable) -> str:
+    try:
+        file = str(Path(inspect.getfile(func)).resolve())
+    except TypeError:
+        file = func.__module__
+    return f'{file}:{func.__qualname__}'
+
+def _source_version(func: Callable) -> str:
+    """Hash of the whole file defining `func` since it may call other functions in it"""
+    try:
+        return _digest(Path(inspect.getfile(func)).read_bytes())
+    except (TypeError, OSError):
+        return _digest(func.__code__.co_code)
+
+def _sizeof(obj: Any, depth: int = 3) -> int:
+    """Approximate size of an object and the containers it holds"""
+    size = sys.getsizeof(obj)
+    if depth == 0:
+        return size
+    if isinstance(obj, dict):
+        items = [*obj.keys(), *obj.values()]
+    elif isinstance(obj, (tuple, list, set, frozenset)):
+        items = obj
+    else:
+        return size
+    return size + sum(_sizeof(x, depth-1) for x in items)
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:16]
@@ -0,0 +1,338 @@
+"""
+Profiling solver parts
+
+With `--profile-memory`, every part or step timed by `aoc.bench` is run once
+more with `tracemalloc` tracing its allocations. The extra run comes after the
+timed runs so tracing doesn't inflate the timings (and, like `--repeat`,
+assumes the part doesn't mutate its inputs).
+
+The peak is the most memory the part held at once on top of what was allocated
+before it started. The allocation sites are those holding the most memory in
+a snapshot taken near that peak: a background thread polls the traced memory
+and snapshots it whenever it grows past the last snapshot, so temporaries freed
+before the part returns (e.g. a large `Counter`) are still attributed.
+
+With `--profile cprofile` or `--profile sample`, each part is also run once
+more under a CPU profiler. The functions taking the most cumulative time are
+printed below the part and the full profile is written to a file per solver and
+part: `cProfile` stats (`.prof`, for `pstats` or snakeviz) or the call stacks
+seen by a sampling profiler in collapsed-stack format (`.collapsed`, for
+flamegraph.pl or speedscope). The sampler costs little per call so it suits
+solvers making millions of small calls, which cProfile slows down and skews.
+
+Examples
+========
+$ ./main.py input.txt --profile-memory
+Part 2: 1234 [t=812.345ms] [peak=96.1MiB]
+    71.3MiB in 1,204,113 blocks at 2024/day22/main.py:61
+    18.0MiB in 2,000 blocks at 2024/day22/main.py:44
+    ...
+
+$ ./main.py input.txt --profile sample --profile-top 3
+Regions: [t=40.123ms]
+Part 1: 1930 [t=0.512ms]
+     cumtime    selftime    calls  function
+     0.498ms     0.120ms        -  2024/day12/main.py:96(Region.perimeter)
+    ...
+Profile written to profiles/2024_day12_part_1.collapsed
+"""
+# Standard library
+import logging
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import FrameType
+from typing import Any, NamedTuple
+
+# 1st party
+from aoc_utils.lazy import lazy_import
+
+# Only needed with --profile cprofile
+cProfile = lazy_import('cProfile')
+pstats   = lazy_import('pstats')
+# Only needed with --profile-memory
+tracemalloc = lazy_import('tracemalloc')
+
+# Globals
+log = logging.getLogger('AoC')
+
+# Seconds between checks of the traced memory
+POLL_INTERVAL = 0.005
+# Snapshot again once traced memory grows by this factor since the last one
+SNAPSHOT_GROWTH = 1.2
+# Seconds between samples of the call stack
+SAMPLE_INTERVAL = 0.001
+
+CPU_PROFILERS = ('cprofile', 'sample')
+
+################################################################################
+def format_bytes(n: float) -> str:
+    """A size in the largest binary unit it fills, e.g. 2.1MiB"""
+    for unit in ('B', 'KiB', 'MiB'):
+        if n < 1024:
+            return f'{n:.0f}{unit}' if unit == 'B' else f'{n:.1f}{unit}'
+        n /= 1024
+    return f'{n:.1f}GiB'
+
+################################################################################
+# Memory
+class AllocationSite(NamedTuple):
+    location : str # file:line
+    size     : int # bytes
+    count    : int # blocks
+
+    def __str__(self) -> str:
+        return f'{format_bytes(self.size)} in {self.count:,} blocks at {self.location}'
+
+@dataclass(slots=True)
+class MemoryProfile:
+    peak  : int # bytes
+    sites : list[AllocationSite] = field(default_factory=list)
+
+    def summary(self) -> str:
+        return f'[peak={format_bytes(self.peak)}]'
+
+    def format_sites(self, indent: str = '    ') -> str:
+        return '\n'.join(f'{indent}{site}' for site in self.sites)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'peak_bytes' : self.peak,
+            'sites'      : [site._asdict() for site in self.sites],
+        }
+
+def profile_memory(
+    func   : Callable,
+    args   : tuple,
+    kwargs : dict,
+    top_n  : int = 5,
+) -> MemoryProfile:
+    """Run `func` tracing allocations, returning its peak and top `top_n` sites"""
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    watcher = _PeakWatcher()
+    watcher.start()
+    # Only count what the part allocates
+    tracemalloc.clear_traces()
+    tracemalloc.reset_peak()
+    try:
+        func(*args, **kwargs)
+    finally:
+        watcher.stop()
+        end_snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        if not was_tracing:
+            tracemalloc.stop()
+
+    snapshot = max(
+        filter(None, (watcher.snapshot, end_snapshot)),
+        key = lambda s : sum(t.size for t in s.traces),
+    )
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, threading.__file__),
+        tracemalloc.Filter(False, __file__),
+    ])
+    sites = [
+        AllocationSite(_location(stat.traceback[0]), stat.size, stat.count)
+        for stat in snapshot.statistics('lineno')[:top_n]
+    ]
+    return MemoryProfile(peak, sites)
+
+class _PeakWatcher(threading.Thread):
+    """Snapshots the traced allocations each time they reach a new high"""
+    def __init__(self):
+        super().__init__(name='aoc-memory-watcher', daemon=True)
+        self.snapshot : 'tracemalloc.Snapshot | None' = None
+        self._size    = 0
+        self._done    = threading.Event()
+
+    def run(self) -> None:
+        while not self._done.wait(POLL_INTERVAL):
+            current, _ = tracemalloc.get_traced_memory()
+            if current > self._size * SNAPSHOT_GROWTH:
+                self.snapshot = tracemalloc.take_snapshot()
+                self._size = current
+
+    def stop(self) -> None:
+        self._done.set()
+        self.join()
+
+################################################################################
+# CPU
+class FunctionStat(NamedTuple):
+    function  : str
+    calls     : int | None # None when sampled
+    self_time : float      # seconds
+    cum_time  : float      # seconds
+
+@dataclass(slots=True)
+class CpuProfile:
+    path : Path
+    top  : list[FunctionStat] = field(default_factory=list)
+
+    def format_top(self) -> str:
+        if not self.top:
+            return '    No samples (the part ran for less than the sampling interval)'
+        rows = [('cumtime', 'selftime', 'calls', 'function')]
+        for stat in self.top:
+            rows.append((
+                f'{stat.cum_time*1000:.3f}ms',
+                f'{stat.self_time*1000:.3f}ms',
+                '-' if stat.calls is None else f'{stat.calls:,}',
+                stat.function,
+            ))
+        widths = [max(len(row[i]) for row in rows) for i in range(3)]
+        return '\n'.join(
+            '    ' + '  '.join(c.rjust(w) for c, w in zip(row, widths)) + f'  {row[3]}'
+            for row in rows
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'path' : str(self.path),
+            'top'  : [stat._asdict() for stat in self.top],
+        }
+
+def profile_cpu(
+    profiler : str,
+    func     : Callable,
+    args     : tuple,
+    kwargs   : dict,
+    path     : Path,
+    top_n    : int = 10,
+) -> CpuProfile:
+    """
+    Run `func` under `profiler` ('cprofile' or 'sample'), writing the profile to
+    `path` with the profiler's file extension
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if profiler == 'cprofile':
+        return _profile_cprofile(func, args, kwargs, path.with_suffix('.prof'), top_n)
+    if profiler == 'sample':
+        return _profile_sample(func, args, kwargs, path.with_suffix('.collapsed'), top_n)
+    raise ValueError(f'Unknown profiler {profiler!r}: expected one of {CPU_PROFILERS}')
+
+def profile_path(directory: str | Path, solver: str, label: str) -> Path:
+    """Profile file (without extension) for a part, e.g. profiles/2024_day12_part_1"""
+    name = re.sub(r'\W+', '_', f'{solver}_{label}').strip('_').lower()
+    return Path(directory) / name
+
+def _profile_cprofile(
+    func   : Callable,
+    args   : tuple,
+    kwargs : dict,
+    path   : Path,
+    top_n  : int,
+) -> CpuProfile:
+    profiler = cProfile.Profile()
+    profiler.runcall(func, *args, **kwargs)
+    profiler.dump_stats(path)
+    stats = pstats.Stats(profiler).stats # type: ignore[attr-defined]
+    top = sorted(
+        (
+            FunctionStat(_function_name(file, line, name), n_calls, self_time, cum_time)
+            for (file, line, name), (_, n_calls, self_time, cum_time, _) in stats.items()
+            if '_lsprof.Profiler' not in name # Stopping the profiler
+        ),
+        key = lambda stat : stat.cum_time,
+        reverse = True,
+    )
+    return CpuProfile(path, top[:top_n])
+
+def _profile_sample(
+    func   : Callable,
+    args   : tuple,
+    kwargs : dict,
+    path   : Path,
+    top_n  : int,
+) -> CpuProfile:
+    # Samples only need the frames below this one
+    base_depth = len(_stack(sys._getframe()))
+    sampler = _Sampler(threading.get_ident(), base_depth)
+    # The sampler can only run when this thread releases the GIL
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(SAMPLE_INTERVAL)
+    start = time.perf_counter()
+    sampler.start()
+    try:
+        func(*args, **kwargs)
+    finally:
+        sampler.stop()
+        elapsed = time.perf_counter() - start
+        sys.setswitchinterval(switch_interval)
+
+    with path.open('w') as f:
+        for stack, count in sampler.stacks.items():
+            f.write(f'{";".join(stack)} {count}\n')
+
+    n_samples = sampler.stacks.total()
+    per_sample = elapsed / n_samples if n_samples > 0 else 0
+    self_counts = Counter()
+    cum_counts  = Counter()
+    for stack, count in sampler.stacks.items():
+        self_counts[stack[-1]] += count
+        for function in set(stack): # Count recursive functions once per sample
+            cum_counts[function] += count
+    top = [
+        FunctionStat(function, None, self_counts[function] * per_sample, count * per_sample)
+        for function, count in cum_counts.most_common(top_n)
+    ]
+    return CpuProfile(path, top)
+
+class _Sampler(threading.Thread):
+    """Counts the call stacks of another thread, polled every `SAMPLE_INTERVAL`"""
+    def __init__(self, thread_id: int, base_depth: int):
+        super().__init__(name='aoc-sampler', daemon=True)
+        self.stacks     : Counter[tuple[str, ...]] = Counter()
+        self.thread_id  = thread_id
+        self.base_depth = base_depth
+        self._code_names     : dict[Any, str] = {} # code object to function name
+        self._done      = threading.Event()
+
+    def run(self) -> None:
+        while not self._done.wait(SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = _stack(frame)[self.base_depth:]
+            if stack:
+                self.stacks[tuple(self._code_name(f.f_code) for f in stack)] += 1
+
+    def _code_name(self, code) -> str:
+        if (name := self._code_names.get(code)) is None:
+            name = _function_name(code.co_filename, code.co_firstlineno, code.co_qualname)
+            self._code_names[code] = name
+        return name
+
+    def stop(self) -> None:
+        self._done.set()
+        self.join()
+
+def _stack(frame: FrameType | None) -> list[FrameType]:
+    """Frames from the outermost call to `frame`"""
+    stack = []
+    while frame is not None:
+        stack.append(frame)
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+################################################################################
+def _short_path(file: str) -> str:
+    # Enough of the path to tell the solvers apart, e.g. 2024/day22/main.py
+    return str(Path(*Path(file).parts[-3:]))
+
+def _location(frame: 'tracemalloc.Frame') -> str:
+    return f'{_short_path(frame.filename)}:{frame.lineno}'
+
+def _function_name(file: str, line: int, name: str) -> str:
+    if file == '~': # Built-in
+        return name
+    return f'{_short_path(file)}:{line}({name})'
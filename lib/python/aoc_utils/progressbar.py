@@ -0,0 +1,50 @@
+"""
+Progress bars that cost nothing when turned off
+
+`progress()` wraps an iterable in a `tqdm` progress bar. With `--no-progress`,
+or while benchmarking with `--repeat`/`--warmup`, it returns the iterable
+itself so a solver's hot loop pays neither tqdm's per-iteration bookkeeping
+nor the terminal writes. tqdm is only imported the first time a bar is shown.
+
+Examples
+========
+>>> for move in aoc.progress(movements, desc='Simulating', unit='moves'): ...
+
+$ ./main.py input.txt --no-progress
+"""
+# Standard library
+import logging
+from collections.abc import Iterable
+
+# Globals
+log = logging.getLogger('AoC')
+
+_ENABLED = True
+
+################################################################################
+def configure(enabled: bool) -> None:
+    global _ENABLED
+    _ENABLED = enabled
+
+def enabled() -> bool:
+    return _ENABLED
+
+def progress[T](
+    iterable : Iterable[T],
+    desc     : str | None = None,
+    total    : int | None = None,
+    unit     : str = 'it',
+    disable  : bool = False,
+    **kwargs,
+) -> Iterable[T]:
+    """
+    `tqdm(iterable, ...)` when progress bars are enabled, otherwise `iterable`
+    unchanged. Extra keyword arguments are passed on to tqdm.
+    """
+    if disable or not _ENABLED:
+        return iterable
+    try:
+        from tqdm import tqdm
+    except ImportError:
+        return iterable
+    return tqdm(iterable, desc=desc, total=total, unit=unit, **kwargs)
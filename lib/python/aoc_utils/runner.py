@@ -0,0 +1,237 @@
+"""
+Run every solver in the repo and tabulate their answers and timings
+
+Solvers are discovered as `<root>/<year>/day<NN>/main.py` and each one runs in
+its own worker process of a process pool so a full regression run uses every
+core. A worker executes the solver as `__main__` with its own `sys.argv`, so it
+behaves exactly as if launched by hand, and reads back the answers and timings
+recorded by `aoc.bench`. Workers are replaced after each solver so module level
+state (e.g. `lru_cache`) never leaks between days.
+
+Examples
+========
+$ aoc-run                                   # every day with an input.txt
+$ aoc-run 2024 -j 4                         # only 2024, on 4 processes
+$ aoc-run 2024/day0 --inputs '/data/{year}_{day}.txt' -- --repeat 10
+"""
+# Standard library
+import argparse
+import contextlib
+import io
+import logging
+import os
+import runpy
+import sys
+import time
+import traceback
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# 1st party
+from aoc_utils import bench
+
+# Globals
+log = logging.getLogger('AoC')
+
+DEFAULT_INPUTS = '{dir}/input.txt'
+
+################################################################################
+@dataclass(slots=True)
+class Solver:
+    year  : str
+    day   : str
+    main  : Path
+    input : Path
+
+    @property
+    def name(self) -> str:
+        return f'{self.year}/{self.day}'
+
+@dataclass(slots=True)
+class SolverResult:
+    solver : Solver
+    parts  : list[bench.PartResult] = field(default_factory=list)
+    error  : str | None = None
+    output : str = '' # Captured stdout and stderr
+    wall   : float = 0 # seconds
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+################################################################################
+def main() -> None:
+    args, solver_args = parse_args()
+    logging.basicConfig(
+        level  = args.log_level,
+        format = '%(levelname)8s | %(message)s',
+    )
+
+    solvers = discover(args.root, args.filters, args.inputs)
+    if len(solvers) == 0:
+        log.error('No solvers with inputs found under %s', args.root)
+        sys.exit(1)
+    log.info('Running %d solvers on %d processes', len(solvers), args.jobs)
+
+    results = run_all(solvers, solver_args, args.jobs)
+    print(format_table(results))
+    for result in results:
+        if not result.ok:
+            log.warning('%s failed:\n%s', result.solver.name, result.output.rstrip())
+    sys.exit(0 if all(r.ok for r in results) else 1)
+
+def parse_args() -> tuple[argparse.Namespace, list[str]]:
+    parser = argparse.ArgumentParser(
+        description = 'Run solvers in parallel and tabulate their answers',
+        epilog      = 'Arguments after "--" are passed to every solver',
+    )
+    parser.add_argument(
+        'filters',
+        nargs = '*',
+        help  = 'Only run solvers whose name (e.g. 2024/day06) contains one of these',
+    )
+    parser.add_argument(
+        '--root',
+        type    = Path,
+        default = Path(os.environ.get('AOC_PATH', '.')),
+        help    = 'Repository root (default: $AOC_PATH or the current directory)',
+    )
+    parser.add_argument(
+        '--inputs',
+        default = DEFAULT_INPUTS,
+        help    = (
+            'Input path template with {dir}, {year} and {day} '
+            f'(default: {DEFAULT_INPUTS})'
+        ),
+    )
+    parser.add_argument(
+        '-j', '--jobs',
+        type    = int,
+        default = os.cpu_count() or 1,
+        help    = 'Number of worker processes',
+    )
+    parser.add_argument(
+        '-l', '--log-level',
+        default = 'WARNING',
+        help    = 'Logging level',
+    )
+    argv = sys.argv[1:]
+    solver_args = []
+    if '--' in argv:
+        idx = argv.index('--')
+        argv, solver_args = argv[:idx], argv[idx+1:]
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error(f'--jobs must be at least 1: {args.jobs}')
+    return args, solver_args
+
+################################################################################
+def discover(
+    root    : Path,
+    filters : Sequence[str] = (),
+    inputs  : str = DEFAULT_INPUTS,
+) -> list[Solver]:
+    """Find each `<year>/day<NN>/main.py` under `root` that has an input"""
+    solvers = []
+    for main_file in sorted(root.glob('*/day*/main.py')):
+        day_dir = main_file.parent
+        solver = Solver(
+            year  = day_dir.parent.name,
+            day   = day_dir.name,
+            main  = main_file,
+            input = Path(inputs.format(
+                dir  = day_dir,
+                year = day_dir.parent.name,
+                day  = day_dir.name,
+            )),
+        )
+        if filters and not any(f in solver.name for f in filters):
+            continue
+        if not solver.input.is_file():
+            log.info('Skipping %s: no input at %s', solver.name, solver.input)
+            continue
+        solvers.append(solver)
+    return solvers
+
+def run_all(
+    solvers     : Iterable[Solver],
+    solver_args : Sequence[str] = (),
+    jobs        : int = 1,
+) -> list[SolverResult]:
+    """Run solvers in parallel, returning results in the order given"""
+    solvers = list(solvers)
+    results : dict[str, SolverResult] = {}
+    with ProcessPoolExecutor(max_workers=jobs, max_tasks_per_child=1) as pool:
+        futures = {pool.submit(run_solver, s, solver_args) : s for s in solvers}
+        for future in as_completed(futures):
+            solver = futures[future]
+            try:
+                result = future.result()
+            except Exception as e: # e.g. the worker was killed
+                result = SolverResult(solver, error=repr(e))
+            results[solver.name] = result
+            log.info('%s %s in %.3fs',
+                solver.name, 'finished' if result.ok else 'failed', result.wall
+            )
+    return [results[s.name] for s in solvers]
+
+def run_solver(solver: Solver, solver_args: Sequence[str] = ()) -> SolverResult:
+    """Run one solver as `__main__`, capturing its output and bench results"""
+    result = SolverResult(solver)
+    argv, sys.argv = sys.argv, [str(solver.main), str(solver.input), *solver_args]
+    output = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            runpy.run_path(str(solver.main), run_name='__main__')
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            result.error = f'SystemExit({e.code!r})'
+    except BaseException as e:
+        result.error = f'{type(e).__name__}: {e}' if str(e) else type(e).__name__
+        output.write(traceback.format_exc())
+    finally:
+        result.wall = time.perf_counter() - start
+        sys.argv = argv
+    result.parts = bench.results()
+    result.output = output.getvalue()
+    return result
+
+################################################################################
+def format_table(results: Iterable[SolverResult], max_answer_len: int = 24) -> str:
+    rows = [('Solver', 'Part', 'Answer', 'Median [ms]', 'Min [ms]')]
+    for result in results:
+        name = result.solver.name
+        for part in result.parts:
+            if part.answer is None: # Intermediate step
+                continue
+            answer = str(part.answer)
+            if len(answer) > max_answer_len:
+                answer = answer[:max_answer_len-3] + '...'
+            rows.append((
+                name, part.label, answer,
+                f'{part.median*1000:.3f}', f'{part.min*1000:.3f}'
+            ))
+            name = ''
+        if not result.ok:
+            rows.append((name, 'ERROR', result.error or '', '', ''))
+        rows.append((
+            '', 'Total (wall)', '', f'{result.wall*1000:.3f}', ''
+        ))
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = []
+    for i, row in enumerate(rows):
+        lines.append(' | '.join(
+            cell.rjust(w) if i > 0 and j >= 3 else cell.ljust(w)
+            for j, (cell, w) in enumerate(zip(row, widths))
+        ).rstrip())
+        if i == 0:
+            lines.append('-+-'.join('-' * w for w in widths))
+    return '\n'.join(lines)
+
+################################################################################
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Shortest paths over integer states
+
+States are ints in `range(n_states)`, e.g. flat grid indices or
+`cell * 4 + direction`, so distances and predecessors live in flat `array`s
+rather than in path objects pushed onto the heap. Each state stores only links
+to its predecessors, which is O(1) per expansion however long the paths get.
+Paths are rebuilt from the links afterwards.
+
+With `all_paths`, every predecessor on a tied shortest path is kept, so the
+predecessors form a DAG of all the best paths (see `SearchResult.dag()`).
+
+Examples
+========
+>>> grid = aoc.Grid.from_text(text)
+>>> open_cells = grid.flat != grid.code('#')
+>>> def neighbors(idx: int) -> Iterable[int]:
+...     return (n for n in grid.neighbors4[idx] if n >= 0 and open_cells[n])
+>>> start, end = grid.index(*grid.find_one('S')), grid.index(*grid.find_one('E'))
+>>> result = aoc.search.bfs(grid.size, [start], neighbors, goal=end.__eq__)
+>>> result.distance(end)
+84
+>>> [grid.coords(idx) for idx in result.path(end)]
+[(3, 1), (2, 1), ...]
+"""
+# Standard library
+import heapq
+import logging
+from array import array
+from collections import deque
+from collections.abc import Callable, Iterable
+
+# Globals
+log = logging.getLogger('AoC')
+
+UNREACHED = -1
+NO_LINK   = -1
+
+Neighbors         = Callable[[int], Iterable[int]]
+WeightedNeighbors = Callable[[int], Iterable[tuple[int, int]]] # (state, cost)
+
+################################################################################
+class SearchResult:
+    """
+    Distances from the start states and the predecessor links to rebuild paths
+
+    The predecessors of a state are a linked list stored in flat arrays:
+    `_head[state]` is its first link, `_pred[link]` the predecessor it holds and
+    `_next[link]` the state's next link (or `NO_LINK`).
+    """
+    __slots__ = ('dist', 'goals', '_head', '_pred', '_next')
+
+    def __init__(self, n_states: int):
+        self.dist  = array('q', [UNREACHED]) * n_states
+        self.goals : list[int] = [] # Goal states reached at the best distance
+        self._head = array('q', [NO_LINK]) * n_states
+        self._pred = array('q')
+        self._next = array('q')
+
+    def _link(self, state: int, pred: int, replace: bool) -> None:
+        """Add a predecessor, dropping the others if a shorter path was found"""
+        self._next.append(NO_LINK if replace else self._head[state])
+        self._head[state] = len(self._pred)
+        self._pred.append(pred)
+
+    @property
+    def goal(self) -> int | None:
+        return self.goals[0] if self.goals else None
+
+    def reached(self, state: int) -> bool:
+        return self.dist[state] != UNREACHED
+
+    def distance(self, state: int) -> int | None:
+        dist = self.dist[state]
+        return None if dist == UNREACHED else dist
+
+    def predecessors(self, state: int) -> list[int]:
+        preds = []
+        link = self._head[state]
+        while link != NO_LINK:
+            preds.append(self._pred[link])
+            link = self._next[link]
+        return preds
+
+    def path(self, state: int) -> list[int]:
+        """One shortest path from a start state to `state`, inclusive"""
+        if not self.reached(state):
+            raise ValueError(f'State {state} was not reached')
+        path = [state]
+        while (link := self._head[state]) != NO_LINK:
+            state = self._pred[link]
+            path.append(state)
+        path.reverse()
+        return path
+
+    def dag(self, *states: int) -> set[int]:
+        """Every state on any of the recorded shortest paths to `states`"""
+        seen = bytearray(len(self.dist))
+        stack = [s for s in states if self.reached(s)]
+        for state in stack:
+            seen[state] = 1
+        while stack:
+            link = self._head[stack.pop()]
+            while link != NO_LINK:
+                pred = self._pred[link]
+                if not seen[pred]:
+                    seen[pred] = 1
+                    stack.append(pred)
+                link = self._next[link]
+        return {state for state, s in enumerate(seen) if s}
+
+################################################################################
+# Searches
+def bfs(
+    n_states  : int,
+    starts    : Iterable[int],
+    neighbors : Neighbors,
+    goal      : Callable[[int], bool] | None = None,
+    all_paths : bool = False,
+) -> SearchResult:
+    """
+    Breadth-first search where every step costs 1. Stops once a goal state is
+    reached, or after every goal at that distance with `all_paths`.
+    """
+    result = SearchResult(n_states)
+    dist   = result.dist
+    queue  = deque()
+    for state in starts:
+        dist[state] = 0
+        queue.append(state)
+
+    goal_dist = None
+    while queue:
+        state = queue.popleft()
+        d = dist[state]
+        if goal_dist is not None and d > goal_dist:
+            break
+        if goal is not None and goal(state):
+            result.goals.append(state)
+            goal_dist = d
+            if not all_paths:
+                break
+            continue
+        for next_state in neighbors(state):
+            next_dist = dist[next_state]
+            if next_dist == UNREACHED:
+                dist[next_state] = d + 1
+                result._link(next_state, state, replace=True)
+                queue.append(next_state)
+            elif all_paths and next_dist == d + 1:
+                result._link(next_state, state, replace=False)
+    return result
+
+def dijkstra(
+    n_states  : int,
+    starts    : Iterable[int],
+    neighbors : WeightedNeighbors,
+    goal      : Callable[[int], bool] | None = None,
+    heuristic : Callable[[int], int] | None = None,
+    all_paths : bool = False,
+) -> SearchResult:
+    """
+    Dijkstra's algorithm over non-negative costs, or A* with a `heuristic`
+    that never overestimates the remaining cost (and is consistent, if used
+    with `all_paths`). Stops once a goal state is reached, or after every goal
+    at that distance with `all_paths`.
+    """
+    result = SearchResult(n_states)
+    dist   = result.dist
+    h      = heuristic if heuristic is not None else lambda _ : 0
+    heap   = []
+    for state in starts:
+        dist[state] = 0
+        heap.append((h(state), 0, state))
+    heapq.heapify(heap)
+
+    push, pop = heapq.heappush, heapq.heappop
+    goal_dist = None
+    while heap:
+        f, d, state = pop(heap)
+        if d != dist[state]: # Stale since a shorter path was found
+            continue
+        if goal_dist is not None and f > goal_dist:
+            break
+        if goal is not None and goal(state):
+            result.goals.append(state)
+            goal_dist = d
+            if not all_paths:
+                break
+            continue
+        for next_state, cost in neighbors(state):
+            next_dist = dist[next_state]
+            new_dist = d + cost
+            if next_dist == UNREACHED or new_dist < next_dist:
+                dist[next_state] = new_dist
+                result._link(next_state, state, replace=True)
+                push(heap, (new_dist + h(next_state), new_dist, next_state))
+            elif all_paths and new_dist == next_dist:
+                result._link(next_state, state, replace=False)
+    return result
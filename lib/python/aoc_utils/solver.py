@@ -0,0 +1,145 @@
+"""
+Registering a solver's parse and part functions
+
+Instead of parsing, timing and printing inside `main()`, a solver can register
+its pieces with the decorators below and hand them to `solve()`. Parsing is
+then timed separately from solving, every variant of a part is timed the same
+way and checked against the primary implementation, and the pieces can be
+loaded and benchmarked without running `main()` at all.
+
+Part functions receive the parsed data and must not mutate it. A part whose
+variants can give different but equally valid answers (e.g. heuristics) can
+register a `compare(primary, variant)` check to use instead of `==`.
+
+Examples
+========
+>>> @aoc.solver.parse
+... def parse(text: str) -> Data: ...
+>>> @aoc.solver.part(1)
+... def part1(data: Data) -> int: ...
+>>> @aoc.solver.part(1, variant='vec')
+... def part1_vectorized(data: Data) -> int: ...
+>>> def main() -> None:
+...     args = aoc.parse_args()
+...     aoc.configure(args)
+...     aoc.solve(__name__, aoc.read_input(args.input))
+Part 1: 480 [t=0.388ms]
+Part 1 [vec]: 480 [t=0.112ms]
+
+>>> solution = aoc.solver.load('2024/day13/main.py')
+>>> data = solution.parse(text)
+>>> solution.parts[1](data)
+"""
+# Standard library
+import importlib.util
+import logging
+import operator
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+# 1st party
+from aoc_utils import bench
+
+# Globals
+log = logging.getLogger('AoC')
+
+PartFunc = Callable[[Any], Any]
+# Whether a variant's answer (second) agrees with the primary part's (first)
+CompareFunc = Callable[[Any, Any], bool]
+
+################################################################################
+@dataclass(slots=True)
+class Solution:
+    parse    : Callable[[str], Any] = str
+    parts    : dict[int, PartFunc] = field(default_factory=dict)
+    variants : dict[int, dict[str, PartFunc]] = field(default_factory=dict)
+    compare  : dict[int, CompareFunc] = field(default_factory=dict)
+
+    def part_numbers(self) -> list[int]:
+        return sorted(self.parts.keys() | self.variants.keys())
+
+# Solutions keyed by the name of the module defining them
+_REGISTRY : dict[str, Solution] = {}
+
+def get(module: str) -> Solution:
+    """The solution registered by `module` (e.g. `__name__`)"""
+    if module not in _REGISTRY:
+        raise KeyError(f'No solution registered by module {module!r}')
+    return _REGISTRY[module]
+
+def _solution(func: Callable) -> Solution:
+    return _REGISTRY.setdefault(func.__module__, Solution())
+
+################################################################################
+# Registration
+def parse[F: Callable[[str], Any]](func: F) -> F:
+    """Register the function turning the input text into data for the parts"""
+    _solution(func).parse = func
+    return func
+
+def part[F: PartFunc](
+    number  : int,
+    variant : str | None = None,
+    compare : CompareFunc | None = None,
+) -> Callable[[F], F]:
+    """
+    Register the function solving part `number`, or an alternate
+    implementation of it named `variant`. `compare` replaces `==` when
+    checking the variants of the part against the primary one.
+    """
+    def decorator(func: F) -> F:
+        solution = _solution(func)
+        if compare is not None:
+            solution.compare[number] = compare
+        if variant is None:
+            solution.parts[number] = func
+        else:
+            solution.variants.setdefault(number, {})[variant] = func
+        return func
+    return decorator
+
+################################################################################
+# Running
+def solve(module: str, text: str) -> dict[int, Any]:
+    """
+    Time parsing and then each part and its variants with `aoc.bench`,
+    checking every variant agrees with the primary part (`==` unless the part
+    registered its own comparison).
+    """
+    solution = get(module)
+    data = bench.step('Parse', solution.parse, text)
+    answers = {}
+    for number in solution.part_numbers():
+        agrees = solution.compare.get(number, operator.eq)
+        if number in solution.parts:
+            answers[number] = bench.part(f'Part {number}', solution.parts[number], data)
+        for name, func in solution.variants.get(number, {}).items():
+            answer = bench.part(f'Part {number} [{name}]', func, data)
+            if number not in answers:
+                answers[number] = answer
+            elif not agrees(answers[number], answer):
+                raise AssertionError(
+                    f'Part {number} [{name}] answer {answer!r} does not match '
+                    f'{answers[number]!r}'
+                )
+    return answers
+
+def load(path: str | Path) -> Solution:
+    """Import a solver's main.py without running main() and return its solution"""
+    path = Path(path).resolve()
+    name = f'aoc_{path.parent.parent.name}_{path.parent.name}'
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, path)
+        if spec is None or spec.loader is None:
+            raise ImportError(f'Cannot import solver from {path}')
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+    return get(name)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+Per-element cost of Chainable pipelines vs. a hand-written loop
+
+Usage: python lib/python/benchmarks/chainable.py [-n N_ELEMENTS]
+"""
+# Standard library
+import argparse
+import timeit
+from itertools import count, takewhile
+
+# 3rd party
+import numpy as np
+
+# 1st party
+import aoc_utils as aoc
+
+################################################################################
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', '--n-elements', type=int, default=100_000)
+    parser.add_argument('--short', type=int, default=8, help='Elements in the short chain case')
+    args = parser.parse_args()
+
+    square = lambda x : x * x
+    is_odd = lambda x : x % 2 == 1
+    below  = lambda x : x < args.n_elements**2
+
+    def hand_written(n: int) -> set[int]:
+        out = set()
+        for x in range(n):
+            x = square(x)
+            if not is_odd(x):
+                continue
+            if not below(x):
+                break
+            out.add(x)
+        return out
+
+    def builtin_iterators(n: int) -> set[int]:
+        return set(takewhile(below, filter(is_odd, map(square, range(n)))))
+
+    def eager(n: int) -> set[int]:
+        return (aoc.Chainable(range(n))
+            .map(square)
+            .filter(is_odd)
+            .takewhile(below)
+            .set()
+            .collect()
+        )
+
+    def lazy(n: int) -> set[int]:
+        return (aoc.Chainable(range(n))
+            .lazy()
+            .map(square)
+            .filter(is_odd)
+            .takewhile(below)
+            .set()
+            .collect()
+        )
+
+    def lazy_array(n: int) -> set[int]:
+        # Vectorized by NumPy since the functions also work on whole arrays
+        return set(aoc.Chainable(np.arange(n))
+            .lazy()
+            .vectorized()
+            .map(square)
+            .filter(is_odd)
+            .takewhile(below)
+            .tolist()
+            .collect()
+        )
+
+    candidates = {
+        'hand-written loop'   : hand_written,
+        'builtin iterators'   : builtin_iterators,
+        'Chainable'           : eager,
+        'Chainable.lazy'      : lazy,
+        'Chainable.lazy [np]' : lazy_array,
+    }
+    expected = hand_written(args.n_elements)
+    assert all(f(args.n_elements) == expected for f in candidates.values())
+
+    # Long chains measure the per-element cost, short ones (like 2024 day08)
+    # are dominated by the cost of building the chain
+    for label, n, reps in [
+        (f'{args.n_elements:,} elements', args.n_elements, 5),
+        (f'{args.short} elements', args.short, 20_000),
+    ]:
+        print(f'{label}:')
+        baseline = None
+        for name, func in candidates.items():
+            t = min(timeit.repeat(lambda : func(n), number=reps, repeat=5)) / reps
+            baseline = baseline or t
+            print(f'  {name:<20} {t/n*1e9:9.1f} ns/element {t/baseline:6.2f}x')
+
+################################################################################
+if __name__ == "__main__":
+    main()
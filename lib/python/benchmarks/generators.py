@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+"""
+Puzzle inputs of any size, for seeing how solvers scale
+
+Each generator takes a size and a random number generator and returns the text
+of an input in that day's format, shaped like the real inputs (obstacle
+density, value ranges, a single largest clique, ...) so that only the size
+differs. What the size counts is given in each generator's docstring.
+
+Usage: python lib/python/benchmarks/generators.py 2024/day06 SIZE [--seed N] [-o PATH]
+"""
+# Standard library
+import argparse
+import random
+import string
+import sys
+from collections import deque
+from collections.abc import Callable
+from itertools import combinations, product
+
+# Globals
+Generator = Callable[[int, random.Random], str]
+
+################################################################################
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('day', choices=GENERATORS, help='Input format to generate')
+    parser.add_argument('size', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', type=argparse.FileType('w'), default=sys.stdout)
+    args = parser.parse_args()
+    args.output.write(GENERATORS[args.day](args.size, random.Random(args.seed)))
+
+################################################################################
+def guard_map(size: int, rng: random.Random, density: float = 0.05) -> str:
+    """
+    Square map `size` cells wide with a guard whose route leaves it. The real
+    130x130 map has about 5% of its cells obstructed and a route through a
+    good share of it, so the start with the longest route is picked out of
+    `size` random ones.
+    """
+    rows = [
+        ['#' if rng.random() < density else '.' for _ in range(size)]
+        for _ in range(size)
+    ]
+    floor = [(i, j) for i in range(size) for j in range(size) if rows[i][j] == '.']
+    routes = {
+        start : _route_length(rows, start)
+        for start in rng.sample(floor, min(size, len(floor)))
+    }
+    i, j = max(routes, key=lambda start : routes[start] or 0)
+    if routes[i, j] is None:
+        return guard_map(size, rng, density)
+    rows[i][j] = '^'
+    return '\n'.join(map(''.join, rows)) + '\n'
+
+def _route_length(rows: list[list[str]], start: tuple[int, int]) -> int | None:
+    """Steps the guard takes to leave the map, None if it never does"""
+    size = len(rows)
+    (i, j), (di, dj) = start, (-1, 0)
+    seen = set()
+    while (i, j, di, dj) not in seen:
+        seen.add((i, j, di, dj))
+        ni, nj = i + di, j + dj
+        if not (0 <= ni < size and 0 <= nj < size):
+            return len(seen)
+        if rows[ni][nj] == '#':
+            di, dj = dj, -di
+        else:
+            i, j = ni, nj
+    return None
+
+def disk_map(size: int, rng: random.Random) -> str:
+    """`size` files of 1-9 blocks separated by 0-9 free blocks"""
+    digits = []
+    for _ in range(size - 1):
+        digits += [rng.randint(1, 9), rng.randint(0, 9)]
+    digits.append(rng.randint(1, 9))
+    return ''.join(map(str, digits)) + '\n'
+
+def stones(size: int, rng: random.Random) -> str:
+    """`size` stones engraved with numbers of up to 7 digits"""
+    return ' '.join(str(rng.randrange(10**rng.randint(1, 7))) for _ in range(size)) + '\n'
+
+def byte_drops(size: int, rng: random.Random) -> str:
+    """
+    Bytes falling on a `size` x `size` memory space, covering the same share
+    of it as the 3450 bytes on the real 71x71 space. The exit can be reached
+    after the first 1024/3450 of them have fallen but not after all of them.
+    """
+    cells = [
+        (x, y) for x, y in product(range(size), repeat=2)
+        if (x, y) not in {(0, 0), (size-1, size-1)}
+    ]
+    n_bytes  = len(cells) * 3450 // (71*71 - 2)
+    n_fallen = n_bytes * 1024 // 3450
+    while True:
+        rng.shuffle(cells)
+        drops = cells[:n_bytes]
+        if (
+            # The solver gets the size of the space from the furthest bytes
+            max(x for x, _ in drops) == max(y for _, y in drops) == size-1
+            and _exit_reachable(drops[:n_fallen], size)
+            and not _exit_reachable(drops, size)
+        ):
+            return ''.join(f'{x},{y}\n' for x, y in drops)
+
+def _exit_reachable(corrupted: list[tuple[int, int]], size: int) -> bool:
+    blocked = set(corrupted)
+    seen    = {(0, 0)}
+    queue   = deque(seen)
+    while queue:
+        x, y = queue.popleft()
+        if (x, y) == (size-1, size-1):
+            return True
+        for nxt in [(x+1, y), (x-1, y), (x, y+1), (x, y-1)]:
+            if (
+                0 <= nxt[0] < size and 0 <= nxt[1] < size
+                and nxt not in blocked and nxt not in seen
+            ):
+                seen.add(nxt)
+                queue.append(nxt)
+    return False
+
+def buyer_secrets(size: int, rng: random.Random) -> str:
+    """Initial secret numbers of `size` buyers"""
+    return ''.join(f'{rng.randrange(1, 2**24)}\n' for _ in range(size))
+
+def lan_graph(size: int, rng: random.Random, degree: int = 13) -> str:
+    """
+    Connections between `size` computers, each with `degree` on average as in
+    the real input, where `degree` of them form the one largest clique
+    (the LAN party). Names are two letters as in the real input, longer when
+    there are more than 26**2 computers.
+    """
+    # Fewer computers can't have `degree` connections each on average
+    if size < degree + 1:
+        raise ValueError(f'Need at least {degree + 1} computers for degree {degree}, got {size}')
+    width = 2
+    while 26**width < size:
+        width += 1
+    names = rng.sample(
+        [''.join(chars) for chars in product(string.ascii_lowercase, repeat=width)],
+        size,
+    )
+    party = set(names[:degree])
+    edges = {frozenset(pair) for pair in combinations(party, 2)}
+    n_edges = size * degree // 2
+    while len(edges) < n_edges:
+        pair = frozenset(rng.sample(names, 2))
+        # Connecting two of the party again would make a larger clique possible
+        if not pair <= party:
+            edges.add(pair)
+    lines = ['-'.join(rng.sample(sorted(pair), 2)) for pair in edges]
+    rng.shuffle(lines)
+    return '\n'.join(lines) + '\n'
+
+def adder_circuit(size: int, rng: random.Random, n_swaps: int = 4) -> str:
+    """
+    Ripple-carry adder of two `size` bit numbers in shuffled order, with the
+    outputs of `n_swaps` pairs of gates swapped as in the real 45 bit input.
+    Swaps are within a single bit's full adder so the circuit has no cycles.
+    """
+    names = (
+        ''.join(chars) for chars in rng.sample(
+            list(product('abcdefghijklmnopqrstuvw', repeat=3)),
+            5 * size,
+        )
+    )
+    # Gates of each bit as [in1, op, in2, out]
+    bits = [[
+        ['x00', 'XOR', 'y00', 'z00'],
+        ['x00', 'AND', 'y00', carry := next(names)],
+    ]]
+    for i in range(1, size):
+        x, y, z = f'x{i:02d}', f'y{i:02d}', f'z{i:02d}'
+        half_sum, half_carry, carry_on = next(names), next(names), next(names)
+        out_carry = f'z{size:02d}' if i == size-1 else next(names)
+        bits.append([
+            [x, 'XOR', y, half_sum],
+            [x, 'AND', y, half_carry],
+            [half_sum, 'XOR', carry, z],
+            [half_sum, 'AND', carry, carry_on],
+            [half_carry, 'OR', carry_on, out_carry],
+        ])
+        carry = out_carry
+
+    # Same kinds of swap as in the real input: the half sum with the half
+    # carry, or the output bit with one of the carries
+    swappable = [(0, 1), (2, 3), (2, 4), (2, 1)]
+    for i in rng.sample(range(1, size-1), min(n_swaps, max(size-2, 0))):
+        a, b = rng.choice(swappable)
+        bits[i][a][3], bits[i][b][3] = bits[i][b][3], bits[i][a][3]
+
+    gates = [gate for bit in bits for gate in bit]
+    rng.shuffle(gates)
+    inputs = [
+        f'{xy}{i:02d}: {rng.randint(0, 1)}'
+        for xy in 'xy' for i in range(size)
+    ]
+    return '\n'.join([
+        *inputs,
+        '',
+        *(
+            f'{in1} {op} {in2} -> {out}' if rng.random() < 0.5 else
+            f'{in2} {op} {in1} -> {out}'
+            for in1, op, in2, out in gates
+        ),
+    ]) + '\n'
+
+GENERATORS : dict[str, Generator] = {
+    '2024/day06' : guard_map,
+    '2024/day09' : disk_map,
+    '2024/day11' : stones,
+    '2024/day18' : byte_drops,
+    '2024/day22' : buyer_secrets,
+    '2024/day23' : lan_graph,
+    '2024/day24' : adder_circuit,
+}
+
+################################################################################
+if __name__ == "__main__":
+    main()
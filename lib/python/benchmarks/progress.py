@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+Cost of progress bars in 2024 day15's per-move loops
+
+Runs both parts of the solver on a generated warehouse with progress bars shown
+(written to /dev/null) and with them turned off as by `--no-progress`.
+
+Usage: python lib/python/benchmarks/progress.py [-s SIZE] [-m N_MOVES]
+"""
+# Standard library
+import argparse
+import contextlib
+import os
+import random
+import runpy
+import timeit
+from pathlib import Path
+
+# 1st party
+import aoc_utils as aoc
+from aoc_utils import geometry as geo
+
+# Globals
+DAY15 = Path(__file__).resolve().parents[3] / '2024' / 'day15' / 'main.py'
+
+################################################################################
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-s', '--size', type=int, default=50, help='Warehouse height and width')
+    parser.add_argument('-m', '--n-moves', type=int, default=20_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    day15 = runpy.run_path(str(DAY15)) # Doesn't run main()
+    warehouse_text, moves_text = make_input(args.size, args.n_moves, random.Random(args.seed))
+    movements = list(map(geo.from_char, moves_text))
+    wide_text = (warehouse_text
+        .replace('.','..')
+        .replace('#','##')
+        .replace('O','[]')
+        .replace('@','@.')
+    )
+
+    print(f'{args.size}x{args.size} warehouse, {args.n_moves:,} moves:')
+    for label, text in [('1 cell boxes', warehouse_text), ('2 cell boxes', wide_text)]:
+        fish, boxes, walls, layout = day15['parse_warehouse'](text)
+        simulate = lambda : day15['simulate_lanternfish'](fish, boxes, walls, movements, layout)
+        times = {}
+        for name, enabled in [('progress bar', True), ('--no-progress', False)]:
+            aoc.progressbar.configure(enabled)
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stderr(devnull):
+                times[name] = min(timeit.repeat(simulate, number=1, repeat=5))
+        print(f'  {label}:')
+        for name, t in times.items():
+            print(
+                f'    {name:<14} {t*1000:8.2f} ms {t/args.n_moves*1e9:8.1f} ns/move '
+                f'{t/times["--no-progress"]:6.2f}x'
+            )
+
+def make_input(size: int, n_moves: int, rng: random.Random) -> tuple[str, str]:
+    """Walled warehouse with a third of the floor covered by boxes, and random moves"""
+    rows = [['#'] * size]
+    for _ in range(size - 2):
+        rows.append(['#', *rng.choices('.O', weights=(2, 1), k=size-2), '#'])
+    rows.append(['#'] * size)
+    rows[size//2][size//2] = '@'
+    warehouse = '\n'.join(map(''.join, rows))
+    moves = ''.join(rng.choices(geo.CHARS, k=n_moves))
+    return warehouse, moves
+
+################################################################################
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+"""
+Solver time against input size, on generated inputs
+
+Each solver with a generator in generators.py is run on inputs of increasing
+size and the fastest time of each of its steps and parts is reported with its
+growth exponent: the slope of log(time) against log(size), about 1 for linear
+and 2 for quadratic scaling. For maps the size is the width, so an exponent
+of 2 there is linear in the number of cells. Times are plotted against size
+on log-log axes.
+
+Once a size times out, larger sizes of that day are skipped. Parts that fail
+(e.g. 2024/day24 part 2 only handles the real input) are left out, the rest
+of the day is still timed.
+
+Usage: python lib/python/benchmarks/scaling.py [2024/day09 ...] [--sizes N ...] [-r REPEAT]
+"""
+# Standard library
+import argparse
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# 1st party
+import aoc_utils as aoc
+from generators import GENERATORS
+
+# Globals
+ROOT = Path(__file__).resolve().parents[3]
+LIB  = ROOT / 'lib' / 'python'
+
+# Sizes around the real input's (what each counts is in generators.py)
+SIZES = {
+    '2024/day06' : (16, 32, 64, 128),
+    '2024/day09' : (1_250, 2_500, 5_000, 10_000),
+    '2024/day11' : (10, 100, 1_000, 10_000),
+    '2024/day18' : (18, 35, 71, 141),
+    '2024/day22' : (25, 50, 100, 200),
+    '2024/day23' : (130, 260, 520, 1_040),
+    '2024/day24' : (45, 90, 180, 360),
+}
+
+plt = aoc.lazy_import('matplotlib.pyplot')
+
+Timings = dict[str, dict[int, float]] # label -> size -> seconds
+
+################################################################################
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('days', nargs='*', help=f'default: all of {", ".join(GENERATORS)}')
+    parser.add_argument('--sizes', type=int, nargs='+', help='Override the default sizes')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='Runs per size')
+    parser.add_argument('--timeout', type=float, default=120, help='Seconds per run')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--plot', default='scaling.png', help='Where to save the plot')
+    args = parser.parse_args()
+    if unknown := set(args.days) - set(GENERATORS):
+        parser.error(f'No generator for {", ".join(sorted(unknown))}')
+
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(
+        filter(None, [str(LIB), os.environ.get('PYTHONPATH')])
+    )}
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for day in args.days or GENERATORS:
+            print(day)
+            results[day] = time_sizes(
+                day, args.sizes or SIZES[day], args.repeat, args.timeout, args.seed,
+                Path(tmp_dir), env,
+            )
+            print(format_timings(results[day]))
+    plot(results, args.plot)
+    print(f'Plot saved to {args.plot}')
+
+def time_sizes(
+    day     : str,
+    sizes   : list[int],
+    repeat  : int,
+    timeout : float,
+    seed    : int,
+    tmp_dir : Path,
+    env     : dict[str, str],
+) -> Timings:
+    timings = {}
+    input_path  = tmp_dir / 'input.txt'
+    report_path = tmp_dir / 'report.json'
+    for size in sizes:
+        input_path.write_text(GENERATORS[day](size, random.Random(seed)))
+        for _ in range(repeat):
+            report_path.unlink(missing_ok=True)
+            try:
+                subprocess.run(
+                    [
+                        sys.executable, str(ROOT / day / 'main.py'), str(input_path),
+                        '--no-progress', '--bench-json', str(report_path),
+                    ],
+                    capture_output = True,
+                    env            = env,
+                    cwd            = tmp_dir, # Solvers may save plots
+                    timeout        = timeout,
+                )
+            except subprocess.TimeoutExpired:
+                print(f'  size {size:,} timed out after {timeout:g}s, skipping larger sizes')
+                return timings
+            # Written at exit even when a later part fails
+            if not report_path.exists():
+                print(f'  size {size:,} failed before timing anything')
+                return timings
+            for part in json.loads(report_path.read_text())['parts']:
+                times = timings.setdefault(part['label'], {})
+                times[size] = min(times.get(size, math.inf), part['min_ms'] / 1000)
+    return timings
+
+def growth_exponent(times: dict[int, float]) -> float | None:
+    """Least squares slope of log(time) against log(size)"""
+    points = [(math.log(n), math.log(t)) for n, t in times.items() if t > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x  = sum((x - mean_x)**2 for x, _ in points)
+    if var_x == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+
+def format_timings(timings: Timings) -> str:
+    sizes = sorted({size for times in timings.values() for size in times})
+    label_width = max((len(label) for label in timings), default=0)
+    lines = ['  ' + ' ' * label_width + ''.join(f'{n:>12,}' for n in sizes) + '    exponent']
+    for label, times in timings.items():
+        exponent = growth_exponent(times)
+        lines.append(
+            f'  {label:<{label_width}}'
+            + ''.join(f'{times[n]*1000:10.2f}ms' if n in times else ' ' * 12 for n in sizes)
+            + ('' if exponent is None else f'{exponent:12.2f}')
+        )
+    return '\n'.join(lines)
+
+def plot(results: dict[str, Timings], path: str) -> None:
+    n_cols = min(len(results), 4)
+    n_rows = math.ceil(len(results) / n_cols)
+    fig, axes = plt.subplots(
+        n_rows, n_cols, figsize=(4*n_cols, 3.5*n_rows), squeeze=False,
+    )
+    for ax in axes.flat[len(results):]:
+        ax.set_visible(False)
+    for ax, (day, timings) in zip(axes.flat, results.items()):
+        for label, times in timings.items():
+            sizes = sorted(times)
+            ax.plot(sizes, [times[n] for n in sizes], 'o-', label=label)
+        ax.set(title=day, xscale='log', yscale='log', xlabel='Size', ylabel='Time [s]')
+        if timings:
+            ax.legend(fontsize='small')
+    fig.tight_layout()
+    fig.savefig(path)
+
+################################################################################
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""
+Cold import time of each solver
+
+Every solver's main.py is loaded (without running main()) in a fresh
+interpreter, several times, and the fastest load is reported with the modules
+it imports that took longest, as measured by `python -X importtime`. When
+running every day in a loop this is paid once per day on top of the solving.
+
+Usage: python lib/python/benchmarks/startup.py [-r REPEAT] [2024/day24 ...]
+"""
+# Standard library
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+# Globals
+ROOT = Path(__file__).resolve().parents[3]
+LIB  = ROOT / 'lib' / 'python'
+
+# Loads a solver and prints how long it took. The -X importtime output after
+# the marker on stderr is for the solver's imports (runpy imports pkgutil when
+# first used so import it beforehand).
+MARKER = '--- solver ---'
+LOAD_SOLVER = f'''
+import pkgutil, runpy, sys, time
+print({MARKER!r}, file=sys.stderr, flush=True)
+start = time.perf_counter()
+runpy.run_path(sys.argv[1])
+print(time.perf_counter() - start)
+'''
+IMPORT_TIME = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+################################################################################
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('solvers', nargs='*', help='Solver directories (default: all)')
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=3, help='Slowest imports to list per solver')
+    args = parser.parse_args()
+
+    solvers = (
+        [Path(s).resolve() / 'main.py' for s in args.solvers]
+        if args.solvers else sorted(ROOT.glob('20*/day*/main.py'))
+    )
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(
+        filter(None, [str(LIB), os.environ.get('PYTHONPATH')])
+    )}
+    print(f'{"Solver":<12} {"Load":>10}  Slowest imports (cumulative)')
+    for path in solvers:
+        name = f'{path.parent.parent.name}/{path.parent.name}'
+        try:
+            best, imports = load_times(path, args.repeat, env)
+        except subprocess.CalledProcessError as e:
+            error = e.stderr.strip().splitlines()[-1] if e.stderr.strip() else e
+            print(f'{name:<12} {"failed":>10}  {error}')
+            continue
+        slowest = ', '.join(
+            f'{module} {us/1000:.1f}ms'
+            for module, us in sorted(imports.items(), key=lambda x : -x[1])[:args.top]
+        )
+        print(f'{name:<12} {best*1000:8.1f}ms  {slowest}')
+
+def load_times(path: Path, repeat: int, env: dict[str, str]) -> tuple[float, dict[str, int]]:
+    """
+    Fastest of `repeat` loads in seconds, and the cumulative import time in
+    microseconds of each module the solver imported directly during it
+    """
+    best, best_imports = float('inf'), {}
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', LOAD_SOLVER, str(path)],
+            capture_output = True,
+            text           = True,
+            env            = env,
+            cwd            = path.parent,
+            check          = True,
+        )
+        elapsed = float(proc.stdout.split()[-1])
+        if elapsed < best:
+            best, best_imports = elapsed, top_level_imports(proc.stderr)
+    return best, best_imports
+
+def top_level_imports(importtime: str) -> dict[str, int]:
+    """Cumulative microseconds of each import made from the solver itself"""
+    imports = {}
+    _, _, solver_imports = importtime.partition(MARKER)
+    for match in IMPORT_TIME.finditer(solver_imports):
+        _, cumulative, indent, module = match.groups()
+        # Modules imported by other modules are indented further
+        if len(indent) == 1:
+            imports[module] = int(cumulative)
+    return imports
+
+################################################################################
+if __name__ == "__main__":
+    main()
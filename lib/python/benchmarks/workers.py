@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""
+Speedup of 2024 day06's multiprocessing part 2 against the number of workers
+
+Times the serial part 2 and the shared memory `mp.Pool` version with 1 to
+`--max-workers` workers on a generated map. Pool startup is included, as it
+is in the solver's own timing. The single process batched NumPy version is
+listed for comparison.
+
+Usage: python lib/python/benchmarks/workers.py [-s SIZE] [--max-workers N] [-r REPEAT]
+"""
+# Standard library
+import argparse
+import importlib.util
+import multiprocessing as mp
+import random
+import sys
+import timeit
+from pathlib import Path
+
+# 3rd party
+import numpy as np
+
+# 1st party
+import aoc_utils as aoc
+from generators import guard_map
+
+# Globals
+DAY06 = Path(__file__).resolve().parents[3] / '2024' / 'day06' / 'main.py'
+
+################################################################################
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-s', '--size', type=int, default=130, help='Map height and width')
+    parser.add_argument('--max-workers', type=int, default=mp.cpu_count())
+    parser.add_argument('-r', '--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    aoc.progressbar.configure(False)
+
+    day06 = load_day06()
+    map        = aoc.Grid.from_text(guard_map(args.size, random.Random(args.seed)))
+    start_pos  = np.array(map.find_one('^'))
+    start_step = np.array([-1,0])
+    positions, _ = day06.predict_guards_route(map, start_pos, start_step)
+    to_test = positions - {day06.to_loc(start_pos)}
+
+    def best_time(func, *func_args) -> float:
+        run = lambda : func(to_test, map, start_pos, start_step, *func_args)
+        return min(timeit.repeat(run, number=1, repeat=args.repeat))
+
+    serial = best_time(day06.count_loop_obstructions)
+    print(f'{args.size}x{args.size} map, {len(to_test):,} obstructions, {mp.cpu_count()} CPUs')
+    print(f'{"Workers":>7} {"Time":>10} {"Speedup":>8} {"Efficiency":>10}')
+    print(f'{"serial":>7} {serial*1000:8.1f}ms {1:7.2f}x')
+    t = best_time(day06.count_loop_obstructions_batched)
+    print(f'{"batched":>7} {t*1000:8.1f}ms {serial/t:7.2f}x')
+    for n_workers in range(1, args.max_workers + 1):
+        t = best_time(day06.count_loop_obstructions_mp, n_workers)
+        print(f'{n_workers:>7} {t*1000:8.1f}ms {serial/t:7.2f}x {serial/t/n_workers:9.0%}')
+
+def load_day06():
+    """
+    Import the solver as a module, so that the pool can pickle its functions
+    by name (unlike those of `runpy.run_path()`)
+    """
+    spec = importlib.util.spec_from_file_location('day06', DAY06)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['day06'] = module
+    spec.loader.exec_module(module)
+    return module
+
+################################################################################
+if __name__ == "__main__":
+    main()